@@ -0,0 +1,569 @@
+"""
+Mock RSpace API server for offline benchmarking
+
+Implements the subset of the RSpace ELN (/api/v1) and Inventory
+(/api/inventory/v1) APIs that the tools in main.py use, backed by a
+generated in-memory dataset. Responses have the same shape as real RSpace
+responses, so the rspace_client library works against it unchanged.
+
+Usage:
+    python benchmarks/mock_rspace.py --port 8090 --documents 500 --latency-ms 40
+
+Then point the MCP server at it with RSPACE_URL=http://127.0.0.1:8090 and any
+RSPACE_API_KEY. Request counts per endpoint are available at /_mock/stats.
+--error-rate makes a random share of API requests fail with 503, to exercise
+the server's retries and circuit breaker, and --rate-limit answers requests
+over N per second with 429 and a Retry-After header, like RSpace's API limit.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ELN_PREFIX = "/api/v1"
+INV_PREFIX = "/api/inventory/v1"
+
+WORDS = (
+    "pcr protocol dna extraction buffer gel electrophoresis primer plasmid "
+    "cell culture media antibody western blot elisa assay enzyme kinetics "
+    "sequencing library microscopy staining centrifuge incubation sample "
+    "control replicate calibration yield purity concentration result"
+).split()
+TAGS = ["pcr", "protocol", "dna", "rna", "cells", "imaging", "assay", "draft", "review", "project-x"]
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class MockDataset:
+    """Generated ELN and Inventory records, deterministic for a given seed"""
+
+    def __init__(self, documents=200, fields_per_document=3, field_chars=2000,
+                 samples=100, containers=20, templates=5, seed=42):
+        self.rnd = random.Random(seed)
+        self.lock = threading.Lock()
+        self.now = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+        self.field_chars = field_chars
+        self.documents = {}
+        self.forms = {}
+        self.files = {}
+        self.samples = {}
+        self.containers = {}
+        self.templates = {}
+        self.next_id = 100000
+        for form_id in range(1, 4):
+            self.forms[form_id] = self._form(form_id)
+        for doc_id in range(1, documents + 1):
+            self.documents[doc_id] = self._document(doc_id, fields_per_document)
+        for template_id in range(1, templates + 1):
+            self.templates[template_id] = self._template(template_id)
+        for sample_id in range(1, samples + 1):
+            self.samples[sample_id] = self._sample(sample_id)
+        for container_id in range(1, containers + 1):
+            self.containers[container_id] = self._container(container_id)
+
+    def new_id(self) -> int:
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+    def _text(self, chars: int) -> str:
+        words = []
+        length = 0
+        while length < chars:
+            word = self.rnd.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
+
+    def _form(self, form_id):
+        return {
+            "id": form_id, "globalId": f"FM{form_id}", "name": f"Form {form_id}",
+            "stableId": f"stable{form_id}", "version": 1, "formState": "PUBLISHED",
+            "tags": "", "fields": [
+                {"id": form_id * 10 + n, "globalId": f"FF{form_id * 10 + n}", "name": f"Field {n}",
+                 "type": "Text", "mandatory": False} for n in range(1, 4)
+            ],
+            "_links": [{"rel": "self", "link": f"{ELN_PREFIX}/forms/{form_id}"}],
+        }
+
+    def _document(self, doc_id, field_count):
+        modified = self.now - timedelta(hours=doc_id * 3, seconds=self.rnd.randint(0, 3000))
+        created = modified - timedelta(days=self.rnd.randint(0, 30))
+        tags = sorted(self.rnd.sample(TAGS, self.rnd.randint(0, 3)))
+        fields = []
+        for n in range(field_count):
+            field_id = doc_id * 100 + n
+            fields.append({
+                "id": field_id, "globalId": f"FD{field_id}", "name": f"Field {n + 1}", "type": "text",
+                "content": f"<p>{self._text(self.field_chars)}</p>",
+                "lastModified": _timestamp(modified), "files": [],
+            })
+        return {
+            "id": doc_id, "globalId": f"SD{doc_id}", "name": f"Experiment {doc_id} {self.rnd.choice(WORDS)}",
+            "created": _timestamp(created), "lastModified": _timestamp(modified), "signed": False,
+            "tags": ",".join(tags), "tagMetaData": ",".join(tags),
+            "form": {"id": 1, "globalId": "FM1", "name": "Basic Document", "stableId": "stable1", "version": 1},
+            "owner": {"id": 1, "username": "user1", "email": "user1@example.com",
+                      "firstName": "Test", "lastName": "User"},
+            "fields": fields,
+        }
+
+    def _template(self, template_id):
+        return {
+            "id": template_id, "globalId": f"IT{template_id}", "name": f"Template {template_id}",
+            "created": _timestamp(self.now), "lastModified": _timestamp(self.now), "tags": [],
+            "fields": [
+                {"id": template_id * 10 + 1, "name": "Concentration", "type": "number", "mandatory": True},
+                {"id": template_id * 10 + 2, "name": "Source", "type": "radio", "mandatory": False,
+                 "definition": {"options": ["Commercial", "In-house"]}},
+                {"id": template_id * 10 + 3, "name": "Notes", "type": "text", "mandatory": False},
+            ],
+            "_links": [{"rel": "self", "link": f"{INV_PREFIX}/sampleTemplates/{template_id}"}],
+        }
+
+    def _sample(self, sample_id):
+        modified = self.now - timedelta(hours=sample_id * 5)
+        return {
+            "id": sample_id, "globalId": f"SA{sample_id}", "name": f"Sample {sample_id}", "type": "SAMPLE",
+            "created": _timestamp(modified), "lastModified": _timestamp(modified),
+            "tags": [{"value": tag} for tag in self.rnd.sample(TAGS, 2)],
+            "description": self._text(120),
+            "quantity": {"numericValue": 5, "unitId": 3},
+            "owner": {"id": 1, "username": "user1"},
+            "subSamples": [
+                {"id": sample_id * 10 + n, "globalId": f"SS{sample_id * 10 + n}", "name": f"{sample_id}.{n}",
+                 "type": "SUBSAMPLE", "quantity": {"numericValue": 5, "unitId": 3}, "notes": []}
+                for n in range(1, 3)
+            ],
+            "_links": [{"rel": "self", "link": f"{INV_PREFIX}/samples/{sample_id}"}],
+        }
+
+    def _container(self, container_id):
+        grid = container_id % 2 == 0
+        container = {
+            "id": container_id, "globalId": f"IC{container_id}", "name": f"Container {container_id}",
+            "type": "CONTAINER", "cType": "GRID" if grid else "LIST",
+            "created": _timestamp(self.now), "lastModified": _timestamp(self.now), "tags": [],
+            "canStoreContainers": True, "canStoreSamples": True,
+            "contentSummary": {"totalCount": 0, "subSampleCount": 0, "containerCount": 0},
+            "parentContainers": [], "owner": {"id": 1, "username": "user1"},
+            "_links": [{"rel": "self", "link": f"{INV_PREFIX}/containers/{container_id}"}],
+        }
+        if grid:
+            container["gridLayout"] = {"columnsNumber": 12, "rowsNumber": 8,
+                                       "columnsLabelType": "N123", "rowsLabelType": "ABC"}
+        locations = []
+        for n in range(1, 11):
+            location = {"id": container_id * 100 + n, "content": {
+                "id": container_id * 10 + n, "globalId": f"SS{container_id * 10 + n}", "type": "SUBSAMPLE",
+                "name": f"Item {n}"}}
+            if grid:
+                location.update({"coordX": (n - 1) % 12 + 1, "coordY": (n - 1) // 12 + 1})
+            locations.append(location)
+        container["locations"] = locations
+        container["contentSummary"]["totalCount"] = len(locations)
+        return container
+
+
+def _summary(document: dict) -> dict:
+    summary = {key: value for key, value in document.items() if key != "fields"}
+    summary["_links"] = [{"rel": "self", "link": f"{ELN_PREFIX}/documents/{document['id']}"}]
+    return summary
+
+
+def _numeric(identifier: str) -> int:
+    return int(re.sub(r"^[A-Za-z]{2}", "", identifier))
+
+
+def _sort_key(order_by: str):
+    field, _, direction = (order_by or "lastModified desc").partition(" ")
+    return field, direction.strip().lower() == "desc"
+
+
+def _matches_term(document: dict, query: str, query_type: str) -> bool:
+    query_lower = query.lower()
+    name = document["name"].lower()
+    tags = document["tags"].lower().split(",") if document["tags"] else []
+    text = " ".join(field["content"].lower() for field in document.get("fields", []))
+    if query_type == "tag":
+        return query_lower in tags
+    if query_type == "name":
+        return query_lower in name
+    if query_type == "fullText":
+        return query_lower in text
+    if query_type in ("lastModified", "created"):
+        start, _, end = query.partition(";")
+        moment = _parse_timestamp(document[query_type]).date().isoformat()
+        return start <= moment and (not end or moment <= end)
+    if query_type == "form":
+        return query_lower in document["form"]["name"].lower()
+    if query_type == "attachment":
+        return False
+    return query_lower in name or query_lower in tags or query_lower in text
+
+
+class MockRSpaceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockRSpace/1.0"
+    # Headers and body are written separately; without TCP_NODELAY every
+    # keep-alive response would stall on delayed ACKs and skew latencies
+    disable_nagle_algorithm = True
+
+    # ---- plumbing ----
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def dataset(self) -> MockDataset:
+        return self.server.dataset
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json({"status": "ERROR", "httpCode": status, "message": message, "errors": []}, status)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type", "")
+        if "application/json" in content_type and raw:
+            return json.loads(raw)
+        return raw
+
+    def _dispatch(self, method):
+        parsed = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        path = parsed.path
+        self.server.record(method, path)
+        if path == "/_mock/stats":
+            return self._send_json(self.server.stats())
+        if self.headers.get("apiKey") is None:
+            return self._send_error(401, "missing apiKey header")
+        time.sleep(self.server.latency())
+        retry_after = self.server.rate_limited()
+        if retry_after:
+            self.send_response(429)
+            self.send_header("Retry-After", str(retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            return self._send_error(503, "injected failure")
+        for route_method, pattern, handler in ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                try:
+                    return handler(self, params, *match.groups())
+                except KeyError as missing:
+                    return self._send_error(404, f"not found: {missing}")
+        return self._send_error(404, f"no mock route for {method} {path}")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    # ---- ELN ----
+
+    def status(self, params):
+        self._send_json({"message": "OK", "rspaceVersion": "mock"})
+
+    def list_documents(self, params):
+        documents = list(self.dataset.documents.values())
+        if "advancedQuery" in params:
+            query = json.loads(params["advancedQuery"])
+            combine = all if query.get("operator", "and") == "and" else any
+            documents = [doc for doc in documents
+                         if combine(_matches_term(doc, term["query"], term["queryType"]) for term in query["terms"])]
+        elif params.get("query"):
+            documents = [doc for doc in documents if _matches_term(doc, params["query"], "global")]
+        field, descending = _sort_key(params.get("orderBy"))
+        documents.sort(key=lambda doc: (str(doc.get(field, "")), doc["id"]), reverse=descending)
+        self._send_page("documents", [_summary(doc) for doc in documents], params, f"{ELN_PREFIX}/documents")
+
+    def _send_page(self, key, items, params, link):
+        page_number = int(params.get("pageNumber", 0))
+        page_size = int(params.get("pageSize", 20))
+        start = page_number * page_size
+        links = [{"rel": "self", "link": f"http://{self.headers.get('Host')}{link}"}]
+        if start + page_size < len(items):
+            query = "&".join(f"{k}={v}" for k, v in {**params, "pageNumber": page_number + 1}.items()
+                             if k in ("pageNumber", "pageSize", "orderBy"))
+            links.append({"rel": "next", "link": f"http://{self.headers.get('Host')}{link}?{query}"})
+        self._send_json({"totalHits": len(items), "pageNumber": page_number,
+                         key: items[start:start + page_size], "_links": links})
+
+    def get_document(self, params, doc_id):
+        document = self.dataset.documents[int(doc_id)]
+        self._send_json({**document, "_links": [{"rel": "self", "link": f"{ELN_PREFIX}/documents/{doc_id}"}]})
+
+    def create_document(self, params):
+        body = self._body()
+        doc_id = self.dataset.new_id()
+        now = _timestamp(datetime.now(timezone.utc))
+        document = {
+            "id": doc_id, "globalId": f"SD{doc_id}", "name": body.get("name") or "Untitled document",
+            "created": now, "lastModified": now, "signed": False,
+            "tags": body.get("tags") or "", "tagMetaData": body.get("tags") or "",
+            "form": {"id": body.get("formID", 1), "globalId": f"FM{body.get('formID', 1)}", "name": "Basic Document"},
+            "owner": {"id": 1, "username": "user1"},
+            "fields": [{"id": doc_id * 100 + n, "globalId": f"FD{doc_id * 100 + n}", "name": f"Field {n + 1}",
+                        "type": "text", "content": field.get("content", ""), "lastModified": now, "files": []}
+                       for n, field in enumerate(body.get("fields") or [{"content": ""}])],
+        }
+        self.dataset.documents[doc_id] = document
+        self._send_json(document, 201)
+
+    def update_document(self, params, doc_id):
+        body = self._body()
+        document = self.dataset.documents[int(doc_id)]
+        with self.dataset.lock:
+            if body.get("name"):
+                document["name"] = body["name"]
+            if body.get("tags") is not None:
+                document["tags"] = document["tagMetaData"] = body["tags"]
+            for update in body.get("fields") or []:
+                for field in document["fields"]:
+                    if field["id"] == update.get("id"):
+                        field["content"] = update.get("content", "")
+            document["lastModified"] = _timestamp(datetime.now(timezone.utc))
+        self._send_json(document)
+
+    def create_folder(self, params):
+        body = self._body()
+        folder_id = self.dataset.new_id()
+        self._send_json({"id": folder_id, "globalId": f"{'NB' if body.get('notebook') else 'FL'}{folder_id}",
+                         "name": body.get("name"), "notebook": bool(body.get("notebook")),
+                         "created": _timestamp(datetime.now(timezone.utc))}, 201)
+
+    def list_forms(self, params):
+        forms = list(self.dataset.forms.values())
+        if params.get("query"):
+            forms = [form for form in forms if params["query"].lower() in form["name"].lower()]
+        self._send_page("forms", forms, params, f"{ELN_PREFIX}/forms")
+
+    def get_form(self, params, form_id):
+        self._send_json(self.dataset.forms[int(form_id)])
+
+    def activity(self, params):
+        events = [{"username": "user1", "action": "WRITE", "domain": "RECORD",
+                   "timestamp": doc["lastModified"], "payload": {"id": {"id": doc["id"]}}}
+                  for doc in list(self.dataset.documents.values())[:200]]
+        self._send_page("activities", events, params, f"{ELN_PREFIX}/activity")
+
+    def upload_file(self, params):
+        body = self._body()
+        file_id = self.dataset.new_id()
+        self.dataset.files[file_id] = body if isinstance(body, bytes) else b""
+        self._send_json({"id": file_id, "globalId": f"GL{file_id}", "name": f"upload-{file_id}",
+                         "size": len(self.dataset.files[file_id]), "contentType": "application/octet-stream"}, 201)
+
+    def download_file(self, params, file_id):
+        content = self.dataset.files.get(int(file_id), b"x" * 65536)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    # ---- Inventory ----
+
+    def list_samples(self, params):
+        samples = sorted(self.dataset.samples.values(), key=lambda sample: sample["lastModified"], reverse=True)
+        self._send_page("samples", samples, params, f"{INV_PREFIX}/samples")
+
+    def get_sample(self, params, sample_id):
+        self._send_json(self.dataset.samples[int(sample_id)])
+
+    def create_sample(self, params):
+        body = self._body()
+        sample_id = self.dataset.new_id()
+        sample = self.dataset._sample(sample_id)
+        sample.update({"name": body.get("name"), "description": body.get("description")})
+        self.dataset.samples[sample_id] = sample
+        self._send_json(sample, 201)
+
+    def list_containers(self, params):
+        containers = [{k: v for k, v in c.items() if k != "locations"} for c in self.dataset.containers.values()]
+        self._send_page("containers", containers, params, f"{INV_PREFIX}/containers")
+
+    def get_container(self, params, container_id):
+        container = dict(self.dataset.containers[int(container_id)])
+        if params.get("includeContent", "False").lower() != "true":
+            container.pop("locations", None)
+        self._send_json(container)
+
+    def workbenches(self, params):
+        self._send_json({"containers": [{"id": 1, "globalId": "BE1", "name": "Workbench of user1",
+                                         "cType": "WORKBENCH", "type": "CONTAINER"}]})
+
+    def list_templates(self, params):
+        self._send_page("templates", list(self.dataset.templates.values()), params, f"{INV_PREFIX}/sampleTemplates")
+
+    def get_template(self, params, template_id):
+        self._send_json(self.dataset.templates[int(template_id)])
+
+    def search(self, params):
+        query = params.get("query", "").lower()
+        records = [sample for sample in self.dataset.samples.values()
+                   if query in sample["name"].lower() or query in sample["description"]]
+        self._send_page("records", records, params, f"{INV_PREFIX}/search")
+
+    def bulk(self, params):
+        body = self._body()
+        results = [{"record": {"id": record.get("id"), "type": record.get("type")}, "error": None}
+                   for record in body.get("records", [])]
+        self._send_json({"status": "COMPLETED", "type": body.get("operationType"), "results": results,
+                         "successCount": len(results), "errorCount": 0})
+
+
+ROUTES = [
+    ("GET", rf"{ELN_PREFIX}/status", MockRSpaceHandler.status),
+    ("GET", rf"{ELN_PREFIX}/documents", MockRSpaceHandler.list_documents),
+    ("POST", rf"{ELN_PREFIX}/documents", MockRSpaceHandler.create_document),
+    ("GET", rf"{ELN_PREFIX}/documents/(\d+)", MockRSpaceHandler.get_document),
+    ("PUT", rf"{ELN_PREFIX}/documents/(\d+)", MockRSpaceHandler.update_document),
+    ("POST", rf"{ELN_PREFIX}/folders", MockRSpaceHandler.create_folder),
+    ("GET", rf"{ELN_PREFIX}/forms", MockRSpaceHandler.list_forms),
+    ("GET", rf"{ELN_PREFIX}/forms/(\d+)", MockRSpaceHandler.get_form),
+    ("GET", rf"{ELN_PREFIX}/activity", MockRSpaceHandler.activity),
+    ("POST", rf"{ELN_PREFIX}/files", MockRSpaceHandler.upload_file),
+    ("GET", rf"{ELN_PREFIX}/files/(\d+)/file", MockRSpaceHandler.download_file),
+    ("GET", rf"{INV_PREFIX}/samples", MockRSpaceHandler.list_samples),
+    ("POST", rf"{INV_PREFIX}/samples", MockRSpaceHandler.create_sample),
+    ("GET", rf"{INV_PREFIX}/samples/(\d+)", MockRSpaceHandler.get_sample),
+    ("GET", rf"{INV_PREFIX}/containers", MockRSpaceHandler.list_containers),
+    ("GET", rf"{INV_PREFIX}/containers/(\d+)", MockRSpaceHandler.get_container),
+    ("GET", rf"{INV_PREFIX}/workbenches", MockRSpaceHandler.workbenches),
+    ("GET", rf"{INV_PREFIX}/sampleTemplates", MockRSpaceHandler.list_templates),
+    ("GET", rf"{INV_PREFIX}/sampleTemplates/(\d+)", MockRSpaceHandler.get_template),
+    ("GET", rf"{INV_PREFIX}/search", MockRSpaceHandler.search),
+    ("POST", rf"{INV_PREFIX}/bulk", MockRSpaceHandler.bulk),
+]
+
+
+class MockRSpaceServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the dataset, latency settings and request counters"""
+
+    daemon_threads = True
+
+    def __init__(self, address, dataset: MockDataset, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 rate_limit=0):
+        super().__init__(address, MockRSpaceHandler)
+        self.dataset = dataset
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.throttled = 0
+        self._window = (0, 0)
+        self.requests = {}
+        self._stats_lock = threading.Lock()
+
+    def latency(self) -> float:
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def rate_limited(self) -> int:
+        """Retry-After seconds when this request exceeds the per-second limit, else 0"""
+        if not self.rate_limit:
+            return 0
+        second = int(time.time())
+        with self._stats_lock:
+            window, count = self._window
+            count = count + 1 if window == second else 1
+            self._window = (second, count)
+            if count <= self.rate_limit:
+                return 0
+            self.throttled += 1
+        return 1
+
+    def record(self, method, path):
+        if path.startswith("/_mock/"):
+            return
+        endpoint = method + " " + re.sub(r"/\d+", "/{id}", path)
+        with self._stats_lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {"total": sum(self.requests.values()), "throttled": self.throttled, "endpoints": dict(self.requests)}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_mock_server(host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, rate_limit=0,
+                      **dataset_options) -> MockRSpaceServer:
+    """Starts a mock server on a background thread and returns it (port 0 picks a free port)"""
+    server = MockRSpaceServer((host, port), MockDataset(**dataset_options), latency_ms, jitter_ms, error_rate,
+                              rate_limit)
+    threading.Thread(target=server.serve_forever, daemon=True, name="mock-rspace").start()
+    return server
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock RSpace API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090, help="0 picks a free port")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every API response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random +/- variation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of API requests answered with 503")
+    parser.add_argument("--rate-limit", type=int, default=0, help="API requests per second before 429s, 0 = none")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--fields-per-document", type=int, default=3)
+    parser.add_argument("--field-chars", type=int, default=2000, help="approximate text length of each field")
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--containers", type=int, default=20)
+    parser.add_argument("--templates", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    dataset = MockDataset(
+        documents=args.documents, fields_per_document=args.fields_per_document, field_chars=args.field_chars,
+        samples=args.samples, containers=args.containers, templates=args.templates, seed=args.seed,
+    )
+    server = MockRSpaceServer((args.host, args.port), dataset, args.latency_ms, args.jitter_ms, args.error_rate,
+                              args.rate_limit)
+    print(f"Mock RSpace listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
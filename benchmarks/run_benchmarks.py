@@ -0,0 +1,234 @@
+"""
+Benchmark runner for the RSpace MCP tools
+
+Starts the mock RSpace server (benchmarks/mock_rspace.py) in a child process,
+points main.py at it and calls every benchmarked tool through an in-memory MCP
+client, so the full FastMCP request path is measured. For each scenario it
+reports p50/p95 latency, upstream RSpace requests per call (as counted by the
+mock server) and peak Python memory allocated by a call of the scenario.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --latency-ms 50 --documents 1000 --iterations 50
+    python benchmarks/run_benchmarks.py --only search --concurrency 8 --json bench.json
+
+No RSpace instance or credentials are needed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+import warnings
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+
+
+def scenarios(scratch_dir: str) -> list:
+    """(label, tool name, arguments) for every benchmarked tool call"""
+    upload = os.path.join(scratch_dir, "upload.txt")
+    with open(upload, "w") as handle:
+        handle.write("benchmark attachment\n" * 100)
+    download = os.path.join(scratch_dir, "download.bin")
+    return [
+        ("status", "status", {}),
+        ("get_documents", "get_documents", {"page_size": 20}),
+        ("get_single_Rspace_document", "get_single_Rspace_document", {"doc_id": "SD1"}),
+        ("get_documents_by_ids", "get_documents_by_ids",
+         {"doc_ids": [f"SD{n}" for n in range(1, 21)], "content_format": "text", "max_chars": 2000}),
+        ("search_documents[simple]", "search_documents", {"query": "pcr"}),
+        ("search_documents[advanced]", "search_documents",
+         {"query": "protocol", "search_type": "advanced", "query_types": ["tag", "name"], "operator": "or"}),
+        ("search_documents[include_content]", "search_documents", {"query": "pcr", "include_content": True}),
+        ("search_by_tags", "search_by_tags", {"tags": ["pcr", "dna"], "operator": "or"}),
+        ("multi_search", "multi_search",
+         {"queries": [{"query": "pcr", "query_types": ["tag"]}, {"query": "protocol", "query_types": ["name"]},
+                      {"query": "buffer", "query_types": ["fullText"]}]}),
+        ("search_recent_documents", "search_recent_documents", {"days_back": 30}),
+        ("find_documents_by_content", "find_documents_by_content",
+         {"content_terms": ["buffer"], "exclude_terms": ["draft"]}),
+        ("get_forms", "get_forms", {}),
+        ("get_form", "get_form", {"form_id": "FM1"}),
+        ("getAuditEvents", "getAuditEvents", {"username": "user1"}),
+        ("downloadFile", "downloadFile", {"file_id": 1, "file_path": download}),
+        ("update_document", "update_document", {"document_id": "SD2", "name": "Renamed by benchmark"}),
+        ("uploadAndAttachFile", "uploadAndAttachFile", {"document_id": "SD3", "file_path": upload}),
+        ("get_sample", "get_sample", {"sample_id": "SA1"}),
+        ("list_samples", "list_samples", {"page_size": 20}),
+        ("search_inventory", "search_inventory", {"query": "sample"}),
+        ("get_container", "get_container", {"container_id": "IC2", "include_content": True}),
+        ("get_container_summary", "get_container_summary", {"container_id": "IC2"}),
+        ("get_container_contents_only", "get_container_contents_only", {"container_id": "IC2"}),
+        ("list_containers", "list_containers", {"page_size": 20}),
+        ("get_workbenches", "get_workbenches", {}),
+        ("move_items_to_grid_container_by_row", "move_items_to_grid_container_by_row",
+         {"target_container_id": "IC4", "item_ids": ["SS11", "SS12", "SS13"]}),
+        ("get_sample_template", "get_sample_template", {"template_id": "IT1"}),
+        ("list_sample_templates", "list_sample_templates", {}),
+    ]
+
+
+def start_mock(args) -> tuple:
+    """Starts the mock server in a child process; returns (process, base URL)"""
+    command = [
+        sys.executable, os.path.join(BENCHMARK_DIR, "mock_rspace.py"), "--port", "0",
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate), "--rate-limit", str(args.rate_limit),
+        "--documents", str(args.documents), "--field-chars", str(args.field_chars),
+        "--samples", str(args.samples), "--containers", str(args.containers),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    banner = process.stdout.readline().strip()
+    return process, banner.rsplit(" ", 1)[-1]
+
+
+def upstream_requests(mock_url: str) -> int:
+    with urllib.request.urlopen(f"{mock_url}/_mock/stats") as response:
+        return json.load(response)["total"]
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+async def run_scenario(client, mock_url, label, tool, arguments, iterations, concurrency) -> dict:
+    latencies = []
+    errors = []
+
+    async def call():
+        start = time.perf_counter()
+        try:
+            await client.call_tool(tool, arguments)
+        except Exception as ex:
+            errors.append(str(ex))
+        latencies.append(time.perf_counter() - start)
+
+    # One unmeasured call so lazy initialisation does not skew the first scenario
+    await call()
+    latencies.clear()
+    errors.clear()
+
+    requests_before = upstream_requests(mock_url)
+    wall_start = time.perf_counter()
+    remaining = iterations
+    while remaining > 0:
+        batch = min(concurrency, remaining)
+        await asyncio.gather(*(call() for _ in range(batch)))
+        remaining -= batch
+    wall = time.perf_counter() - wall_start
+    upstream = upstream_requests(mock_url) - requests_before
+    timed = list(latencies)
+    failures = list(errors)
+
+    # Memory is measured on one extra call: tracing allocations slows Python
+    # down too much to leave it on while timing
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    await asyncio.gather(*(call() for _ in range(concurrency)))
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        "scenario": label,
+        "tool": tool,
+        "calls": iterations,
+        "errors": len(failures),
+        "first_error": failures[0] if failures else None,
+        "p50_ms": round(percentile(timed, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(timed, 0.95) * 1000, 2),
+        "throughput_per_s": round(iterations / wall, 1) if wall else None,
+        "upstream_per_call": round(upstream / iterations, 2),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+async def run(args, mock_url) -> list:
+    os.environ["RSPACE_URL"] = mock_url
+    os.environ["RSPACE_API_KEY"] = "benchmark"
+    # Client-side pacing would make every scenario measure the rate limiter
+    # instead of the tool; --rate-limit exercises RSpace-side limiting instead
+    os.environ.setdefault("RSPACE_RATE_LIMIT", "0")
+    # Scenarios repeat identical calls, so with the caches on every call after
+    # the first is a cache hit; --warm-caches measures that case instead
+    if not args.warm_caches:
+        os.environ.setdefault("RSPACE_SEARCH_CACHE_SIZE", "0")
+        os.environ.setdefault("RSPACE_DOCUMENT_CACHE_SIZE", "0")
+    sys.path.insert(0, REPO_DIR)
+    import main
+    from fastmcp import Client
+
+    # Tools returning raw dicts for model-typed results make pydantic warn on every call
+    warnings.filterwarnings("ignore", message="Pydantic serializer warnings")
+
+    results = []
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        async with Client(main.mcp) as client:
+            for label, tool, arguments in scenarios(scratch_dir):
+                if args.only and not any(name in label for name in args.only):
+                    continue
+                result = await run_scenario(client, mock_url, label, tool, arguments,
+                                            args.iterations, args.concurrency)
+                results.append(result)
+                print_row(result)
+    return results
+
+
+def print_header():
+    print(f"{'scenario':<40} {'p50 ms':>9} {'p95 ms':>9} {'calls/s':>9} {'upstream':>9} {'peak KiB':>9} errors")
+
+
+def print_row(result: dict):
+    print(f"{result['scenario']:<40} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+          f"{result['throughput_per_s']:>9} {result['upstream_per_call']:>9} "
+          f"{result['peak_memory_kib']:>9} {result['errors']}", flush=True)
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the RSpace MCP tools against a mock RSpace server")
+    parser.add_argument("--iterations", type=int, default=20, help="measured calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="calls of a scenario issued in parallel")
+    parser.add_argument("--only", nargs="*", help="run scenarios whose label contains any of these strings")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated RSpace response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of RSpace requests failing with 503")
+    parser.add_argument("--rate-limit", type=int, default=0, help="mock RSpace requests/s before answering 429")
+    parser.add_argument("--documents", type=int, default=300)
+    parser.add_argument("--field-chars", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--containers", type=int, default=20)
+    parser.add_argument("--warm-caches", action="store_true",
+                        help="keep the document and search caches on (repeated calls become cache hits)")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    process, mock_url = start_mock(args)
+    try:
+        print(f"mock RSpace at {mock_url}, latency {args.latency_ms} ms, "
+              f"{args.iterations} calls per scenario, concurrency {args.concurrency}")
+        print_header()
+        results = asyncio.run(run(args, mock_url))
+    finally:
+        process.terminate()
+        process.wait()
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump({"settings": vars(args), "results": results}, handle, indent=2)
+    failed = [result["scenario"] for result in results if result["errors"]]
+    if failed:
+        print(f"\nscenarios with errors: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
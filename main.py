@@ -8,6 +8,7 @@ Architecture:
 - Uses FastMCP framework for tool registration and server setup
 - Connects to RSpace via official Python client libraries (rspace_client)
 - Uses Pydantic models for type safety and validation
+- RSpace client libraries and clients are imported/created lazily on first use
 
 Extension Guide:
 - ELN tools: Add new functions using @mcp.tool decorator with tags={"rspace"}
@@ -16,16 +17,36 @@ Extension Guide:
 - All tools should include comprehensive docstrings for Claude's understanding
 """
 
-from typing import Annotated, Any, Dict, List, Optional, Union, Literal
+import time
 
-from fastmcp import FastMCP
-from rspace_client.eln import eln as e  # Electronic Lab Notebook client
-from rspace_client.inv import inv as i  # Inventory Management client
-from rspace_client.eln.advanced_query_builder import AdvancedQueryBuilder
+_STARTUP_BEGIN = time.perf_counter()
+
+from typing import Annotated, Any, Callable, Dict, List, Optional, Union, Literal
+
+import contextlib
+import contextvars
+import copy
+import importlib
+import logging
+import math
 import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+from fastmcp import Context, FastMCP
+from fastmcp.server.middleware import Middleware
+
+_FASTMCP_IMPORTED = time.perf_counter()
+
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
+_DEPENDENCIES_IMPORTED = time.perf_counter()
+
+logger = logging.getLogger("rspace_mcp")
+
 # ============================================================================
 # PYDANTIC MODELS - Data Structure Definitions
 # ============================================================================
@@ -44,9 +65,21 @@ class RSField(BaseModel):
     textContent: str = Field(description="text content of a field as HTML")
 
 
+class FieldOffset(BaseModel):
+    """Position of one field's content within FullDocument.content"""
+    id: int = Field(description="field id")
+    name: str = Field(description="field name")
+    start: int = Field(description="offset of the field's first character in content")
+    end: int = Field(description="offset just past the field's last character in content")
+
+
 class FullDocument(BaseModel):
     """Complete ELN document with all content concatenated"""
     content: str = Field(description="concatenated text content from all fields")
+    contentFormat: str = Field("html", description="format of content: html, text or markdown")
+    contentTruncated: bool = Field(False, description="whether content was cut off at max_chars")
+    totalChars: Optional[int] = Field(None, description="length of the complete content before truncation")
+    fieldOffsets: List[FieldOffset] = Field(default_factory=list, description="where each field sits in content")
 
 
 class Sample(BaseModel):
@@ -72,6 +105,18 @@ class GridLocation(BaseModel):
     y: int = Field(description="Row position (1-based)")
 
 
+SearchQueryType = Literal["global", "fullText", "tag", "name", "created", "lastModified", "form", "attachment"]
+SearchOperator = Literal["and", "or"]
+
+
+class SearchSpec(BaseModel):
+    """One query of a multi_search"""
+    query: str = Field(description="search term(s)")
+    query_types: List[SearchQueryType] = Field(
+        default_factory=lambda: ["global"], description="fields the query is matched against")
+    operator: SearchOperator = Field("and", description="whether all or any query_types must match")
+
+
 # ============================================================================
 # SERVER INITIALIZATION AND CLIENT SETUP
 # ============================================================================
@@ -85,9 +130,1684 @@ load_dotenv()
 api_key = os.getenv("RSPACE_API_KEY")
 api_url = os.getenv("RSPACE_URL")
 
-# Initialize RSpace clients
-eln_cli = e.ELNClient(api_url, api_key)  # Electronic Lab Notebook operations
-inv_cli = i.InventoryClient(api_url, api_key)  # Inventory Management operations
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# ==================== LAZY INITIALISATION ====================
+# The RSpace client libraries and the clients themselves are only needed once a
+# tool actually talks to RSpace. Deferring them keeps server startup (and the
+# first list_tools answer) cheap for short-lived stdio sessions.
+
+# Deferred startup costs, recorded as they happen (see --startup-profile)
+_startup_timings: Dict[str, float] = {}
+
+
+class _LazyImport:
+    """Stand-in for a module (or a module attribute) imported on first use"""
+
+    def __init__(self, module: str, attr: str = None):
+        self._module = module
+        self._attr = attr
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            start = time.perf_counter()
+            target = importlib.import_module(self._module)
+            if self._attr:
+                target = getattr(target, self._attr)
+            _startup_timings.setdefault(f"import {self._module}", time.perf_counter() - start)
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+
+class _LazyClient:
+    """Proxy that builds an RSpace client the first time one of its methods is used"""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self._name = name
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+        self._coalesced: Dict[str, Any] = {}
+
+    def _get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    start = time.perf_counter()
+                    client = self._factory()
+                    _startup_timings[f"init {self._name}"] = time.perf_counter() - start
+                    self._client = client
+        return self._client
+
+    @property
+    def initialised(self) -> bool:
+        return self._client is not None
+
+    @property
+    def uncoalesced(self):
+        """The client itself, for reads that must not join an in-flight request (read-modify-write)"""
+        return self._get()
+
+    def coalesce(self, single_flight, *method_names: str):
+        """Routes calls of these read methods through a single-flight group (see CACHING)"""
+        for method_name in method_names:
+            self._coalesced[method_name] = single_flight
+
+    def __getattr__(self, name):
+        method = getattr(self._get(), name)
+        single_flight = self._coalesced.get(name)
+        if single_flight is None:
+            return method
+        return lambda *args, **kwargs: single_flight.do(
+            (self._name, name, _call_key(args, kwargs)), lambda: method(*args, **kwargs)
+        )
+
+
+e = _LazyImport("rspace_client.eln.eln")  # Electronic Lab Notebook client
+i = _LazyImport("rspace_client.inv.inv")  # Inventory Management client
+AdvancedQueryBuilder = _LazyImport("rspace_client.eln.advanced_query_builder", "AdvancedQueryBuilder")
+
+
+# ==================== HTTP CONNECTION POOL ====================
+# eln_cli and inv_cli talk to the same RSpace host, so they share one
+# requests.Session and therefore one pool of keep-alive connections.
+# Pool sizing and TCP keep-alive are configured through environment variables:
+#   RSPACE_HTTP_POOL_CONNECTIONS  number of per-host pools to keep (default 4)
+#   RSPACE_HTTP_POOL_MAXSIZE      connections kept open per host (default 16)
+#   RSPACE_HTTP_POOL_BLOCK        wait for a free connection instead of opening
+#                                 a throwaway one when the pool is exhausted
+#   RSPACE_HTTP_KEEPALIVE         enable TCP keep-alive probes (default true)
+#   RSPACE_HTTP_KEEPALIVE_IDLE    idle seconds before the first probe (default 60)
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _keepalive_socket_options() -> list:
+    """TCP keep-alive socket options for pooled connections"""
+    import socket
+    from urllib3.connection import HTTPConnection
+
+    options = list(HTTPConnection.default_socket_options)
+    if not _env_bool("RSPACE_HTTP_KEEPALIVE", True):
+        return options
+    idle = _env_int("RSPACE_HTTP_KEEPALIVE_IDLE", 60)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Probe tuning is platform specific, only set what this OS supports
+    for option, value in (("TCP_KEEPIDLE", idle), ("TCP_KEEPINTVL", max(1, idle // 4)), ("TCP_KEEPCNT", 4)):
+        if hasattr(socket, option):
+            options.append((socket.IPPROTO_TCP, getattr(socket, option), value))
+    return options
+
+
+def _shared_http_session(template):
+    """
+    Returns the session shared by all RSpace clients, creating it on first use.
+    The first client's own session is used as a template so authentication
+    headers carry over. Retries are handled by _ResilientAdapter rather than
+    by urllib3, so a failed request is never retried by both.
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter(
+                pool_connections=_env_int("RSPACE_HTTP_POOL_CONNECTIONS", 4),
+                pool_maxsize=_env_int("RSPACE_HTTP_POOL_MAXSIZE", 16),
+                pool_block=_env_bool("RSPACE_HTTP_POOL_BLOCK", False),
+                max_retries=0,
+            )
+            adapter.poolmanager.connection_pool_kw["socket_options"] = _keepalive_socket_options()
+            session = requests.Session()
+            session.headers.update(template.headers)
+            # Every retry attempt goes through _UpstreamAdapter, so it is counted and traced
+            upstream = _ResilientAdapter(_UpstreamAdapter(adapter), circuit_breaker, rate_limiter)
+            session.mount("https://", upstream)
+            session.mount("http://", upstream)
+            _http_session = session
+        return _http_session
+
+
+def _use_shared_session(client):
+    """Swaps a freshly built client's private session for the shared pool"""
+    own_session = client._session
+    client._session = _shared_http_session(own_session)
+    own_session.close()
+    return client
+
+
+def http_pool_stats() -> dict:
+    """
+    Connection reuse statistics of the shared pool. A connection is opened
+    for a request only when no idle keep-alive connection is available, so
+    connections_opened well below requests means connections are being reused.
+    """
+    stats = {"initialised": _http_session is not None, "hosts": {}, "requests": 0, "connections_opened": 0}
+    if _http_session is None:
+        return stats
+    seen = set()
+    for adapter in _http_session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            stats["hosts"][host] = {
+                "requests": pool.num_requests,
+                "connections_opened": pool.num_connections,
+                "idle_connections": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0,
+                "max_connections": adapter._pool_maxsize,
+            }
+            stats["requests"] += pool.num_requests
+            stats["connections_opened"] += pool.num_connections
+    if stats["requests"]:
+        stats["reuse_ratio"] = round(1 - stats["connections_opened"] / stats["requests"], 3)
+    return stats
+
+
+def _build_eln_client():
+    return _use_shared_session(e.ELNClient(api_url, api_key))
+
+
+def _build_inv_client():
+    return _use_shared_session(i.InventoryClient(api_url, api_key))
+
+
+# RSpace clients, created on first use
+eln_cli = _LazyClient("eln_cli", _build_eln_client)  # Electronic Lab Notebook operations
+inv_cli = _LazyClient("inv_cli", _build_inv_client)  # Inventory Management operations
+
+
+# ==================== ASYNC ACCESS LAYER ====================
+# Read-heavy tools are declared `async def` so that a slow RSpace call does not
+# hold up other tool calls in flight on the same server. The blocking
+# rspace_client call runs in a worker thread and the event loop only awaits it;
+# requests still go through the shared connection pool above.
+
+class AsyncRSpaceClient:
+    """
+    Awaitable view of an RSpace client: every client method is available as a
+    coroutine, e.g. `await async_eln_cli.get_document(doc_id)`.
+    """
+
+    def __init__(self, client: _LazyClient):
+        self._client = client
+
+    def __getattr__(self, name):
+        import anyio
+
+        async def call(*args, **kwargs):
+            # Resolve the method in the worker too, so lazy client construction
+            # (and its imports) never runs on the event loop. A cancelled or
+            # timed-out caller stops waiting; the request finishes in the background.
+            return await anyio.to_thread.run_sync(
+                lambda: getattr(self._client, name)(*args, **kwargs), abandon_on_cancel=True
+            )
+
+        call.__name__ = name
+        return call
+
+
+async_eln_cli = AsyncRSpaceClient(eln_cli)
+async_inv_cli = AsyncRSpaceClient(inv_cli)
+
+
+# ============================================================================
+# OBSERVABILITY
+# ============================================================================
+# Per-tool call counts, errors, latency, upstream RSpace requests and response
+# sizes. A FastMCP middleware records every tool invocation and the pooled HTTP
+# adapter records every request made to RSpace on behalf of that invocation.
+# Metrics are served as Prometheus text on /metrics in HTTP mode and through
+# the get_server_metrics tool. Each worker process keeps its own metrics; with
+# several HTTP workers every series carries a worker="<pid>" label, so that a
+# scrape answered by another worker shows other series instead of counters
+# that appear to go backwards.
+#
+# The upstream activity of each call (requests per client, bytes, time) is also
+# attached to the tool result's _meta, and a warning is logged when one call
+# makes more than RSPACE_UPSTREAM_CALL_BUDGET requests (default 10, 0 disables),
+# which usually points at an N+1 request pattern.
+
+UPSTREAM_CALL_BUDGET = _env_int("RSPACE_UPSTREAM_CALL_BUDGET", 10)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+class Counter:
+    """Monotonic counter with labels"""
+    kind = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self.values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self.values.get(_label_key(labels), 0)
+
+    def samples(self) -> list:
+        with self._lock:
+            return [(self.name, dict(key), value) for key, value in self.values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self.values[_label_key(labels)] = value
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, per label set"""
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: tuple):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.values: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            entry = self.values.setdefault(key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["buckets"][index] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Upper bound of the bucket containing the q-quantile, None without observations"""
+        entry = self.values.get(_label_key(labels))
+        if not entry or not entry["count"]:
+            return None
+        rank = q * entry["count"]
+        for bound, cumulative in zip(self.buckets, entry["buckets"]):
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+    def samples(self) -> list:
+        samples = []
+        with self._lock:
+            for key, entry in self.values.items():
+                labels = dict(key)
+                for bound, cumulative in zip(self.buckets, entry["buckets"]):
+                    samples.append((f"{self.name}_bucket", {**labels, "le": str(bound)}, cumulative))
+                samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, entry["count"]))
+                samples.append((f"{self.name}_sum", labels, entry["sum"]))
+                samples.append((f"{self.name}_count", labels, entry["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    """In-process metric store that renders the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        # Added to every rendered sample, e.g. {"worker": "<pid>"}
+        self.labels: Dict[str, str] = {}
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._register(Counter(name, description))
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        return self._register(Gauge(name, description))
+
+    def histogram(self, name: str, description: str, buckets: tuple) -> Histogram:
+        return self._register(Histogram(name, description, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], list]):
+        """Registers a callable returning freshly populated metrics at render time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels({**self.labels, **labels})} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+metrics = MetricsRegistry()
+TOOL_CALLS = metrics.counter("rspace_mcp_tool_calls_total", "Tool invocations")
+TOOL_ERRORS = metrics.counter("rspace_mcp_tool_errors_total", "Tool invocations that raised or returned an error")
+TOOL_LATENCY = metrics.histogram("rspace_mcp_tool_duration_seconds", "Tool invocation latency", LATENCY_BUCKETS)
+TOOL_UPSTREAM_CALLS = metrics.counter("rspace_mcp_tool_upstream_calls_total", "RSpace API requests made by tools")
+TOOL_UPSTREAM_BYTES = metrics.counter("rspace_mcp_tool_upstream_bytes_total", "Bytes sent to and received from RSpace by tools")
+TOOL_UPSTREAM_SECONDS = metrics.counter("rspace_mcp_tool_upstream_seconds_total", "Time tools spent waiting on RSpace")
+TOOL_BUDGET_EXCEEDED = metrics.counter("rspace_mcp_tool_upstream_budget_exceeded_total",
+                                       "Tool calls that exceeded the upstream call budget")
+TOOL_RESPONSE_BYTES = metrics.histogram("rspace_mcp_tool_response_bytes", "Size of tool results", SIZE_BUCKETS)
+UPSTREAM_REQUESTS = metrics.counter("rspace_mcp_upstream_requests_total", "RSpace API requests by API and status")
+
+
+def _collect_pool_metrics() -> list:
+    stats = http_pool_stats()
+    requests_total = Counter("rspace_mcp_http_pool_requests_total", "Requests sent over pooled connections")
+    opened_total = Counter("rspace_mcp_http_pool_connections_opened_total", "Connections opened by the pool")
+    idle = Gauge("rspace_mcp_http_pool_idle_connections", "Idle keep-alive connections in the pool")
+    for host, host_stats in stats["hosts"].items():
+        requests_total.inc(host_stats["requests"], host=host)
+        opened_total.inc(host_stats["connections_opened"], host=host)
+        idle.set(host_stats["idle_connections"], host=host)
+    return [requests_total, opened_total, idle]
+
+
+metrics.add_collector(_collect_pool_metrics)
+
+
+class ToolCallStats:
+    """Upstream RSpace activity of a single tool invocation"""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.upstream_calls = 0
+        self.calls_by_api: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.upstream_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_upstream(self, api: str, bytes_sent: int, bytes_received: int, seconds: float):
+        with self._lock:
+            self.upstream_calls += 1
+            self.calls_by_api[api] = self.calls_by_api.get(api, 0) + 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+            self.upstream_seconds += seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.upstream_calls,
+            "eln_cli_calls": self.calls_by_api.get("eln", 0),
+            "inv_cli_calls": self.calls_by_api.get("inventory", 0),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "seconds": round(self.upstream_seconds, 4),
+        }
+
+
+# Stats of the tool invocation running in the current context; worker threads
+# started through AsyncRSpaceClient inherit it
+_current_tool_call: contextvars.ContextVar[Optional[ToolCallStats]] = contextvars.ContextVar(
+    "rspace_current_tool_call", default=None
+)
+
+
+def _upstream_api(url: str) -> str:
+    return "inventory" if "/api/inventory/" in url else "eln"
+
+
+def _request_size(request) -> int:
+    body = request.body
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return int(request.headers.get("Content-Length") or 0)
+
+
+def _response_size(response, streamed: bool) -> int:
+    length = response.headers.get("Content-Length")
+    if length is not None:
+        return int(length)
+    # Reading a streamed body here would buffer a download in memory
+    return 0 if streamed else len(response.content or b"")
+
+
+class _UpstreamAdapter:
+    """Wraps the pooled requests adapter to account for every request sent to RSpace"""
+
+    def __init__(self, adapter):
+        self._adapter = adapter
+
+    def send(self, request, **kwargs):
+        api = _upstream_api(request.url)
+        endpoint = _endpoint_template(request.url)
+        sent = _request_size(request)
+        status = "error"
+        received = 0
+        with _trace_span(f"{request.method} {endpoint}", "client", {
+            "rspace.api": api,
+            "http.request.method": request.method,
+            "url.path": endpoint,
+            "http.request.body.size": sent,
+        }) as span:
+            start = time.perf_counter()
+            try:
+                response = self._adapter.send(request, **kwargs)
+                status = str(response.status_code)
+                received = _response_size(response, kwargs.get("stream", False))
+                if span is not None:
+                    span.set_attribute("http.response.status_code", response.status_code)
+                    span.set_attribute("http.response.body.size", received)
+                    if response.status_code >= 400:
+                        _mark_span_error(span, f"HTTP {response.status_code}")
+                return response
+            finally:
+                UPSTREAM_REQUESTS.inc(api=api, method=request.method, status=status)
+                stats = _current_tool_call.get()
+                if stats is not None:
+                    stats.record_upstream(api, sent, received, time.perf_counter() - start)
+
+    def close(self):
+        self._adapter.close()
+
+    def __getattr__(self, name):
+        return getattr(self._adapter, name)
+
+
+def _result_size(result) -> int:
+    """Serialized size of a tool result's content blocks, in bytes"""
+    size = 0
+    for block in getattr(result, "content", None) or []:
+        text = getattr(block, "text", None)
+        if text is not None:
+            size += len(text.encode("utf-8"))
+        else:
+            size += len(getattr(block, "data", None) or getattr(block, "blob", None) or "")
+    return size
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Records call count, errors, latency, upstream requests and result size of every tool call"""
+
+    async def on_call_tool(self, context, call_next):
+        tool = getattr(context.message, "name", "unknown")
+        stats = ToolCallStats(tool)
+        token = _current_tool_call.set(stats)
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await call_next(context)
+            failed = bool(getattr(result, "is_error", False))
+            TOOL_RESPONSE_BYTES.observe(_result_size(result), tool=tool)
+            if hasattr(result, "meta"):
+                result.meta = {**(result.meta or {}), "rspace_upstream": stats.as_dict()}
+            return result
+        finally:
+            _current_tool_call.reset(token)
+            TOOL_CALLS.inc(tool=tool)
+            TOOL_LATENCY.observe(time.perf_counter() - start, tool=tool)
+            TOOL_UPSTREAM_CALLS.inc(stats.upstream_calls, tool=tool)
+            TOOL_UPSTREAM_BYTES.inc(stats.bytes_sent + stats.bytes_received, tool=tool)
+            TOOL_UPSTREAM_SECONDS.inc(stats.upstream_seconds, tool=tool)
+            if failed:
+                TOOL_ERRORS.inc(tool=tool)
+            if 0 < UPSTREAM_CALL_BUDGET < stats.upstream_calls:
+                TOOL_BUDGET_EXCEEDED.inc(tool=tool)
+                logger.warning(
+                    "Tool %s made %d RSpace API calls, over the budget of %d (%s)",
+                    tool, stats.upstream_calls, UPSTREAM_CALL_BUDGET, stats.as_dict(),
+                )
+
+
+mcp.add_middleware(ToolMetricsMiddleware())
+
+
+# ==================== TRACING ====================
+# Optional OpenTelemetry tracing: one span per tool invocation with a child
+# span for every RSpace API request it makes, so slow calls can be split into
+# time spent in RSpace and time spent in the MCP layer (argument validation,
+# result serialization). Enabled by RSPACE_OTEL_EXPORTER:
+#   otlp          export over OTLP/HTTP; endpoint and headers come from the
+#                 standard OTEL_EXPORTER_OTLP_* environment variables
+#   console       print spans to stderr (stdout carries the stdio transport)
+#   file:<path>   append spans to a file, one JSON object per line
+# Requires the optional "tracing" dependencies (opentelemetry-sdk and the OTLP
+# exporter); without them a warning is logged and tracing stays off.
+
+_tracer = None
+_tracing_configured = False
+_tracing_lock = threading.Lock()
+
+
+def _span_exporter(setting: str):
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if setting == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter()
+    if setting == "console":
+        return ConsoleSpanExporter(out=sys.stderr)
+    if setting.startswith("file:"):
+        spans_file = open(setting[len("file:"):], "a", encoding="utf-8")
+        return ConsoleSpanExporter(out=spans_file, formatter=lambda span: span.to_json(indent=None) + "\n")
+    raise ValueError(f"unknown RSPACE_OTEL_EXPORTER value {setting!r}, expected otlp, console or file:<path>")
+
+
+def _get_tracer():
+    """The tracer for RSpace MCP spans, or None when tracing is not enabled"""
+    global _tracer, _tracing_configured
+    if _tracing_configured:
+        return _tracer
+    with _tracing_lock:
+        if _tracing_configured:
+            return _tracer
+        setting = os.getenv("RSPACE_OTEL_EXPORTER", "").strip()
+        if setting:
+            try:
+                from opentelemetry import trace
+                from opentelemetry.sdk.resources import Resource
+                from opentelemetry.sdk.trace import TracerProvider
+                from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+                provider = TracerProvider(
+                    resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", "rspace-mcp")})
+                )
+                provider.add_span_processor(BatchSpanProcessor(_span_exporter(setting)))
+                trace.set_tracer_provider(provider)
+                _tracer = trace.get_tracer("rspace_mcp")
+            except ImportError as ex:
+                logger.warning("RSPACE_OTEL_EXPORTER is set but tracing dependencies are missing (%s); "
+                               "install the 'tracing' extra to enable it", ex)
+            except ValueError as ex:
+                logger.warning("Tracing disabled: %s", ex)
+        _tracing_configured = True
+    return _tracer
+
+
+def _trace_span(name: str, kind: str, attributes: dict):
+    """Context manager yielding a current span, or None when tracing is off"""
+    tracer = _get_tracer()
+    if tracer is None:
+        return contextlib.nullcontext()
+    from opentelemetry.trace import SpanKind
+
+    span_kind = SpanKind.CLIENT if kind == "client" else SpanKind.SERVER
+    return tracer.start_as_current_span(name, kind=span_kind, attributes=attributes)
+
+
+def _mark_span_error(span, description: str):
+    from opentelemetry.trace import Status, StatusCode
+
+    span.set_status(Status(StatusCode.ERROR, description))
+
+
+def _endpoint_template(url: str) -> str:
+    """URL path with record ids replaced, e.g. /api/v1/documents/{id}, to keep span names low-cardinality"""
+    from urllib.parse import urlsplit
+
+    return re.sub(r"/(?:[A-Z]{2})?\d+(?=/|$)", "/{id}", urlsplit(url).path)
+
+
+class ToolTracingMiddleware(Middleware):
+    """Wraps every tool call in a span that RSpace request spans are nested under"""
+
+    async def on_call_tool(self, context, call_next):
+        tool = getattr(context.message, "name", "unknown")
+        with _trace_span(f"tool {tool}", "server", {"mcp.tool.name": tool}) as span:
+            result = await call_next(context)
+            if span is not None:
+                stats = _current_tool_call.get()
+                if stats is not None:
+                    span.set_attribute("rspace.upstream.calls", stats.upstream_calls)
+                    span.set_attribute("rspace.upstream.bytes_received", stats.bytes_received)
+                    span.set_attribute("rspace.upstream.seconds", stats.upstream_seconds)
+                span.set_attribute("mcp.tool.response.size", _result_size(result))
+                if getattr(result, "is_error", False):
+                    _mark_span_error(span, "tool returned an error result")
+            return result
+
+
+# Added after the metrics middleware so it runs inside it and can read the call's upstream stats
+mcp.add_middleware(ToolTracingMiddleware())
+
+
+# ==================== COMPACT OUTPUT ====================
+# Raw RSpace records carry keys agents rarely need (_links, owner objects,
+# permission blocks). They are removed from tool results at any depth before
+# the result is encoded for the client and before its size is measured.
+# FastMCP has already converted the tool's return value to structured content
+# when middleware sees it, so the structured content is compacted and, when
+# keys were removed, the text content regenerated from it.
+#   RSPACE_COMPACT_OUTPUT   false returns results unchanged (default true)
+#   RSPACE_COMPACT_DENY     comma-separated keys removed from every tool's result
+#                           (default _links,owner,permittedActions,sharedWith)
+#   RSPACE_COMPACT_RULES    JSON per-tool overrides, e.g.
+#                           {"get_sample": {"allow": ["owner"]}, "get_forms": {"deny": ["stableId"]}}
+#                           "allow" keeps keys of the global list, "deny" removes more
+
+COMPACT_OUTPUT = _env_bool("RSPACE_COMPACT_OUTPUT", True)
+COMPACT_DEFAULT_DENY = frozenset(
+    key.strip() for key in (os.getenv("RSPACE_COMPACT_DENY") or "_links,owner,permittedActions,sharedWith").split(",")
+    if key.strip()
+)
+COMPACT_BYTES_SAVED = metrics.counter("rspace_mcp_compact_bytes_saved_total",
+                                      "Tool response bytes removed by compact output, by tool")
+
+
+def _compact_rules() -> Dict[str, dict]:
+    value = os.getenv("RSPACE_COMPACT_RULES")
+    if not value:
+        return {}
+    import json
+
+    rules = json.loads(value)
+    if not isinstance(rules, dict) or not all(isinstance(rule, dict) for rule in rules.values()):
+        raise ValueError('RSPACE_COMPACT_RULES must map tool names to {"allow": [...], "deny": [...]}')
+    return rules
+
+
+COMPACT_TOOL_RULES = _compact_rules()
+
+
+def _compact_deny(tool: str) -> frozenset:
+    """Keys removed from the result of `tool`"""
+    rule = COMPACT_TOOL_RULES.get(tool, {})
+    return (COMPACT_DEFAULT_DENY - set(rule.get("allow", ()))) | set(rule.get("deny", ()))
+
+
+def _serialize_result(value) -> str:
+    """Text of a tool result as FastMCP renders it: strings as they are, anything else as JSON"""
+    if isinstance(value, str):
+        return value
+    import pydantic_core
+
+    return pydantic_core.to_json(value, fallback=str).decode()
+
+
+def _compact(value, deny: frozenset):
+    if isinstance(value, dict):
+        return {key: _compact(item, deny) for key, item in value.items() if key not in deny}
+    if isinstance(value, list):
+        return [_compact(item, deny) for item in value]
+    return value
+
+
+class CompactOutputMiddleware(Middleware):
+    """Removes unused keys from tool results, as configured by the COMPACT settings"""
+
+    def __init__(self):
+        # tool name -> whether FastMCP wraps its result as {"result": ...} in structured content
+        self._wrapped: Dict[str, bool] = {}
+
+    async def on_call_tool(self, context, call_next):
+        result = await call_next(context)
+        tool = getattr(context.message, "name", "unknown")
+        deny = _compact_deny(tool)
+        structured = getattr(result, "structured_content", None)
+        if not deny or structured is None or getattr(result, "is_error", False):
+            return result
+        compacted = _compact(structured, deny)
+        if compacted == structured:
+            return result
+        from mcp.types import TextContent
+
+        value = compacted.get("result") if await self._is_wrapped(context, tool) else compacted
+        before = _result_size(result)
+        result.structured_content = compacted
+        # Only the text rendering of the result changes; other content blocks are kept
+        text = TextContent(type="text", text=_serialize_result(value))
+        content, replaced = [], False
+        for block in result.content or []:
+            if getattr(block, "type", None) != "text":
+                content.append(block)
+            elif not replaced:
+                content.append(text)
+                replaced = True
+        result.content = content if replaced else [text, *content]
+        COMPACT_BYTES_SAVED.inc(max(0, before - _result_size(result)), tool=tool)
+        return result
+
+    async def _is_wrapped(self, context, tool: str) -> bool:
+        if tool not in self._wrapped:
+            server = context.fastmcp_context.fastmcp if context.fastmcp_context else None
+            definition = await server.get_tool(tool) if server is not None else None
+            schema = getattr(definition, "output_schema", None) or {}
+            self._wrapped[tool] = bool(schema.get("x-fastmcp-wrap-result"))
+        return self._wrapped[tool]
+
+
+# Added last so it runs innermost: metrics and traces see the compacted result
+if COMPACT_OUTPUT:
+    mcp.add_middleware(CompactOutputMiddleware())
+
+
+# ==================== RESILIENCE ====================
+# Transient RSpace failures are retried below the tools, so a tool call does
+# not fail (and get redone by the LLM) because of one 502 or timeout.
+#   - Idempotent requests (GET/HEAD/OPTIONS and, as in rspace-client's own
+#     retry policy, PUT/DELETE) are retried on 500/502/503/504, timeouts and
+#     connection errors. Requests RSpace refused without processing (503) are
+#     retried for every method, POST included, as rspace-client does. 429s are
+#     handed to the rate limiter below and queued rather than counted as failures.
+#   - Backoff is exponential with full jitter, and a Retry-After header is
+#     honoured when it asks for a longer wait.
+#   - A circuit breaker opens after consecutive failures and rejects requests
+#     immediately while RSpace is down, instead of letting every tool call sit
+#     through its timeouts and retries. After a cool-down one trial request is
+#     let through; its outcome closes or re-opens the circuit.
+# Configuration:
+#   RSPACE_RETRY_MAX_ATTEMPTS          attempts per request, 1 disables retries (default 3)
+#   RSPACE_RETRY_BACKOFF_BASE          first backoff ceiling in seconds (default 0.25)
+#   RSPACE_RETRY_BACKOFF_MAX           longest wait between attempts (default 5)
+#   RSPACE_BREAKER_FAILURE_THRESHOLD   consecutive failures that open the circuit, 0 disables (default 5)
+#   RSPACE_BREAKER_RESET_SECONDS       cool-down before a trial request (default 30)
+
+RETRY_MAX_ATTEMPTS = max(1, _env_int("RSPACE_RETRY_MAX_ATTEMPTS", 3))
+RETRY_BACKOFF_BASE = _env_float("RSPACE_RETRY_BACKOFF_BASE", 0.25)
+RETRY_BACKOFF_MAX = _env_float("RSPACE_RETRY_BACKOFF_MAX", 5.0)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+REFUSED_STATUSES = frozenset({503})
+
+UPSTREAM_RETRIES = metrics.counter("rspace_mcp_upstream_retries_total", "RSpace requests retried, by reason")
+BREAKER_REJECTIONS = metrics.counter("rspace_mcp_circuit_breaker_rejections_total",
+                                     "RSpace requests rejected while the circuit was open")
+BREAKER_TRANSITIONS = metrics.counter("rspace_mcp_circuit_breaker_transitions_total",
+                                      "Circuit breaker state changes, by new state")
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial request"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.failure_threshold <= 0:
+                return
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial request through (0 once half-open)"""
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def _transition(self, state: str):
+        if state == self.OPEN:
+            logger.warning("RSpace circuit breaker opened after %d consecutive failures; "
+                           "failing fast for %.0fs", self.consecutive_failures, self.reset_seconds)
+        elif state == self.CLOSED:
+            logger.info("RSpace circuit breaker closed, RSpace is responding again")
+        self.state = state
+        BREAKER_TRANSITIONS.inc(state=state)
+
+    def as_dict(self) -> dict:
+        stats = {
+            "state": self.state if self.failure_threshold > 0 else "disabled",
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_seconds": self.reset_seconds,
+        }
+        if self.state == self.OPEN:
+            stats["retry_in_seconds"] = round(self.retry_in(), 1)
+        return stats
+
+
+circuit_breaker = CircuitBreaker(
+    _env_int("RSPACE_BREAKER_FAILURE_THRESHOLD", 5),
+    _env_float("RSPACE_BREAKER_RESET_SECONDS", 30.0),
+)
+
+
+def _retry_after_seconds(response) -> float:
+    """Wait requested by a Retry-After header (delta-seconds or HTTP date), 0 when absent"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        from email.utils import parsedate_to_datetime
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)"""
+    import random
+
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+class _ResilientAdapter:
+    """Retries transient RSpace failures and fails fast while the circuit breaker is open"""
+
+    def __init__(self, adapter, breaker: CircuitBreaker, limiter: "RateLimiter"):
+        self._adapter = adapter
+        self._breaker = breaker
+        self._limiter = limiter
+
+    def send(self, request, **kwargs):
+        from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 1
+        throttled = 0
+        last_failure = None
+        while True:
+            if not self._breaker.allow():
+                # If the circuit opened while this request was backing off, report its own failure
+                if isinstance(last_failure, Exception):
+                    raise last_failure
+                if last_failure is not None:
+                    return last_failure
+                BREAKER_REJECTIONS.inc(api=_upstream_api(request.url))
+                if self._breaker.state == CircuitBreaker.HALF_OPEN:
+                    wait = "until a trial request shows whether it has recovered"
+                else:
+                    wait = f"for another {math.ceil(self._breaker.retry_in())}s"
+                raise RequestsConnectionError(
+                    f"RSpace appears to be unavailable ({self._breaker.consecutive_failures} consecutive "
+                    f"failed requests); requests fail fast {wait}",
+                    request=request,
+                )
+            self._limiter.acquire()
+            try:
+                response = self._adapter.send(request, **kwargs)
+            except (RequestsConnectionError, Timeout) as ex:
+                self._breaker.record_failure()
+                if not idempotent or attempt >= RETRY_MAX_ATTEMPTS:
+                    raise
+                last_failure = ex
+                reason = "timeout" if isinstance(ex, Timeout) else "connection_error"
+                delay = _backoff_delay(attempt)
+            except BaseException:
+                # e.g. ChunkedEncodingError while the body is read; recording it
+                # also ends a half-open trial, which would otherwise block forever
+                self._breaker.record_failure()
+                raise
+            else:
+                status = response.status_code
+                if status >= 500:
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.record_success()
+                if status == 429:
+                    self._limiter.throttled(_retry_after_seconds(response))
+                    throttled += 1
+                    if throttled > RATE_LIMIT_MAX_REQUEUES:
+                        return response
+                    response.content
+                    response.close()
+                    last_failure = response
+                    # Queued again behind the limiter's pause; does not use up a retry attempt
+                    UPSTREAM_RETRIES.inc(api=_upstream_api(request.url), reason="429")
+                    continue
+                self._limiter.succeeded()
+                retryable = status in REFUSED_STATUSES or (idempotent and status in RETRYABLE_STATUSES)
+                if not retryable or attempt >= RETRY_MAX_ATTEMPTS:
+                    return response
+                # Reading the (small) error body lets the connection go back to the pool
+                response.content
+                response.close()
+                last_failure = response
+                reason = str(status)
+                delay = min(RETRY_BACKOFF_MAX, max(_backoff_delay(attempt), _retry_after_seconds(response)))
+            UPSTREAM_RETRIES.inc(api=_upstream_api(request.url), reason=reason)
+            logger.info("Retrying %s %s in %.2fs after %s (attempt %d of %d)", request.method,
+                        _endpoint_template(request.url), delay, reason, attempt + 1, RETRY_MAX_ATTEMPTS)
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self._adapter.close()
+
+    def __getattr__(self, name):
+        return getattr(self._adapter, name)
+
+
+def resilience_stats() -> dict:
+    """Retry and circuit breaker state, as reported by get_server_metrics"""
+    retries = {}
+    for key, value in UPSTREAM_RETRIES.values.items():
+        labels = dict(key)
+        retries[f"{labels['api']} {labels['reason']}"] = int(value)
+    return {
+        "max_attempts": RETRY_MAX_ATTEMPTS,
+        "retries": retries,
+        "circuit_breaker": circuit_breaker.as_dict(),
+        "rejected_while_open": int(sum(BREAKER_REJECTIONS.values.values())),
+    }
+
+
+def _collect_breaker_metrics() -> list:
+    state = Gauge("rspace_mcp_circuit_breaker_open", "1 while the RSpace circuit breaker is open or half-open")
+    state.set(0 if circuit_breaker.state == CircuitBreaker.CLOSED else 1)
+    return [state]
+
+
+metrics.add_collector(_collect_breaker_metrics)
+
+
+# ==================== RATE LIMITING ====================
+# A token bucket shared by eln_cli and inv_cli paces requests to RSpace, so
+# bursts (e.g. hydrating a 200-result search) queue inside the server instead
+# of tripping RSpace's API rate limit. The rate adapts to the server: each 429
+# halves it and pauses all requests for the Retry-After period (or one token
+# interval without the header), and successful requests raise it again step by
+# step up to the configured rate. Throttled requests are re-queued, up to
+# RSPACE_RATE_LIMIT_MAX_REQUEUES times, rather than failing the tool call.
+#   RSPACE_RATE_LIMIT                requests per second, 0 disables pacing (default 20)
+#   RSPACE_RATE_LIMIT_BURST          requests that may be sent back to back (default 20)
+#   RSPACE_RATE_LIMIT_MIN            floor for the adapted rate (default 0.5)
+#   RSPACE_RATE_LIMIT_MAX_PAUSE      longest Retry-After that is honoured, in seconds (default 60)
+#   RSPACE_RATE_LIMIT_MAX_REQUEUES   429s tolerated per request (default 6)
+
+RATE_LIMIT_MAX_REQUEUES = _env_int("RSPACE_RATE_LIMIT_MAX_REQUEUES", 6)
+
+RATE_LIMIT_THROTTLED = metrics.counter("rspace_mcp_rate_limit_throttled_total", "429 responses received from RSpace")
+RATE_LIMIT_WAIT = metrics.histogram("rspace_mcp_rate_limit_wait_seconds",
+                                    "Time requests were queued by the rate limiter", LATENCY_BUCKETS)
+
+
+class RateLimiter:
+    """Token bucket with multiplicative decrease on 429s and additive recovery on success"""
+
+    DECREASE_FACTOR = 0.5
+    # Successful requests needed to climb from the floor back to the configured rate
+    RECOVERY_STEPS = 50
+
+    def __init__(self, rate: float, burst: int, min_rate: float, max_pause: float):
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate) if rate > 0 else min_rate
+        self.max_pause = max_pause
+        self.tokens = float(self.burst)
+        self.paused_until = 0.0
+        self.waiting = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Blocks until a request may be sent; returns the seconds spent waiting"""
+        waited = 0.0
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now >= self.paused_until:
+                        if self.rate <= 0:
+                            break
+                        if self.tokens >= 1:
+                            self.tokens -= 1
+                            break
+                    wait = max(self.paused_until - now, (1 - self.tokens) / self.rate if self.rate > 0 else 0)
+                time.sleep(wait)
+                waited += wait
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        RATE_LIMIT_WAIT.observe(waited)
+        return waited
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            if self.rate > 0:
+                self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def throttled(self, retry_after: float):
+        """RSpace answered 429: slow down and hold every queued request back"""
+        RATE_LIMIT_THROTTLED.inc()
+        with self._lock:
+            now = time.monotonic()
+            if self.rate > 0:
+                self.rate = max(self.min_rate, self.rate * self.DECREASE_FACTOR)
+            pause = min(self.max_pause, retry_after) if retry_after else (1 / self.rate if self.rate > 0 else 1.0)
+            self.paused_until = max(self.paused_until, now + pause)
+            # No tokens accumulate during the pause, so queued requests do not burst out together
+            self.tokens = 0.0
+            self._updated = self.paused_until
+        logger.info("RSpace rate limit hit, pausing requests for %.1fs at %.1f requests/s", pause, self.rate)
+
+    def succeeded(self):
+        with self._lock:
+            if 0 < self.rate < self.configured_rate:
+                step = (self.configured_rate - self.min_rate) / self.RECOVERY_STEPS
+                self.rate = min(self.configured_rate, self.rate + step)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "enabled": self.configured_rate > 0,
+                "configured_rate": self.configured_rate,
+                "current_rate": round(self.rate, 3),
+                "burst": self.burst,
+                "available_tokens": round(max(0.0, self.tokens), 2),
+                "queued_requests": self.waiting,
+                "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+                "throttled_responses": int(RATE_LIMIT_THROTTLED.value()),
+                "queued_seconds_total": round(RATE_LIMIT_WAIT.values.get((), {}).get("sum", 0.0), 3),
+            }
+
+
+rate_limiter = RateLimiter(
+    _env_float("RSPACE_RATE_LIMIT", 20.0),
+    _env_int("RSPACE_RATE_LIMIT_BURST", 20),
+    _env_float("RSPACE_RATE_LIMIT_MIN", 0.5),
+    _env_float("RSPACE_RATE_LIMIT_MAX_PAUSE", 60.0),
+)
+
+
+def _collect_rate_limit_metrics() -> list:
+    stats = rate_limiter.as_dict()
+    rate = Gauge("rspace_mcp_rate_limit_current_rate", "Requests per second currently allowed by the rate limiter")
+    tokens = Gauge("rspace_mcp_rate_limit_available_tokens", "Tokens left in the rate limiter bucket")
+    queued = Gauge("rspace_mcp_rate_limit_queued_requests", "Requests waiting for the rate limiter")
+    rate.set(stats["current_rate"])
+    tokens.set(stats["available_tokens"])
+    queued.set(stats["queued_requests"])
+    return [rate, tokens, queued]
+
+
+metrics.add_collector(_collect_rate_limit_metrics)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request):
+    """Prometheus scrape endpoint (HTTP transport only)"""
+    from starlette.responses import PlainTextResponse
+
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+def server_metrics_summary() -> dict:
+    """Per-tool metrics summary, as returned by get_server_metrics"""
+    tools = {}
+    for key, calls in TOOL_CALLS.values.items():
+        labels = dict(key)
+        tool = labels["tool"]
+        latency = TOOL_LATENCY.values.get(key, {"sum": 0.0, "count": 0})
+        size = TOOL_RESPONSE_BYTES.values.get(key, {"sum": 0.0, "count": 0})
+        tools[tool] = {
+            "calls": int(calls),
+            "errors": int(TOOL_ERRORS.value(**labels)),
+            "latency_seconds": {
+                "mean": round(latency["sum"] / latency["count"], 4) if latency["count"] else None,
+                "p50_le": TOOL_LATENCY.quantile(0.5, **labels),
+                "p95_le": TOOL_LATENCY.quantile(0.95, **labels),
+            },
+            "upstream_calls": int(TOOL_UPSTREAM_CALLS.value(**labels)),
+            "upstream_bytes": int(TOOL_UPSTREAM_BYTES.value(**labels)),
+            "upstream_seconds": round(TOOL_UPSTREAM_SECONDS.value(**labels), 4),
+            "upstream_budget_exceeded": int(TOOL_BUDGET_EXCEEDED.value(**labels)),
+            "response_bytes": int(size["sum"]),
+            "compact_bytes_saved": int(COMPACT_BYTES_SAVED.value(**labels)),
+        }
+    upstream = {}
+    for labels, value in ((dict(key), value) for key, value in UPSTREAM_REQUESTS.values.items()):
+        upstream[f"{labels['api']} {labels['method']} {labels['status']}"] = int(value)
+    return {
+        "tools": tools,
+        "upstream_requests": upstream,
+        "resilience": resilience_stats(),
+        "rate_limiter": rate_limiter.as_dict(),
+        "document_cache": document_cache.as_dict(),
+        "search_cache": search_cache.as_dict(),
+        "tag_index": tag_index.as_dict(),
+        "single_flight": request_coalescer.as_dict(),
+        "http_pool": http_pool_stats(),
+    }
+
+
+# ============================================================================
+# CACHING
+# ============================================================================
+# In-process caches in front of the RSpace API. Each worker process keeps its
+# own, so entries are bounded in size and age rather than kept coherent across
+# processes; tools that modify a record invalidate it locally.
+
+# ==================== DOCUMENT CACHE ====================
+# Full documents read by get_single_Rspace_document, keyed by numeric id (a
+# globalId such as "SD123" maps to the same entry). Documents seen in a listing
+# or search result revalidate the cached copy for free: a matching lastModified
+# renews the entry, a different one drops it. Entries not revalidated within
+# the TTL are refetched.
+#   RSPACE_DOCUMENT_CACHE_SIZE   documents kept, 0 disables the cache (default 256)
+#   RSPACE_DOCUMENT_CACHE_TTL    seconds an entry is trusted without revalidation (default 300)
+
+DOCUMENT_CACHE_LOOKUPS = metrics.counter("rspace_mcp_document_cache_lookups_total",
+                                         "Document cache lookups, by result (hit or miss)")
+DOCUMENT_CACHE_EVICTIONS = metrics.counter("rspace_mcp_document_cache_evictions_total",
+                                           "Documents dropped from the cache, by reason")
+
+
+def _document_key(doc_id) -> Optional[int]:
+    """Numeric id of a document given as number or globalId (e.g. "SD123"), None if unrecognised"""
+    match = re.fullmatch(r"(?:[A-Za-z]{2})?(\d+)", str(doc_id).strip())
+    return int(match.group(1)) if match else None
+
+
+class DocumentCache:
+    """LRU cache of full documents with a TTL, revalidated by lastModified from listings"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # numeric id -> (document, lastModified, time of last validation)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        # Bumped by every invalidation, so a read that overlapped a write is not stored
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, doc_id) -> Optional[dict]:
+        """A copy of the cached document, or None when absent or expired"""
+        key = _document_key(doc_id)
+        if self.max_entries <= 0 or key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] > self.ttl_seconds:
+                del self._entries[key]
+                DOCUMENT_CACHE_EVICTIONS.inc(reason="expired")
+                entry = None
+            if entry is None:
+                DOCUMENT_CACHE_LOOKUPS.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+        DOCUMENT_CACHE_LOOKUPS.inc(result="hit")
+        return copy.deepcopy(entry[0])
+
+    def put(self, document: dict, generation: int):
+        """Caches a document read while the cache was at `generation` (dropped if it moved on)"""
+        key = _document_key(document.get("id", ""))
+        if self.max_entries <= 0 or key is None:
+            return
+        entry = (copy.deepcopy(document), document.get("lastModified"), time.monotonic())
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                DOCUMENT_CACHE_EVICTIONS.inc(reason="lru")
+
+    def revalidate(self, listed_documents: list):
+        """Renews or drops cached documents using the lastModified of documents in a listing"""
+        if not self._entries:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for listed in listed_documents:
+                key = _document_key(listed.get("id", ""))
+                entry = self._entries.get(key)
+                if entry is None or "lastModified" not in listed:
+                    continue
+                if listed["lastModified"] == entry[1]:
+                    self._entries[key] = (entry[0], entry[1], now)
+                else:
+                    del self._entries[key]
+                    DOCUMENT_CACHE_EVICTIONS.inc(reason="stale")
+
+    def invalidate(self, doc_id):
+        with self._lock:
+            self.generation += 1
+            if self._entries.pop(_document_key(doc_id), None) is not None:
+                DOCUMENT_CACHE_EVICTIONS.inc(reason="invalidated")
+
+    def as_dict(self) -> dict:
+        hits = DOCUMENT_CACHE_LOOKUPS.value(result="hit")
+        misses = DOCUMENT_CACHE_LOOKUPS.value(result="miss")
+        return {
+            "enabled": self.max_entries > 0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": int(hits),
+            "misses": int(misses),
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None,
+            "evictions": {dict(key)["reason"]: int(value) for key, value in DOCUMENT_CACHE_EVICTIONS.values.items()},
+        }
+
+
+document_cache = DocumentCache(
+    _env_int("RSPACE_DOCUMENT_CACHE_SIZE", 256),
+    _env_float("RSPACE_DOCUMENT_CACHE_TTL", 300.0),
+)
+
+
+async def _load_document(doc_id) -> dict:
+    """Full document from the cache, falling back to RSpace (and caching the result)"""
+    document = document_cache.get(doc_id)
+    if document is None:
+        generation = document_cache.generation
+        document = await async_eln_cli.get_document(doc_id)
+        document_cache.put(document, generation)
+    return document
+
+
+def _observe_listing(documents: list):
+    """Feeds documents from a listing or search result to the caches"""
+    document_cache.revalidate(documents)
+    tag_index.observe(documents)
+
+
+# ==================== SEARCH RESULT CACHE ====================
+# Result pages of search_documents, search_by_tags and search_recent_documents,
+# keyed by the normalised query (advanced query terms in a canonical order)
+# plus ordering and paging. Any document written through this server clears
+# the whole cache, since a write can move a document into or out of any
+# result; writes made elsewhere in RSpace show up once the short TTL expires.
+#   RSPACE_SEARCH_CACHE_SIZE   result pages kept, 0 disables the cache (default 128)
+#   RSPACE_SEARCH_CACHE_TTL    seconds a page is reused (default 60)
+
+SEARCH_CACHE_LOOKUPS = metrics.counter("rspace_mcp_search_cache_lookups_total",
+                                       "Search result cache lookups, by result (hit or miss)")
+SEARCH_CACHE_INVALIDATIONS = metrics.counter("rspace_mcp_search_cache_invalidations_total",
+                                             "Times the search result cache was cleared by a write")
+
+
+def _search_key(kind: str, query: str, order_by: str, page_number: int, page_size: int) -> tuple:
+    """Cache key of a search result page; advanced queries are compared term-order independently"""
+    if kind == "advanced":
+        import json
+
+        parsed = json.loads(query)
+        terms = sorted((term.get("queryType", ""), term.get("query", "")) for term in parsed.get("terms", []))
+        query = json.dumps([parsed.get("operator", "and").lower(), terms])
+    else:
+        query = " ".join(query.split()).lower()
+    return kind, query, " ".join((order_by or "").split()).lower(), page_number, page_size
+
+
+class SearchCache:
+    """Short-lived LRU cache of search result pages, cleared on writes"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (result, time stored)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Bumped by every write, so a search that overlapped one is not stored
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[dict]:
+        """A copy of the cached result, or None when absent or expired"""
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                SEARCH_CACHE_LOOKUPS.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+        SEARCH_CACHE_LOOKUPS.inc(result="hit")
+        return copy.deepcopy(entry[0])
+
+    def put(self, key: tuple, result: dict, generation: int):
+        if self.max_entries <= 0:
+            return
+        entry = (copy.deepcopy(result), time.monotonic())
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+        SEARCH_CACHE_INVALIDATIONS.inc()
+
+    def as_dict(self) -> dict:
+        hits = SEARCH_CACHE_LOOKUPS.value(result="hit")
+        misses = SEARCH_CACHE_LOOKUPS.value(result="miss")
+        return {
+            "enabled": self.max_entries > 0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": int(hits),
+            "misses": int(misses),
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None,
+            "invalidations": int(SEARCH_CACHE_INVALIDATIONS.value()),
+        }
+
+
+search_cache = SearchCache(
+    _env_int("RSPACE_SEARCH_CACHE_SIZE", 128),
+    _env_float("RSPACE_SEARCH_CACHE_TTL", 60.0),
+)
+
+
+async def _cached_search(key: tuple, fetch: Callable[[], Any]) -> dict:
+    """
+    Search result page from the cache, falling back to fetch() (and caching the
+    result). Only fresh pages are passed to _observe_listing: a cached page may
+    be a TTL old, and revalidating with it would renew stale document entries.
+    """
+    result = search_cache.get(key)
+    if result is None:
+        generation = search_cache.generation
+        result = await fetch()
+        _observe_listing(result.get('documents', []))
+        search_cache.put(key, result, generation)
+    return result
+
+
+def _document_written(doc_id=None):
+    """Drops what the caches hold about a document this server created or modified"""
+    if doc_id is not None:
+        document_cache.invalidate(doc_id)
+        request_coalescer.forget(doc_id)
+    search_cache.clear()
+    tag_index.expire()
+
+
+# ==================== TAG INDEX ====================
+# Tags of every document seen in a listing or search result, so list_tags can
+# answer from memory. Each document's latest tags are kept (by lastModified), and
+# counts, last use and sample documents are aggregated from them on demand.
+# list_tags tops it up incrementally from a lastModified watermark, like the
+# local search index; documents deleted in RSpace only drop out on a rebuild.
+#   RSPACE_TAG_INDEX_MAX_AGE   seconds before list_tags refreshes the index (default 300)
+
+TAG_INDEX_MAX_AGE = _env_float("RSPACE_TAG_INDEX_MAX_AGE", 300.0)
+
+
+class TagIndex:
+    """Tags of listed documents, aggregated per tag"""
+
+    SAMPLE_SIZE = 5
+
+    def __init__(self):
+        # numeric id -> (globalId, lastModified, tags)
+        self._documents: Dict[int, tuple] = {}
+        # Newest lastModified of a refresh listing; refreshes continue from here
+        self.watermark: Optional[str] = None
+        self.refreshed_at: Optional[float] = None
+        # Whether every document has been listed at least once
+        self.complete = False
+        self._lock = threading.Lock()
+
+    def observe(self, documents: list):
+        with self._lock:
+            for document in documents:
+                key = _document_key(document.get("id", ""))
+                if key is None or "tags" not in document:
+                    continue
+                modified = document.get("lastModified") or ""
+                current = self._documents.get(key)
+                if current is not None and modified < current[1]:
+                    continue  # an older copy, e.g. from a cached search page
+                self._documents[key] = (document.get("globalId", f"SD{key}"), modified,
+                                        tuple(_tag_list(document["tags"])))
+
+    def retain(self, doc_ids: set):
+        """Forgets documents not in doc_ids (numeric ids), i.e. deleted ones"""
+        with self._lock:
+            for key in [key for key in self._documents if key not in doc_ids]:
+                del self._documents[key]
+
+    def expire(self):
+        """Makes the next list_tags refresh the index"""
+        self.refreshed_at = None
+
+    def is_stale(self) -> bool:
+        return self.refreshed_at is None or time.time() - self.refreshed_at > TAG_INDEX_MAX_AGE
+
+    def tags(self, prefix: Optional[str] = None) -> List[dict]:
+        """Tags starting with prefix (case-insensitive), most used first"""
+        import heapq
+
+        prefix = (prefix or "").strip().lower()
+        used: Dict[str, list] = {}
+        with self._lock:
+            for global_id, modified, tags in self._documents.values():
+                for tag in tags:
+                    if tag.lower().startswith(prefix):
+                        used.setdefault(tag, []).append((modified, global_id))
+        summary = []
+        for tag, documents in used.items():
+            recent = heapq.nlargest(self.SAMPLE_SIZE, documents)
+            summary.append({
+                "tag": tag,
+                "count": len(documents),
+                "lastUsed": recent[0][0] or None,
+                "sampleDocuments": [global_id for _, global_id in recent],
+            })
+        summary.sort(key=lambda entry: (-entry["count"], entry["tag"].lower()))
+        return summary
+
+    def as_dict(self) -> dict:
+        return {
+            "documents": len(self._documents),
+            "complete": self.complete,
+            "watermark": self.watermark,
+            "last_refresh": _iso_time(self.refreshed_at) if self.refreshed_at else None,
+        }
+
+
+tag_index = TagIndex()
+
+
+# ==================== REQUEST COALESCING ====================
+# Concurrent identical reads of one record (parallel tool calls, several agents
+# on a shared HTTP server) share a single in-flight RSpace request: the first
+# caller makes it, the others wait for it and receive a copy of its result or
+# its error. Nothing is kept once the request completes. Coalescing happens at
+# the client level, so sync tools and the async layer's worker threads share
+# flights. "SD12" and 12 count as the same record. A write through this server
+# detaches in-flight reads of the record it changed, so a read that starts after
+# the write never receives the pre-write payload; read-modify-write paths read
+# through `.uncoalesced` so they never share a read at all.
+
+SINGLE_FLIGHT_COALESCED = metrics.counter("rspace_mcp_single_flight_coalesced_total",
+                                          "Reads served by joining an identical in-flight request")
+
+
+def _inventory_written(*record_ids):
+    """Makes reads of inventory records this server modified start a fresh request"""
+    for record_id in record_ids:
+        request_coalescer.forget(record_id)
+
+
+def _call_key(args: tuple, kwargs: dict) -> tuple:
+    """Hashable key of a call's arguments, with record ids normalised to numbers"""
+    def normalise(value):
+        if isinstance(value, (int, str)):
+            match = re.fullmatch(r"(?:[A-Za-z]{2})?(\d+)", str(value).strip())
+            return int(match.group(1)) if match else value
+        return repr(value)
+
+    return tuple(normalise(arg) for arg in args) + tuple(
+        (name, normalise(value)) for name, value in sorted(kwargs.items())
+    )
+
+
+def _waiter_error(error: BaseException) -> BaseException:
+    """A copy of the leader's exception for one waiter, so tracebacks are not shared across threads"""
+    try:
+        clone = copy.copy(error)
+    except Exception:
+        return RuntimeError(f"coalesced request failed: {error!r}")
+    clone.__traceback__ = None
+    return clone
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Lets concurrent calls with the same key share one execution"""
+
+    def __init__(self):
+        self._flights: Dict[tuple, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: tuple, fn: Callable[[], Any]):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+        if not leader:
+            SINGLE_FLIGHT_COALESCED.inc(method=key[1])
+            flight.done.wait()
+            if flight.error is not None:
+                raise _waiter_error(flight.error) from flight.error
+            return copy.deepcopy(flight.result)
+        try:
+            result = fn()
+        except BaseException as ex:
+            flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                # forget() may already have detached this flight, and a new one may use the key
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                waiters = flight.waiters
+            if waiters and flight.error is None:
+                # Snapshot before the leader's caller can modify the result
+                flight.result = copy.deepcopy(result)
+            flight.done.set()
+        return result
+
+    def forget(self, record_id):
+        """
+        Detaches in-flight calls about a record that was just written: callers
+        already waiting still get their result, later ones start a new request
+        """
+        record = _call_key((record_id,), {})[0]
+        if isinstance(record, str):
+            return
+        with self._lock:
+            for key in [key for key in self._flights if self._mentions(key[2], record)]:
+                del self._flights[key]
+
+    @staticmethod
+    def _mentions(call: tuple, record: int) -> bool:
+        values = (part[1] if isinstance(part, tuple) else part for part in call)
+        return any(type(value) is int and value == record for value in values)
+
+    def as_dict(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "coalesced": {dict(key)["method"]: int(value) for key, value in SINGLE_FLIGHT_COALESCED.values.items()},
+        }
+
+
+request_coalescer = SingleFlight()
+eln_cli.coalesce(request_coalescer, "get_document")
+inv_cli.coalesce(request_coalescer, "get_sample_by_id", "get_container_by_id", "get_sample_template_by_id")
 
 
 # ============================================================================
@@ -99,50 +1819,523 @@ inv_cli = i.InventoryClient(api_url, api_key)  # Inventory Management operations
 # ==================== SYSTEM STATUS AND HEALTH ====================
 
 @mcp.tool(tags={"rspace"})
-def status() -> str:
+async def status() -> str:
     """
     System health check - determines if RSpace server is accessible and running
     
     Usage: Call this first to verify connectivity before other operations
     Returns: Status message from RSpace server
     """
-    resp = eln_cli.get_status()
+    resp = await async_eln_cli.get_status()
     return resp['message']
 
 
+@mcp.tool(tags={"rspace", "diagnostics"})
+def get_http_pool_stats() -> dict:
+    """
+    Connection pool statistics for the HTTP session shared by ELN and Inventory calls
+
+    Usage: Confirm that keep-alive connections to RSpace are being reused
+    Returns: Per-host request and connection counts, idle connections and overall reuse ratio
+    """
+    return http_pool_stats()
+
+
+@mcp.tool(tags={"rspace", "diagnostics"})
+def get_server_metrics() -> dict:
+    """
+    Performance metrics of this MCP server since it started
+
+    Usage: Find slow or frequently used tools and how many RSpace requests they cause
+    Latency: p50_le/p95_le are upper bounds of the histogram bucket holding that percentile
+    Returns: Per-tool calls, errors, latency, upstream calls and response bytes,
+             upstream request counts by status, retry, rate limiter and cache
+             state, bytes removed by compact output, and connection pool statistics
+    """
+    return server_metrics_summary()
+
+
 # ==================== DOCUMENT MANAGEMENT ====================
 # Core document operations - reading, creating, updating documents
 
+# fetch_all / max_results on the listing tools pages through results inside the
+# server instead of one tool call per page. The next page is requested while
+# the current one is merged, progress is reported to the client after every
+# page and at most RSPACE_FETCH_ALL_MAX_RESULTS items (default 5000) are returned.
+FETCH_ALL_PAGE_SIZE = 200
+FETCH_ALL_MAX_RESULTS = _env_int("RSPACE_FETCH_ALL_MAX_RESULTS", 5000)
+
+
+def _wants_all_pages(fetch_all: bool, max_results: Optional[int]) -> bool:
+    """Whether a listing tool should go through _fetch_all_pages; ValueError unless max_results is positive"""
+    if max_results is not None and max_results < 1:
+        raise ValueError("max_results must be a positive number")
+    return bool(fetch_all) or max_results is not None
+
+
+async def _fetch_all_pages(
+    fetch_page: Callable[[int, int], Any],
+    key: str,
+    max_results: Optional[int],
+    ctx: Optional[Context],
+    keep: Optional[Callable[[dict], bool]] = None,
+    observe: bool = True
+) -> dict:
+    """
+    Pages through a listing with fetch_page(page_number, page_size) and returns
+    one merged result: the items under `key` without their _links, plus totals.
+    With `keep`, only items it accepts are merged and count towards max_results;
+    totalHits is still RSpace's count for the unfiltered listing. observe=False
+    is for fetch_page functions that feed _observe_listing themselves (_cached_search).
+    """
+    import asyncio
+
+    limit = min(max_results or FETCH_ALL_MAX_RESULTS, FETCH_ALL_MAX_RESULTS)
+    # A filter can reject any share of a page, so it always takes full pages
+    page_size = FETCH_ALL_PAGE_SIZE if keep is not None else min(limit, FETCH_ALL_PAGE_SIZE)
+    items: list = []
+    total_hits = None
+    page_number = 0
+    cut_short = False
+    pending = asyncio.ensure_future(fetch_page(0, page_size))
+    try:
+        while True:
+            page = await pending
+            pending = None
+            batch = page.get(key) or []
+            total_hits = page.get('totalHits', total_hits)
+            if observe:
+                _observe_listing(batch)
+            accepted = [item for item in batch if keep(item)] if keep is not None else batch
+            remaining = limit - len(items)
+            cut_short = len(accepted) > remaining
+            next_page = (len(batch) == page_size
+                         and (total_hits is None or (page_number + 1) * page_size < total_hits))
+            more = next_page and remaining > len(accepted)
+            if more:
+                # Prefetch: RSpace works on the next page while this one is merged
+                pending = asyncio.ensure_future(fetch_page(page_number + 1, page_size))
+            items.extend({k: v for k, v in item.items() if k != '_links'} for item in accepted[:remaining])
+            if ctx is not None:
+                target = min(total_hits, limit) if total_hits is not None and keep is None else None
+                await ctx.report_progress(len(items), target, f"fetched {len(items)} {key}")
+            if not more:
+                break
+            page_number += 1
+    finally:
+        if pending is not None:
+            pending.cancel()
+    return {
+        'totalHits': total_hits,
+        'returned': len(items),
+        'complete': not cut_short and not next_page,
+        'pagesFetched': page_number + 1,
+        key: items,
+    }
+
+
+def _parse_timestamp(value: str):
+    """datetime of an RSpace timestamp such as "2024-03-01T12:34:56.789Z" """
+    from datetime import datetime
+
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _encode_cursor(kind: str, state: dict) -> str:
+    """Opaque, URL-safe cursor carrying `state` for the tool named by `kind`"""
+    import base64
+    import json
+
+    raw = json.dumps({"k": kind, **state}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(kind: str, cursor: str, fields: Dict[str, Callable[[Any], Any]]) -> dict:
+    """
+    State of a cursor made by _encode_cursor; ValueError if it is not one for `kind`
+    or a value fails its check in `fields` (state key -> predicate, given None when missing)
+    """
+    import base64
+    import json
+
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(state, dict) or state.get("k") != kind:
+            raise ValueError(kind)
+        for name, check in fields.items():
+            if not check(state.get(name)):
+                raise ValueError(name)
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError(f"invalid cursor: pass back a cursor returned by {kind} unchanged") from None
+    return state
+
+
+def _is_count(value: Any) -> bool:
+    """Whether value is a non-negative int (page numbers, offsets, record ids)"""
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _is_cursor_param(value: Any, annotation: Any = None) -> bool:
+    """
+    Whether value is a tool parameter a cursor may carry (None, str, number, bool or list of str)
+    and, given the parameter's annotation, one the parameter accepts (Literal choices included)
+    """
+    if isinstance(value, list):
+        if not all(isinstance(item, str) for item in value):
+            return False
+    elif not (value is None or isinstance(value, (str, int, float, bool))):
+        return False
+    if annotation is not None:
+        from pydantic import TypeAdapter
+
+        # A mismatch raises ValidationError, a ValueError, which _decode_cursor reports
+        TypeAdapter(annotation).validate_python(value, strict=True)
+    return True
+
+
+# Cursor pagination (nextCursor of search_documents, find_documents_by_content, get_forms,
+# list_samples and list_containers). RSpace only pages by number, so a cursor carries the query,
+# ordering and page size, the next page number, and the ids and last sort key of
+# the page just returned. Items that moved onto the next page because records
+# were added or re-sorted meanwhile are dropped instead of being returned twice.
+CURSOR_TIME_FIELDS = {"lastModified", "created"}
+
+
+def _start_cursor(kind: str, cursor: Optional[str], params: dict, page_number: int, page_size: int,
+                  types: Optional[Dict[str, Any]] = None) -> dict:
+    """
+    Paging state decoded from cursor, or a fresh one for params. `types` gives the
+    annotation of each parameter whose value a decoded cursor must satisfy.
+    """
+    types = types or {}
+    if cursor:
+        return _decode_cursor(kind, cursor, {
+            "q": lambda q: (isinstance(q, dict) and q.keys() == params.keys()
+                            and all(_is_cursor_param(value, types.get(name)) for name, value in q.items())),
+            "p": _is_count,
+            "n": lambda n: _is_count(n) and 1 <= n <= 200,
+            "seen": lambda seen: isinstance(seen, list) and all(_is_cursor_param(item) for item in seen),
+            "last": lambda last: last is None or isinstance(last, str),
+            "skip": lambda skip: skip is None or _is_count(skip),
+        })
+    return {"q": params, "p": page_number, "n": page_size, "seen": [], "last": None}
+
+
+def _continue_cursor(kind: str, state: dict, page: dict, key: str, order_by: Optional[str]) -> dict:
+    """page without items returned on the previous page, with the nextCursor to continue from it"""
+    batch = page.get(key) or []
+    field, _, direction = (order_by or "").partition(" ")
+    descending = direction.strip().lower() == "desc"
+    seen = set(state["seen"])
+    last = state["last"]
+
+    def returned_before(item: dict) -> bool:
+        if item.get("id") in seen:
+            return True
+        # Timestamps compare reliably as ISO strings; names may use RSpace's collation
+        if last is None or field not in CURSOR_TIME_FIELDS or not item.get(field):
+            return False
+        return item[field] > last if descending else item[field] < last
+
+    fresh = [item for item in batch if not returned_before(item)]
+    total_hits = page.get("totalHits")
+    more = len(batch) == state["n"] and (total_hits is None or (state["p"] + 1) * state["n"] < total_hits)
+    result = dict(page)
+    result[key] = fresh
+    if len(fresh) < len(batch):
+        result["skippedDuplicates"] = len(batch) - len(fresh)
+    result["nextCursor"] = _encode_cursor(kind, {
+        "q": state["q"],
+        "p": state["p"] + 1,
+        "n": state["n"],
+        "seen": [item.get("id") for item in batch],
+        "last": batch[-1].get(field) if batch and field in CURSOR_TIME_FIELDS else None,
+    }) if more else None
+    return result
+
+
+async def _list_modified_since(since: Optional[str], max_results: Optional[int] = None,
+                               ctx: Optional[Context] = None) -> dict:
+    """
+    Listed documents with lastModified at or after the `since` timestamp (every
+    document when None), oldest first, merged from all pages as by _fetch_all_pages.
+    RSpace filters lastModified by whole days, so the precise cut is made here.
+    """
+    if since is None:
+        def fetch_page(number: int, size: int):
+            return async_eln_cli.get_documents(order_by="lastModified asc", page_number=number, page_size=size)
+    else:
+        from datetime import datetime, timedelta, timezone
+
+        # One day of slack on each side keeps server time zones out of the picture
+        start = (_parse_timestamp(since) - timedelta(days=1)).strftime("%Y-%m-%d")
+        end = (datetime.now(timezone.utc) + timedelta(days=1)).strftime("%Y-%m-%d")
+        builder = AdvancedQueryBuilder(operator="and")
+        builder.add_term(f"{start};{end}", AdvancedQueryBuilder.QueryType.LAST_MODIFIED)
+        advanced_query = builder.get_advanced_query()
+
+        def fetch_page(number: int, size: int):
+            return async_eln_cli.get_documents_advanced_query(
+                advanced_query=advanced_query, order_by="lastModified asc", page_number=number, page_size=size
+            )
+
+    keep = None
+    if since is not None:
+        cut = _parse_timestamp(since)
+
+        def keep(doc: dict) -> bool:
+            return bool(doc.get('lastModified')) and _parse_timestamp(doc['lastModified']) >= cut
+
+    return await _fetch_all_pages(fetch_page, 'documents', max_results, ctx, keep)
+
+
 @mcp.tool(tags={"rspace"})
-def get_documents(page_size: int = 20) -> list[Document]:
+async def get_documents(
+    page_size: int = 20,
+    fetch_all: bool = False,
+    max_results: Optional[int] = None,
+    ctx: Context = None
+) -> list[Document]:
     """
     Retrieves recent RSpace documents with pagination
     
     Usage: Get overview of recent documents for browsing/selection
     Limit: Maximum 200 documents per call for performance
+    All pages: fetch_all=True (or max_results=N) pages through all documents in one call,
+               reporting progress; page_size is then ignored
     Returns: List of document metadata (not full content)
     """
     if page_size > 200 or page_size < 0:
         raise ValueError("page size must be less than 200")
-    resp = eln_cli.get_documents(page_size=page_size)
+    if _wants_all_pages(fetch_all, max_results):
+        merged = await _fetch_all_pages(
+            lambda number, size: async_eln_cli.get_documents(page_number=number, page_size=size),
+            'documents', max_results, ctx,
+        )
+        return merged['documents']
+    resp = await async_eln_cli.get_documents(page_size=page_size)
+    _observe_listing(resp['documents'])
     return resp['documents']
 
 
+class _HTMLToText:
+    """Converts field HTML to plain text or Markdown with the standard library HTML parser"""
+
+    HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+    BLOCKS = {"p", "div", "table", "ul", "ol", "blockquote", "pre", "hr"}
+    MARKDOWN_INLINE = {"strong": "**", "b": "**", "em": "*", "i": "*", "code": "`"}
+
+    def __init__(self, markdown: bool):
+        from html.parser import HTMLParser
+
+        self.markdown = markdown
+        self._parts: List[str] = []
+        self._links: List[str] = []
+        self._skip = 0
+        self._pre = 0
+        self._first_cell = True
+        self._parser = HTMLParser(convert_charrefs=True)
+        self._parser.handle_starttag = self._start
+        self._parser.handle_startendtag = self._start
+        self._parser.handle_endtag = self._end
+        self._parser.handle_data = self._data
+
+    def convert(self, html: str) -> str:
+        self._parser.feed(html)
+        self._parser.close()
+        return re.sub(r"\n{3,}", "\n\n", "".join(self._parts)).strip()
+
+    def _break(self, text: str):
+        """Starts a new line or paragraph, dropping trailing spaces of the previous one"""
+        if self._parts and not self._pre:
+            self._parts[-1] = self._parts[-1].rstrip(" ")
+        self._parts.append(text)
+
+    def _start(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag == "br":
+            self._break("\n")
+        elif tag in self.BLOCKS or tag in self.HEADINGS:
+            self._break("\n\n")
+            if tag == "pre":
+                self._pre += 1
+                if self.markdown:
+                    self._parts.append("```\n")
+            elif tag == "hr" and self.markdown:
+                self._parts.append("---\n\n")
+            elif tag in self.HEADINGS and self.markdown:
+                self._parts.append("#" * self.HEADINGS[tag] + " ")
+        elif tag == "li":
+            self._break("\n- ")
+        elif tag == "tr":
+            self._break("\n")
+            self._first_cell = True
+        elif tag in ("td", "th"):
+            if not self._first_cell:
+                self._parts.append(" | ")
+            self._first_cell = False
+        elif self.markdown and tag in self.MARKDOWN_INLINE and not self._pre:
+            self._parts.append(self.MARKDOWN_INLINE[tag])
+        elif self.markdown and tag == "a":
+            self._links.append(dict(attrs).get("href") or "")
+            self._parts.append("[")
+
+    def _end(self, tag):
+        if tag in ("script", "style"):
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BLOCKS or tag in self.HEADINGS:
+            if tag == "pre":
+                self._pre = max(0, self._pre - 1)
+                if self.markdown:
+                    self._parts.append("\n```")
+            self._break("\n\n")
+        elif self.markdown and tag in self.MARKDOWN_INLINE and not self._pre:
+            self._parts.append(self.MARKDOWN_INLINE[tag])
+        elif self.markdown and tag == "a" and self._links:
+            self._parts.append(f"]({self._links.pop()})")
+
+    def _data(self, data):
+        if self._skip:
+            return
+        if not self._pre:
+            data = re.sub(r"\s+", " ", data)
+            if not self._parts or self._parts[-1][-1:].isspace():
+                data = data.lstrip()
+        if data:
+            self._parts.append(data)
+
+
+def _assemble_content(fields: list, content_format: str, max_chars: Optional[int]) -> dict:
+    """
+    Joins field contents in one pass, converting them to the requested format.
+    Returns the content, its untruncated length and each field's offsets in it.
+    """
+    separator = "" if content_format == "html" else "\n\n"
+    parts: List[str] = []
+    offsets = []
+    position = 0
+    for field in fields:
+        text = field.get("content") or ""
+        if content_format != "html":
+            text = _HTMLToText(markdown=content_format == "markdown").convert(text)
+        # Empty fields get a zero-length span and no separator of their own
+        if text and position and separator:
+            parts.append(separator)
+            position += len(separator)
+        parts.append(text)
+        offsets.append({"id": field.get("id"), "name": field.get("name", ""),
+                        "start": position, "end": position + len(text)})
+        position += len(text)
+    content = "".join(parts)
+    truncated = max_chars is not None and len(content) > max_chars
+    if truncated:
+        content = content[:max_chars]
+        offsets = [{**offset, "end": min(offset["end"], max_chars)}
+                   for offset in offsets if offset["start"] < max_chars]
+    return {"content": content, "totalChars": position, "truncated": truncated, "offsets": offsets}
+
+
+def _select_fields(document: dict, selectors: List[Union[int, str]]) -> list:
+    """Fields of a document matching the given field ids or (case-insensitive) names, in document order"""
+    wanted_ids = {int(selector) for selector in selectors if str(selector).strip().isdigit()}
+    wanted_names = {str(selector).strip().lower() for selector in selectors}
+    selected = [fld for fld in document['fields']
+                if fld.get('id') in wanted_ids or str(fld.get('name', '')).lower() in wanted_names]
+    if not selected:
+        available = ", ".join(f"{fld.get('id')} ({fld.get('name')})" for fld in document['fields'])
+        raise ValueError(f"No field of document {document.get('globalId')} matches {selectors}; "
+                         f"available fields: {available}")
+    return selected
+
+
+def _render_document(
+    document: dict,
+    content_format: str = "html",
+    max_chars: Optional[int] = None,
+    fields: Optional[List[Union[int, str]]] = None,
+    metadata_only: bool = False
+) -> dict:
+    """Shapes a raw RSpace document into the FullDocument result of the document read tools"""
+    selected = _select_fields(document, fields) if fields else document['fields']
+    document['fields'] = selected
+    if metadata_only:
+        document['fields'] = [{k: v for k, v in fld.items() if k != 'content'} for fld in selected]
+        selected = []
+    assembled = _assemble_content(selected, content_format, max_chars)
+    document['content'] = assembled['content']
+    document['contentFormat'] = content_format
+    document['contentTruncated'] = assembled['truncated']
+    document['totalChars'] = assembled['totalChars']
+    document['fieldOffsets'] = assembled['offsets']
+    if content_format != "html" or max_chars is not None:
+        for fld in document['fields']:
+            fld.pop('content', None)
+    return document
+
+
 @mcp.tool(tags={"rspace"}, name="get_single_Rspace_document")
-def get_document(doc_id: int | str) -> FullDocument:
+async def get_document(
+    doc_id: int | str,
+    content_format: Literal["html", "text", "markdown"] = "html",
+    max_chars: Optional[int] = None,
+    fields: Optional[List[Union[int, str]]] = None,
+    metadata_only: bool = False
+) -> FullDocument:
     """
     Retrieves complete content of a single document
     
     Usage: Get full document text for reading/analysis
     Parameters: doc_id can be numeric ID or string globalId (e.g., "SD12345")
+    - content_format: "html" (as stored), or "text"/"markdown" for far fewer tokens
+    - max_chars: Cut the concatenated content off after this many characters
+    - fields: Only return these fields, given by field id or name (e.g. ["Objective", 4521])
+    - metadata_only: Return name, tags, dates, form and field list without any content
+    Offsets: fieldOffsets gives each field's start/end position within content
+    Size: With text/markdown or max_chars, content is not repeated in each field
+    Caching: Recently read documents are served from memory until they change
     Returns: Full document with concatenated field content
     """
-    resp = eln_cli.get_document(doc_id)
-    # Concatenate all field content for easier processing
-    resp['content'] = ''
-    for fld in resp['fields']:
-        resp['content'] = resp['content'] + fld['content']
-    return resp
+    if max_chars is not None and max_chars < 0:
+        raise ValueError("max_chars must be 0 or more")
+    resp = await _load_document(doc_id)
+    return _render_document(resp, content_format, max_chars, fields, metadata_only)
+
+
+@mcp.tool(tags={"rspace"})
+async def get_documents_by_ids(
+    doc_ids: List[Union[int, str]],
+    content_format: Literal["html", "text", "markdown"] = "html",
+    max_chars: Optional[int] = None,
+    fields: Optional[List[Union[int, str]]] = None,
+    metadata_only: bool = False
+) -> dict:
+    """
+    Retrieves several documents in one call
+    
+    Usage: Read the documents found by a search without one call per document
+    Parameters: doc_ids are numeric IDs or globalIds (e.g., ["SD12", "SD15", 731]), at most 100
+    - content_format, max_chars, fields, metadata_only: as for get_single_Rspace_document,
+      applied to each document (max_chars is per document)
+    Performance: Documents are fetched concurrently and served from the document cache when possible
+    Returns: One entry per requested id, in request order, with either "document" or "error"
+    """
+    if len(doc_ids) > 100:
+        raise ValueError("at most 100 documents can be fetched per call")
+    if max_chars is not None and max_chars < 0:
+        raise ValueError("max_chars must be 0 or more")
+    loaded = await _load_documents(list(doc_ids))
+    results = []
+    for doc_id, document in zip(doc_ids, loaded):
+        try:
+            if isinstance(document, Exception):
+                raise document
+            results.append({"id": doc_id, "document": _render_document(
+                document, content_format, max_chars, fields, metadata_only)})
+        except Exception as ex:
+            results.append({"id": doc_id, "error": str(ex)})
+    failed = sum(1 for result in results if "error" in result)
+    return {"requested": len(doc_ids), "succeeded": len(results) - failed, "failed": failed, "results": results}
 
 
 @mcp.tool(tags={"rspace"})
@@ -160,25 +2353,140 @@ def update_document(
     Fields format: [{"id": field_id, "content": "new HTML content"}]
     Returns: Updated document information
     """
-    return eln_cli.update_document(
-        document_id=document_id,
-        name=name,
-        tags=tags,
-        form_id=form_id,
-        fields=fields
-    )
+    try:
+        return eln_cli.update_document(
+            document_id=document_id,
+            name=name,
+            tags=tags,
+            form_id=form_id,
+            fields=fields
+        )
+    finally:
+        _document_written(document_id)
+
+
+# include_content hydration fetches the listed documents concurrently:
+#   RSPACE_HYDRATION_CONCURRENCY   documents fetched at once (default 8)
+#   RSPACE_HYDRATION_TIMEOUT       seconds allowed per document (default 30)
+#   RSPACE_HYDRATION_MAX_BYTES     total fullContent returned per call (default 2 MB)
+#   RSPACE_HYDRATION_MAX_DOCUMENTS most documents hydrated by one fetch_all call (default 200)
+HYDRATION_CONCURRENCY = max(1, _env_int("RSPACE_HYDRATION_CONCURRENCY", 8))
+HYDRATION_TIMEOUT = _env_float("RSPACE_HYDRATION_TIMEOUT", 30.0)
+HYDRATION_MAX_BYTES = _env_int("RSPACE_HYDRATION_MAX_BYTES", 2_000_000)
+HYDRATION_MAX_DOCUMENTS = _env_int("RSPACE_HYDRATION_MAX_DOCUMENTS", 200)
+
+
+async def _hydrate_documents(documents: list) -> dict:
+    """
+    Adds fullContent to each listed document in place, in listing order.
+    The byte budget covers a prefix of the listing: content beyond it is cut
+    off and flagged with fullContentTruncated, whatever order fetches finish in.
+    Documents that could not be fetched get an error message as fullContent,
+    which does not count towards the budget.
+    """
+    import anyio
+
+    contents: List[Optional[str]] = [None] * len(documents)
+    sizes: List[int] = [0] * len(documents)
+    errors: Dict[int, str] = {}
+    semaphore = anyio.Semaphore(HYDRATION_CONCURRENCY)
+
+    async def fetch(index: int, doc: dict):
+        async with semaphore:
+            # Earlier documents alone already fill the budget, so this one would be cut to nothing
+            if sum(sizes[:index]) >= HYDRATION_MAX_BYTES:
+                return
+            try:
+                with anyio.fail_after(HYDRATION_TIMEOUT):
+                    full_doc = await _load_document(doc['globalId'])
+                contents[index] = ''.join(field.get('content') or '' for field in full_doc.get('fields', []))
+                sizes[index] = len(contents[index].encode('utf-8'))
+            except TimeoutError:
+                errors[index] = f"Error fetching content: timed out after {HYDRATION_TIMEOUT:g}s"
+            except Exception as e:
+                errors[index] = f"Error fetching content: {str(e)}"
+
+    async with anyio.create_task_group() as task_group:
+        for index, doc in enumerate(documents):
+            task_group.start_soon(fetch, index, doc)
+
+    remaining = HYDRATION_MAX_BYTES
+    truncated = 0
+    for index, doc in enumerate(documents):
+        if index in errors:
+            doc['fullContent'] = errors[index]
+            continue
+        content = contents[index]
+        if content is None or sizes[index] > remaining:
+            doc['fullContent'] = (content or '').encode('utf-8')[:remaining].decode('utf-8', errors='ignore')
+            doc['fullContentTruncated'] = True
+            truncated += 1
+        else:
+            doc['fullContent'] = content
+        remaining -= len(doc['fullContent'].encode('utf-8'))
+    return {"maxBytes": HYDRATION_MAX_BYTES, "truncatedDocuments": truncated}
+
+
+async def _load_documents(doc_ids: list) -> list:
+    """
+    Loads documents concurrently through the cache, at most RSPACE_HYDRATION_CONCURRENCY
+    at a time and each within RSPACE_HYDRATION_TIMEOUT. Returns, in the order of
+    doc_ids, each document or the exception raised while loading it.
+    """
+    import anyio
+
+    loaded: list = [None] * len(doc_ids)
+    semaphore = anyio.Semaphore(HYDRATION_CONCURRENCY)
+
+    async def load(index: int, doc_id):
+        async with semaphore:
+            try:
+                with anyio.fail_after(HYDRATION_TIMEOUT):
+                    loaded[index] = await _load_document(doc_id)
+            except TimeoutError:
+                loaded[index] = TimeoutError(f"timed out after {HYDRATION_TIMEOUT:g}s")
+            except Exception as ex:
+                loaded[index] = ex
+
+    async with anyio.create_task_group() as task_group:
+        for index, doc_id in enumerate(doc_ids):
+            task_group.start_soon(load, index, doc_id)
+    return loaded
+
+
+def _advanced_query(query: str, query_types: List[str], operator: str) -> str:
+    """AdvancedQueryBuilder query matching `query` against each of the query_types"""
+    query_type = AdvancedQueryBuilder.QueryType
+    types = {
+        "global": query_type.GLOBAL,
+        "fullText": query_type.FULL_TEXT,
+        "tag": query_type.TAG,
+        "name": query_type.NAME,
+        "created": query_type.CREATED,
+        "lastModified": query_type.LAST_MODIFIED,
+        "form": query_type.FORM,
+        "attachment": query_type.ATTACHMENT,
+    }
+    builder = AdvancedQueryBuilder(operator=operator)
+    for name in query_types:
+        builder.add_term(query, types[name])
+    return builder.get_advanced_query()
 
 
 @mcp.tool(tags={"rspace", "search"})
-def search_documents(
-    query: str,
+async def search_documents(
+    query: str = None,
     search_type: Literal["simple", "advanced"] = "simple",
-    query_types: List[Literal["global", "fullText", "tag", "name", "created", "lastModified", "form", "attachment"]] = None,
-    operator: Literal["and", "or"] = "and",
+    query_types: List[SearchQueryType] = None,
+    operator: SearchOperator = "and",
     order_by: str = "lastModified desc",
     page_number: int = 0,
     page_size: int = 20,
-    include_content: bool = False
+    include_content: bool = False,
+    fetch_all: bool = False,
+    max_results: Optional[int] = None,
+    cursor: Optional[str] = None,
+    ctx: Context = None
 ) -> dict:
     """
     Generic search tool for RSpace documents with flexible search options
@@ -201,9 +2509,19 @@ def search_documents(
     - order_by: Sort results by field (e.g., "lastModified desc", "name asc")
     - page_number: Page number for pagination (0-based)
     - page_size: Number of results per page (max 200)
-    - include_content: Whether to fetch full document content (slower but more complete)
+    - include_content: Whether to fetch full document content (slower but more complete);
+      documents are fetched concurrently and fullContent is capped by a total byte budget;
+      with fetch_all/max_results, max_results may be at most RSPACE_HYDRATION_MAX_DOCUMENTS
+    - fetch_all: Page through every matching document in one call (progress is reported);
+      page_number and page_size are then ignored
+    - max_results: Like fetch_all, but stop after this many documents
+    - cursor: nextCursor of the previous page; continues the same search (the query,
+      ordering and paging parameters are taken from the cursor) without repeating
+      documents that shifted pages in the meantime
     
-    Returns: Dictionary with search results and metadata
+    Returns: Dictionary with search results and metadata, and nextCursor for the next page
+             (null on the last one); with fetch_all/max_results a merged result with
+             totalHits, returned, complete and pagesFetched
     
     Examples:
     - Simple text search: search_documents("PCR protocol")
@@ -213,72 +2531,77 @@ def search_documents(
     """
     if page_size > 200:
         raise ValueError("page_size must be 200 or less")
+    all_pages = _wants_all_pages(fetch_all, max_results)
+    if cursor and all_pages:
+        raise ValueError("cursor cannot be combined with fetch_all or max_results")
+    if include_content and all_pages and (max_results is None or max_results > HYDRATION_MAX_DOCUMENTS):
+        raise ValueError(f"include_content with fetch_all or max_results needs max_results "
+                         f"of at most {HYDRATION_MAX_DOCUMENTS}")
+    state = _start_cursor("search_documents", cursor, {
+        "query": query, "search_type": search_type, "query_types": query_types,
+        "operator": operator, "order_by": order_by,
+    }, page_number, page_size, {
+        "query": Optional[str], "search_type": Literal["simple", "advanced"],
+        "query_types": Optional[List[SearchQueryType]], "operator": SearchOperator, "order_by": Optional[str],
+    })
+    query, search_type, query_types, operator, order_by = (
+        state["q"][name] for name in ("query", "search_type", "query_types", "operator", "order_by")
+    )
+    if not query:
+        raise ValueError("query is required")
     
     if search_type == "simple":
         # Use simple search - works like RSpace's "All" search
-        results = eln_cli.get_documents(
-            query=query,
-            order_by=order_by,
-            page_number=page_number,
-            page_size=page_size
-        )
+        def fetch_page(number: int, size: int):
+            return _cached_search(
+                _search_key("simple", query, order_by, number, size),
+                lambda: async_eln_cli.get_documents(
+                    query=query,
+                    order_by=order_by,
+                    page_number=number,
+                    page_size=size
+                ),
+            )
     else:
         # Use advanced search with AdvancedQueryBuilder
-        if query_types is None:
-            query_types = ["global"]  # Default to global search
-        
-        builder = AdvancedQueryBuilder(operator=operator)
-        
-        # Add search terms for each specified query type
-        for query_type in query_types:
-            if query_type == "global":
-                builder.add_term(query, AdvancedQueryBuilder.QueryType.GLOBAL)
-            elif query_type == "fullText":
-                builder.add_term(query, AdvancedQueryBuilder.QueryType.FULL_TEXT)
-            elif query_type == "tag":
-                builder.add_term(query, AdvancedQueryBuilder.QueryType.TAG)
-            elif query_type == "name":
-                builder.add_term(query, AdvancedQueryBuilder.QueryType.NAME)
-            elif query_type == "created":
-                builder.add_term(query, AdvancedQueryBuilder.QueryType.CREATED)
-            elif query_type == "lastModified":
-                builder.add_term(query, AdvancedQueryBuilder.QueryType.LAST_MODIFIED)
-            elif query_type == "form":
-                builder.add_term(query, AdvancedQueryBuilder.QueryType.FORM)
-            elif query_type == "attachment":
-                builder.add_term(query, AdvancedQueryBuilder.QueryType.ATTACHMENT)
-        
-        advanced_query = builder.get_advanced_query()
-        results = eln_cli.get_documents_advanced_query(
-            advanced_query=advanced_query,
-            order_by=order_by,
-            page_number=page_number,
-            page_size=page_size
-        )
-    
+        advanced_query = _advanced_query(query, query_types or ["global"], operator)
+
+        def fetch_page(number: int, size: int):
+            return _cached_search(
+                _search_key("advanced", advanced_query, order_by, number, size),
+                lambda: async_eln_cli.get_documents_advanced_query(
+                    advanced_query=advanced_query,
+                    order_by=order_by,
+                    page_number=number,
+                    page_size=size
+                ),
+            )
+
+    if all_pages:
+        results = await _fetch_all_pages(fetch_page, 'documents', max_results, ctx, observe=False)
+    else:
+        results = await fetch_page(state["p"], state["n"])
+        results = _continue_cursor("search_documents", state, results, 'documents', order_by)
+
     # Optionally fetch full content for each document
     if include_content and 'documents' in results:
-        for doc in results['documents']:
-            try:
-                full_doc = eln_cli.get_document(doc['globalId'])
-                # Add concatenated content to the document
-                content = ''
-                for field in full_doc.get('fields', []):
-                    content += field.get('content', '')
-                doc['fullContent'] = content
-            except Exception as e:
-                doc['fullContent'] = f"Error fetching content: {str(e)}"
+        budget = await _hydrate_documents(results['documents'])
+        if budget['truncatedDocuments']:
+            results['contentBudget'] = budget
     
     return results
 
 
 @mcp.tool(tags={"rspace", "search"})
-def search_by_tags(
+async def search_by_tags(
     tags: List[str],
     operator: Literal["and", "or"] = "and",
     order_by: str = "lastModified desc", 
     page_number: int = 0,
-    page_size: int = 20
+    page_size: int = 20,
+    fetch_all: bool = False,
+    max_results: Optional[int] = None,
+    ctx: Context = None
 ) -> dict:
     """
     Search documents by specific tags
@@ -291,6 +2614,8 @@ def search_by_tags(
     - order_by: Sort results by field
     - page_number: Page number for pagination
     - page_size: Number of results per page
+    - fetch_all: Return every tagged document in one call (progress is reported)
+    - max_results: Like fetch_all, but stop after this many documents
     
     Returns: Dictionary with search results
     
@@ -302,16 +2627,113 @@ def search_by_tags(
         builder.add_term(tag, AdvancedQueryBuilder.QueryType.TAG)
     
     advanced_query = builder.get_advanced_query()
-    return eln_cli.get_documents_advanced_query(
-        advanced_query=advanced_query,
-        order_by=order_by,
-        page_number=page_number,
-        page_size=page_size
-    )
+
+    def fetch_page(number: int, size: int):
+        return _cached_search(
+            _search_key("advanced", advanced_query, order_by, number, size),
+            lambda: async_eln_cli.get_documents_advanced_query(
+                advanced_query=advanced_query,
+                order_by=order_by,
+                page_number=number,
+                page_size=size
+            ),
+        )
+
+    if _wants_all_pages(fetch_all, max_results):
+        return await _fetch_all_pages(fetch_page, 'documents', max_results, ctx, observe=False)
+    return await fetch_page(page_number, page_size)
+
+
+# Constant of reciprocal rank fusion: a document's merged score is the sum of
+# 1 / (MULTI_SEARCH_RRF_K + rank) over the queries that found it, so documents
+# found by several queries rise without one query's top hits dominating
+MULTI_SEARCH_RRF_K = 60
 
 
 @mcp.tool(tags={"rspace", "search"})
-def search_recent_documents(
+async def multi_search(
+    queries: List[SearchSpec],
+    order_by: str = "lastModified desc",
+    page_size: int = 20,
+    limit: int = 50
+) -> dict:
+    """
+    Runs several searches at once and merges them into one de-duplicated ranking
+    
+    Usage: "Find anything about X" - instead of several search_documents calls,
+           e.g. the same term as name, tag and full text, or related terms
+    
+    Parameters:
+    - queries: Up to 10 query specs, each {query, query_types (default ["global"]), operator}
+    - order_by: Order of each query's results, which sets its ranking
+    - page_size: Results taken from each query (max 200)
+    - limit: Most documents returned after merging (1 or more)
+    
+    Returns: documents ranked by reciprocal rank fusion, each with score and
+             matchedBy (index and rank of every query that found it);
+             totalUnique; and queries with totalHits, returned or error per query
+    
+    Example: multi_search([{"query": "PCR", "query_types": ["name", "tag"], "operator": "or"},
+                           {"query": "polymerase chain reaction", "query_types": ["fullText"]}])
+    """
+    import anyio
+
+    if not queries or len(queries) > 10:
+        raise ValueError("pass between 1 and 10 queries")
+    if page_size > 200 or page_size < 1:
+        raise ValueError("page_size must be between 1 and 200")
+    if limit < 1:
+        raise ValueError("limit must be 1 or more")
+
+    results: List[Any] = [None] * len(queries)
+
+    async def run(index: int, spec: SearchSpec):
+        advanced_query = _advanced_query(spec.query, spec.query_types or ["global"], spec.operator)
+        try:
+            results[index] = await _cached_search(
+                _search_key("advanced", advanced_query, order_by, 0, page_size),
+                lambda: async_eln_cli.get_documents_advanced_query(
+                    advanced_query=advanced_query, order_by=order_by, page_number=0, page_size=page_size
+                ),
+            )
+        except Exception as ex:
+            results[index] = ex
+
+    async with anyio.create_task_group() as task_group:
+        for index, spec in enumerate(queries):
+            task_group.start_soon(run, index, spec)
+
+    merged: Dict[str, dict] = {}
+    summary = []
+    for index, (spec, result) in enumerate(zip(queries, results)):
+        entry = {"index": index, "query": spec.query, "query_types": spec.query_types, "operator": spec.operator}
+        summary.append(entry)
+        if isinstance(result, Exception):
+            entry["error"] = str(result)
+            continue
+        documents = result.get('documents', [])
+        entry.update(totalHits=result.get('totalHits'), returned=len(documents))
+        for rank, document in enumerate(documents, start=1):
+            key = document.get('globalId') or str(document.get('id'))
+            hit = merged.get(key)
+            if hit is None:
+                hit = merged[key] = {k: v for k, v in document.items() if k != '_links'}
+                hit.update(score=0.0, matchedBy=[])
+            hit['score'] += 1.0 / (MULTI_SEARCH_RRF_K + rank)
+            hit['matchedBy'].append({"query": index, "rank": rank})
+
+    ranked = sorted(merged.values(), key=lambda hit: -hit['score'])
+    for hit in ranked:
+        hit['score'] = round(hit['score'], 5)
+    return {
+        'documents': ranked[:limit],
+        'totalUnique': len(ranked),
+        'queries': summary,
+    }
+
+
+@mcp.tool(tags={"rspace", "search"})
+async def search_recent_documents(
     days_back: int = 7,
     query: str = None,
     page_size: int = 20
@@ -344,21 +2766,122 @@ def search_recent_documents(
         builder.add_term(query, AdvancedQueryBuilder.QueryType.GLOBAL)
     
     advanced_query = builder.get_advanced_query()
-    return eln_cli.get_documents_advanced_query(
-        advanced_query=advanced_query,
-        order_by="lastModified desc",
-        page_number=0,
-        page_size=page_size
+    results = await _cached_search(
+        _search_key("advanced", advanced_query, "lastModified desc", 0, page_size),
+        lambda: async_eln_cli.get_documents_advanced_query(
+            advanced_query=advanced_query,
+            order_by="lastModified desc",
+            page_number=0,
+            page_size=page_size
+        ),
     )
+    return results
 
 
 @mcp.tool(tags={"rspace", "search"})
-def find_documents_by_content(
-    content_terms: List[str],
-    operator: Literal["and", "or"] = "and",
+async def get_document_changes(
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+    max_results: int = 500,
+    ctx: Context = None
+) -> dict:
+    """
+    Change feed of ELN documents: everything modified since the previous call
+
+    Usage: Incremental pipelines ("process whatever changed since last time").
+           Start without a cursor, then pass the returned nextCursor on every
+           following call; each change is returned once per modification
+    
+    Parameters:
+    - cursor: nextCursor from the previous call
+    - since: First call only - ISO date or time to start from (UTC unless it
+             has an offset); without it the feed starts with every document
+    - max_results: Most changes returned by one call (pages through RSpace
+                   internally, up to RSPACE_FETCH_ALL_MAX_RESULTS)
+    
+    Returns: changes (document metadata, oldest modification first), count,
+             hasMore (call again straight away when true), watermark (the
+             lastModified time the feed has reached) and nextCursor
+    
+    Example: get_document_changes(since="2024-03-01"), then get_document_changes(cursor=...)
+    """
+    from datetime import timezone
+
+    if cursor and since:
+        raise ValueError("pass either cursor or since, not both")
+    if max_results < 1 or max_results > FETCH_ALL_MAX_RESULTS:
+        raise ValueError(f"max_results must be between 1 and {FETCH_ALL_MAX_RESULTS}")
+
+    if cursor:
+        state = _decode_cursor("get_document_changes", cursor, {
+            "ts": lambda ts: ts is None or (isinstance(ts, str) and _parse_timestamp(ts)),
+            "ids": lambda ids: ids is None or (isinstance(ids, list)
+                                               and all(_is_count(item) or isinstance(item, str) for item in ids)),
+        })
+        watermark, delivered = state.get("ts"), set(state.get("ids") or [])
+    elif since:
+        try:
+            start = _parse_timestamp(since)
+        except ValueError:
+            raise ValueError(f"since must be an ISO date or time, got {since!r}") from None
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        watermark, delivered = start.isoformat(), set()
+    else:
+        watermark, delivered = None, set()
+
+    # Documents modified exactly at the watermark were partly returned already:
+    # the cursor remembers which, so ties are neither repeated nor lost
+    mark = _parse_timestamp(watermark) if watermark else None
+    listed = await _list_modified_since(watermark, max_results + len(delivered), ctx)
+    pending = [doc for doc in listed['documents']
+               if not (doc.get('id') in delivered and _parse_timestamp(doc['lastModified']) == mark)]
+    changes = pending[:max_results]
+
+    if changes:
+        newest = _parse_timestamp(changes[-1]['lastModified'])
+        tied = {doc['id'] for doc in changes if _parse_timestamp(doc['lastModified']) == newest}
+        if newest == mark:
+            tied |= delivered
+        watermark, delivered = changes[-1]['lastModified'], tied
+
+    return {
+        'changes': changes,
+        'count': len(changes),
+        'hasMore': len(pending) > max_results or not listed['complete'],
+        'watermark': watermark,
+        'nextCursor': _encode_cursor("get_document_changes", {"ts": watermark, "ids": sorted(delivered)}),
+    }
+
+
+# Documents find_documents_by_content examines at most while filling a page
+# of results that survive exclude_terms
+EXCLUSION_MAX_SCAN = _env_int("RSPACE_EXCLUSION_MAX_SCAN", 1000)
+
+
+def _tag_list(tags) -> List[str]:
+    """Tags of a listed document, which RSpace gives as a comma-separated string (or a list)"""
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return [str(tag).strip() for tag in tags if str(tag).strip()]
+
+
+def _mentions_any(text: str, terms: List[str]) -> bool:
+    text = text.lower()
+    return any(term in text for term in terms)
+
+
+@mcp.tool(tags={"rspace", "search"})
+async def find_documents_by_content(
+    content_terms: List[str] = None,
+    operator: SearchOperator = "and",
     exclude_terms: List[str] = None,
     order_by: str = "lastModified desc",
-    page_size: int = 20
+    page_size: int = 20,
+    check_full_text: bool = False,
+    cursor: Optional[str] = None
 ) -> dict:
     """
     Advanced content-based document search
@@ -368,14 +2891,40 @@ def find_documents_by_content(
     Parameters:
     - content_terms: List of terms that should appear in document content
     - operator: "and" (all terms must appear) or "or" (any term can appear)
-    - exclude_terms: Optional list of terms to exclude from results
+    - exclude_terms: Optional list of terms to exclude from results; documents whose
+      name or tags contain one are dropped and further results are fetched until
+      page_size documents remain (or the results run out)
     - order_by: Sort results by field
-    - page_size: Number of results to return
+    - page_size: Number of results to return (1-200)
+    - check_full_text: Also drop documents whose text contains an excluded term
+      (fetches each remaining candidate's content, slower)
+    - cursor: nextCursor of the previous call; continues the same search right
+      after the last document examined (the other parameters come from the cursor)
     
-    Returns: Dictionary with search results
+    Returns: Dictionary with search results and nextCursor (null once all results
+             were examined); with exclude_terms, an "exclusion" entry reports documents
+             scanned, excluded and kept, and whether all results were scanned.
+             totalHits is the number of matches before exclusion.
     
     Example: find_documents_by_content(["DNA", "extraction"], operator="and")
     """
+    if page_size < 1 or page_size > 200:
+        raise ValueError("page_size must be between 1 and 200")
+    kind = "find_documents_by_content"
+    state = _start_cursor(kind, cursor, {
+        "content_terms": content_terms, "operator": operator, "exclude_terms": exclude_terms,
+        "order_by": order_by, "check_full_text": check_full_text,
+    }, 0, page_size, {
+        "content_terms": List[str], "operator": SearchOperator, "exclude_terms": Optional[List[str]],
+        "order_by": Optional[str], "check_full_text": bool,
+    })
+    content_terms, operator, exclude_terms, order_by, check_full_text = (
+        state["q"][name] for name in ("content_terms", "operator", "exclude_terms", "order_by", "check_full_text")
+    )
+    if not content_terms:
+        raise ValueError("content_terms is required")
+    page_size = state["n"]
+
     builder = AdvancedQueryBuilder(operator=operator)
     
     for term in content_terms:
@@ -383,24 +2932,95 @@ def find_documents_by_content(
     
     # Note: RSpace API doesn't directly support exclusion, but we can filter results
     advanced_query = builder.get_advanced_query()
-    results = eln_cli.get_documents_advanced_query(
-        advanced_query=advanced_query,
-        order_by=order_by,
-        page_number=0,
-        page_size=page_size
-    )
-    
-    # Filter out documents containing excluded terms if specified
-    if exclude_terms and 'documents' in results:
-        filtered_docs = []
-        for doc in results['documents']:
-            # Check if any exclude terms are in the document name or other available text
-            doc_text = (doc.get('name', '') + ' ' + doc.get('tags', '')).lower()
-            if not any(exclude_term.lower() in doc_text for exclude_term in exclude_terms):
-                filtered_docs.append(doc)
-        results['documents'] = filtered_docs
-        results['totalHits'] = len(filtered_docs)
-    
+
+    def fetch_page(number: int, size: int):
+        return async_eln_cli.get_documents_advanced_query(
+            advanced_query=advanced_query,
+            order_by=order_by,
+            page_number=number,
+            page_size=size
+        )
+
+    if not exclude_terms:
+        results = await fetch_page(state["p"], page_size)
+        _observe_listing(results.get('documents', []))
+        return _continue_cursor(kind, state, results, 'documents', order_by)
+
+    # Filter out documents containing excluded terms, pulling further pages
+    # (twice the requested size, as some of each page is dropped) until the page is full.
+    # The scan position (page and offset within it) is what the cursor resumes from.
+    excluded_terms = [term.lower() for term in exclude_terms if term.strip()]
+    scan_size = min(200, page_size * 2)
+    page_number, skip = state["p"], state.get("skip") or 0
+    kept: list = []
+    scanned = excluded = unchecked = pages = 0
+    exhausted = False
+    consumed = 0
+    batch: list = []
+    results: dict = {}
+    while len(kept) < page_size and scanned < EXCLUSION_MAX_SCAN:
+        if pages:
+            page_number, skip = page_number + 1, 0
+        results = await fetch_page(page_number, scan_size)
+        pages += 1
+        batch = results.get('documents') or []
+        _observe_listing(batch)
+        scanned += max(0, len(batch) - skip)
+        candidates = [(offset, doc) for offset, doc in enumerate(batch) if offset >= skip]
+        kept_before = len(candidates)
+        candidates = [(offset, doc) for offset, doc in candidates
+                      if not _mentions_any(doc.get('name', '') + ' ' + ' '.join(_tag_list(doc.get('tags'))),
+                                           excluded_terms)]
+        excluded += kept_before - len(candidates)
+        consumed = len(batch)
+        if not check_full_text:
+            taken = candidates[:page_size - len(kept)]
+            kept.extend(doc for _, doc in taken)
+            if len(kept) >= page_size and taken:
+                consumed = taken[-1][0] + 1
+        # Full text is only fetched for as many candidates as the page still needs
+        while candidates and check_full_text and len(kept) < page_size:
+            chunk, candidates = candidates[:page_size - len(kept)], candidates[page_size - len(kept):]
+            loaded = await _load_documents([doc['globalId'] for _, doc in chunk])
+            for (_, doc), full_doc in zip(chunk, loaded):
+                if isinstance(full_doc, Exception):
+                    # Kept, but flagged: the exclusion could not be verified
+                    doc['fullTextChecked'] = False
+                    unchecked += 1
+                    kept.append(doc)
+                elif _mentions_any(_assemble_content(full_doc.get('fields', []), "text", None)['content'],
+                                   excluded_terms):
+                    excluded += 1
+                else:
+                    kept.append(doc)
+            if len(kept) >= page_size:
+                consumed = chunk[-1][0] + 1
+        total_hits = results.get('totalHits')
+        if len(batch) < scan_size or (total_hits is not None and (page_number + 1) * scan_size >= total_hits):
+            exhausted = True
+            break
+
+    if consumed < len(batch):
+        resume = {"p": page_number, "skip": consumed}
+    elif exhausted:
+        resume = None
+    else:
+        resume = {"p": page_number + 1, "skip": 0}
+    results['documents'] = kept
+    results.pop('_links', None)
+    results['exclusion'] = {
+        'scanned': scanned,
+        'excluded': excluded,
+        'kept': len(kept),
+        'pagesFetched': pages,
+        'allResultsScanned': resume is None,
+        'fullTextChecked': check_full_text,
+    }
+    if unchecked:
+        results['exclusion']['fullTextCheckFailed'] = unchecked
+    results['nextCursor'] = _encode_cursor(kind, {
+        "q": state["q"], "n": page_size, "seen": [], "last": None, **resume,
+    }) if resume else None
     return results
 
 # ==================== NOTEBOOK OPERATIONS ====================
@@ -433,8 +3053,10 @@ def create_notebook_entry(
     Content: Supports both HTML and plain text formatting
     Returns: Created entry information
     """
-    resp = eln_cli.create_document(name, parent_folder_id=notebook_id, fields=[{'content': text_content}])
-    return resp
+    try:
+        return eln_cli.create_document(name, parent_folder_id=notebook_id, fields=[{'content': text_content}])
+    finally:
+        _document_written()
 
 
 # ==================== DOCUMENT METADATA MANAGEMENT ====================
@@ -452,8 +3074,10 @@ def tag_document(
     Tags: Use consistent naming for better organization
     Returns: Updated document with new tags
     """
-    resp = eln_cli.update_document(document_id=doc_id, tags=tags)
-    return resp
+    try:
+        return eln_cli.update_document(document_id=doc_id, tags=tags)
+    finally:
+        _document_written(doc_id)
 
 
 @mcp.tool(tags={"rspace"}, name="renameDocumentOrNotebookEntry")
@@ -467,23 +3091,113 @@ def rename_document(
     Usage: Update document titles for better organization
     Returns: Updated document information
     """
-    resp = eln_cli.update_document(document_id=doc_id, name=name)
-    return resp
+    try:
+        return eln_cli.update_document(document_id=doc_id, name=name)
+    finally:
+        _document_written(doc_id)
+
+
+_tag_index_refresh_lock = None
+
+
+async def _refresh_tag_index(rebuild: bool = False, ctx: Optional[Context] = None) -> dict:
+    """Lists documents modified since the tag index watermark (all of them on a rebuild)"""
+    import anyio
+
+    global _tag_index_refresh_lock
+    if _tag_index_refresh_lock is None:
+        _tag_index_refresh_lock = anyio.Lock()
+    async with _tag_index_refresh_lock:
+        start = time.perf_counter()
+        since = None if rebuild else tag_index.watermark
+        listed_ids = set()
+        listed = 0
+        while True:
+            # The listing feeds tag_index through _observe_listing as it pages
+            page = await _list_modified_since(since, ctx=ctx)
+            documents = page['documents']
+            listed += len(documents)
+            listed_ids.update(_document_key(doc['id']) for doc in documents)
+            if documents:
+                tag_index.watermark = documents[-1]['lastModified']
+            if page['complete'] or not documents or tag_index.watermark == since:
+                break
+            # Capped at RSPACE_FETCH_ALL_MAX_RESULTS: continue from the newest listed
+            since = tag_index.watermark
+        # Older documents were covered by earlier refreshes (listings are oldest first)
+        tag_index.complete = page['complete']
+        if rebuild and page['complete']:
+            tag_index.retain(listed_ids)
+        tag_index.refreshed_at = time.time()
+        return {"listed": listed, "seconds": round(time.perf_counter() - start, 3)}
+
+
+@mcp.tool(tags={"rspace", "search"})
+async def list_tags(
+    prefix: str = None,
+    limit: int = 100,
+    refresh: bool = True,
+    rebuild: bool = False,
+    ctx: Context = None
+) -> dict:
+    """
+    Lists the tags in use, with how many documents carry each
+    
+    Usage: Discover existing tags before tagging or searching by tag,
+           instead of probing with search_by_tags
+    Answered from an in-memory index; the first call lists every document
+    
+    Parameters:
+    - prefix: Only tags starting with this (case-insensitive)
+    - limit: Most tags returned, most used first
+    - refresh: Fetch documents changed since the last refresh when it is
+               older than RSPACE_TAG_INDEX_MAX_AGE (false answers from memory only)
+    - rebuild: Re-list every document, also dropping deleted ones
+    
+    Returns: tags with count, lastUsed and sampleDocuments (most recently
+             modified globalIds); matched, indexedDocuments, and the refresh made if any
+    
+    Example: list_tags(prefix="pcr")
+    """
+    refreshed = None
+    if rebuild or (refresh and tag_index.is_stale()):
+        refreshed = await _refresh_tag_index(rebuild, ctx)
+    tags = tag_index.tags(prefix)
+    stats = tag_index.as_dict()
+    return {
+        'tags': tags[:limit],
+        'matched': len(tags),
+        'indexedDocuments': stats['documents'],
+        'complete': stats['complete'],
+        'lastRefresh': stats['last_refresh'],
+        'refreshed': refreshed,
+    }
 
 
 # ==================== FORM MANAGEMENT ====================
 # Custom form creation and management for structured data entry
 
 @mcp.tool(tags={"rspace"})
-def get_forms(query: str = None, order_by: str = "lastModified desc", page_number: int = 0, page_size: int = 20) -> dict:
+def get_forms(
+    query: str = None,
+    order_by: str = "lastModified desc",
+    page_number: int = 0,
+    page_size: int = 20,
+    cursor: Optional[str] = None
+) -> dict:
     """
     Lists available custom forms for structured document creation
     
     Usage: Browse available templates before creating structured documents
     Filtering: Use query parameter to search form names/descriptions
-    Returns: Paginated list of form metadata
+    Paging: Pass the returned nextCursor to get the next page of the same listing
+    Returns: Paginated list of form metadata with nextCursor (null on the last page)
     """
-    return eln_cli.get_forms(query=query, order_by=order_by, page_number=page_number, page_size=page_size)
+    state = _start_cursor("get_forms", cursor, {"query": query, "order_by": order_by}, page_number, page_size,
+                          {"query": Optional[str], "order_by": Optional[str]})
+    query, order_by = state["q"]["query"], state["q"]["order_by"]
+    page = eln_cli.get_forms(query=query, order_by=order_by, page_number=state["p"], page_size=state["n"])
+    return _continue_cursor("get_forms", state, page, 'forms', order_by)
 
 
 @mcp.tool(tags={"rspace"})
@@ -593,13 +3307,16 @@ def create_document_from_form(
     Fields: Pre-populate form fields with initial data
     Returns: Created document information
     """
-    return eln_cli.create_document(
-        name=name,
-        parent_folder_id=parent_folder_id,
-        tags=tags,
-        form_id=form_id,
-        fields=fields
-    )
+    try:
+        return eln_cli.create_document(
+            name=name,
+            parent_folder_id=parent_folder_id,
+            tags=tags,
+            form_id=form_id,
+            fields=fields
+        )
+    finally:
+        _document_written()
 
 
 # ==================== AUDIT AND ACTIVITY TRACKING ====================
@@ -631,7 +3348,7 @@ def activity(
 # Tools for handling file attachments and downloads
 
 @mcp.tool(tags={"rspace"}, name="downloadFile")
-def download_file(
+async def download_file(
         file_id: int,
         file_path: str
 ) -> Dict[str, any]:
@@ -645,7 +3362,7 @@ def download_file(
     
     Returns: Download status and file information
     """
-    resp = eln_cli.download_file(file_id=file_id, filename=file_path, chunk_size=1024)
+    resp = await async_eln_cli.download_file(file_id=file_id, filename=file_path, chunk_size=1024)
     return resp
 
 @mcp.tool(tags={"rspace", "files"})
@@ -680,7 +3397,7 @@ def uploadAndAttachFile(
             return {"error": "File upload failed - no file ID returned"}
         
         # Step 2: Get the current document
-        document = eln_cli.get_document(document_id)
+        document = eln_cli.uncoalesced.get_document(document_id)
         if not document.get('fields'):
             return {"error": f"Document {document_id} has no fields to attach file to"}
         
@@ -698,13 +3415,16 @@ def uploadAndAttachFile(
         updated_content = current_content + '\n' + attachment_html
         
         # Update the document
-        update_result = eln_cli.update_document(
-            document_id=document_id,
-            fields=[{
-                'id': first_field['id'],
-                'content': updated_content
-            }]
-        )
+        try:
+            update_result = eln_cli.update_document(
+                document_id=document_id,
+                fields=[{
+                    'id': first_field['id'],
+                    'content': updated_content
+                }]
+            )
+        finally:
+            _document_written(document_id)
         
         return {
             "success": True,
@@ -730,6 +3450,264 @@ def uploadAndAttachFile(
     except Exception as e:
         return {"error": f"Failed to upload and attach file: {str(e)}"}
 
+
+# ==================== LOCAL SEARCH INDEX ====================
+# Optional full-text mirror of the ELN documents in an SQLite FTS5 file, for
+# fast repeated searches ranked locally (bm25, with name and tags weighted
+# above content). Enabled by setting RSPACE_LOCAL_INDEX_PATH to a file path.
+# Each sync lists the documents modified since the newest lastModified already
+# indexed (the watermark), fetches only those whose lastModified changed and
+# stores their text. A full sync also drops documents that no longer exist.
+#   RSPACE_LOCAL_INDEX_PATH      SQLite file of the index (unset: disabled)
+#   RSPACE_LOCAL_INDEX_MAX_AGE   seconds after which search_local_index syncs first (default 300)
+
+LOCAL_INDEX_PATH = os.getenv("RSPACE_LOCAL_INDEX_PATH")
+LOCAL_INDEX_MAX_AGE = _env_float("RSPACE_LOCAL_INDEX_MAX_AGE", 300.0)
+
+_LOCAL_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    global_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    form TEXT,
+    created TEXT,
+    last_modified TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    name, tags, content, content='documents', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts(rowid, name, tags, content) VALUES (new.id, new.name, new.tags, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, name, tags, content)
+    VALUES ('delete', old.id, old.name, old.tags, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, name, tags, content)
+    VALUES ('delete', old.id, old.name, old.tags, old.content);
+    INSERT INTO documents_fts(rowid, name, tags, content) VALUES (new.id, new.name, new.tags, new.content);
+END;
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class LocalDocumentIndex:
+    """SQLite FTS5 mirror of ELN documents; every method opens its own connection"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._schema_ready = False
+
+    def _connect(self):
+        import sqlite3
+
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            connection.execute("PRAGMA journal_mode=WAL")
+            try:
+                connection.executescript(_LOCAL_INDEX_SCHEMA)
+            except sqlite3.OperationalError as ex:
+                connection.close()
+                raise RuntimeError(f"Cannot create the local index in {self.path}: {ex} "
+                                   "(SQLite must be built with FTS5)") from ex
+            self._schema_ready = True
+        return connection
+
+    def state(self) -> dict:
+        with contextlib.closing(self._connect()) as connection:
+            state = {row["key"]: row["value"] for row in connection.execute("SELECT key, value FROM sync_state")}
+            state["documents"] = connection.execute("SELECT count(*) FROM documents").fetchone()[0]
+        return state
+
+    def versions(self, doc_ids: list) -> Dict[int, str]:
+        """lastModified of the given documents as indexed"""
+        versions = {}
+        with contextlib.closing(self._connect()) as connection:
+            for start in range(0, len(doc_ids), 500):
+                chunk = doc_ids[start:start + 500]
+                rows = connection.execute(
+                    f"SELECT id, last_modified FROM documents WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                )
+                versions.update((row["id"], row["last_modified"]) for row in rows)
+        return versions
+
+    def store(self, rows: List[dict], watermark: Optional[str], keep_only: Optional[set] = None) -> int:
+        """Upserts documents and records the sync; with keep_only, removes all other documents"""
+        removed = 0
+        with contextlib.closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT INTO documents (id, global_id, name, tags, form, created, last_modified, content) "
+                "VALUES (:id, :global_id, :name, :tags, :form, :created, :last_modified, :content) "
+                "ON CONFLICT(id) DO UPDATE SET global_id=excluded.global_id, name=excluded.name, "
+                "tags=excluded.tags, form=excluded.form, created=excluded.created, "
+                "last_modified=excluded.last_modified, content=excluded.content",
+                rows,
+            )
+            if keep_only is not None:
+                stale = [row["id"] for row in connection.execute("SELECT id FROM documents")
+                         if row["id"] not in keep_only]
+                connection.executemany("DELETE FROM documents WHERE id = ?", [(doc_id,) for doc_id in stale])
+                removed = len(stale)
+            state = {"last_sync": str(time.time())}
+            if watermark:
+                state["watermark"] = watermark
+            connection.executemany("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", state.items())
+        return removed
+
+    def search(self, query: str, limit: int) -> List[dict]:
+        import sqlite3
+
+        sql = (
+            "SELECT d.id, d.global_id, d.name, d.tags, d.form, d.last_modified, "
+            "snippet(documents_fts, 2, '[', ']', '…', 16) AS snippet, "
+            "bm25(documents_fts, 10.0, 5.0, 1.0) AS rank "
+            "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ? ORDER BY rank LIMIT ?"
+        )
+        with contextlib.closing(self._connect()) as connection:
+            try:
+                rows = connection.execute(sql, (query, limit)).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS5 query syntax: search for the words as plain terms
+                terms = " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+                rows = connection.execute(sql, (terms, limit)).fetchall() if terms else []
+        return [{
+            "id": row["id"], "globalId": row["global_id"], "name": row["name"], "tags": row["tags"],
+            "form": row["form"], "lastModified": row["last_modified"], "snippet": row["snippet"],
+            "score": float(f"{-row['rank']:.4g}"),
+        } for row in rows]
+
+
+local_index = LocalDocumentIndex(LOCAL_INDEX_PATH) if LOCAL_INDEX_PATH else None
+_local_index_sync_lock = None
+
+
+def _iso_time(epoch_seconds: float) -> str:
+    from datetime import datetime, timezone
+
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+def _local_index_disabled() -> dict:
+    return {
+        "error": "local_index_disabled",
+        "message": "The local search index is not enabled; set RSPACE_LOCAL_INDEX_PATH to an SQLite file path.",
+    }
+
+
+async def _sync_local_index(full: bool = False, ctx: Optional[Context] = None) -> dict:
+    import anyio
+
+    global _local_index_sync_lock
+    if _local_index_sync_lock is None:
+        _local_index_sync_lock = anyio.Lock()
+    async with _local_index_sync_lock:
+        start = time.perf_counter()
+        state = await anyio.to_thread.run_sync(local_index.state)
+        since = None if full else state.get("watermark")
+        listed = await _list_modified_since(since, ctx=ctx)
+        documents = listed['documents']
+        versions = await anyio.to_thread.run_sync(local_index.versions, [doc['id'] for doc in documents])
+        changed = [doc for doc in documents if versions.get(doc['id']) != doc.get('lastModified')]
+        loaded = await _load_documents([doc['id'] for doc in changed])
+        rows = []
+        failed = []
+        for listed_doc, document in zip(changed, loaded):
+            if isinstance(document, Exception):
+                failed.append(listed_doc)
+                continue
+            rows.append({
+                "id": document['id'],
+                "global_id": document.get('globalId', f"SD{document['id']}"),
+                "name": document.get('name', ''),
+                "tags": ", ".join(_tag_list(document.get('tags'))),
+                "form": (document.get('form') or {}).get('name'),
+                "created": document.get('created'),
+                # The listing's timestamp, so the next sync compares like with like
+                "last_modified": listed_doc.get('lastModified'),
+                "content": _assemble_content(document.get('fields', []), "text", None)['content'],
+            })
+        # Listings are oldest first: the watermark may move up to the newest document
+        # listed, but not past one that failed to load, so the next sync retries it
+        watermark = state.get("watermark") if not full else None
+        if failed:
+            watermark = min(doc['lastModified'] for doc in failed)
+        elif documents:
+            watermark = documents[-1]['lastModified']
+        keep_only = {doc['id'] for doc in documents} if full and listed['complete'] else None
+        removed = await anyio.to_thread.run_sync(local_index.store, rows, watermark, keep_only)
+        return {
+            "listed": len(documents),
+            "updated": len(rows),
+            "failed": [doc['globalId'] for doc in failed],
+            "removed": removed,
+            "complete": listed['complete'],
+            "watermark": watermark,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+
+
+@mcp.tool(tags={"rspace", "search", "local-index"})
+async def sync_local_index(full: bool = False, ctx: Context = None) -> dict:
+    """
+    Brings the local full-text index up to date with RSpace
+    
+    Usage: Refresh the index before relying on search_local_index, e.g. after bulk edits
+    Incremental: Only documents modified since the last sync are fetched
+    - full: Re-list every document and remove ones deleted in RSpace (slower)
+    Returns: Documents listed, updated, failed and removed, and the new watermark
+    """
+    if local_index is None:
+        return _local_index_disabled()
+    return await _sync_local_index(full, ctx)
+
+
+@mcp.tool(tags={"rspace", "search", "local-index"})
+async def search_local_index(
+    query: str,
+    limit: int = 20,
+    sync: bool = True,
+    ctx: Context = None
+) -> dict:
+    """
+    Full-text search over the local mirror of your ELN documents
+    
+    Usage: Fast, ranked searches repeated many times (answers in milliseconds)
+    Query syntax: SQLite FTS5, e.g. 'pcr AND buffer', '"gel electrophoresis"',
+                  'name:protocol', 'plasm*'; plain words work too
+    Ranking: bm25, with matches in names and tags weighted above content
+    - limit: Maximum number of hits (max 200)
+    - sync: Sync the index first when it is older than RSPACE_LOCAL_INDEX_MAX_AGE
+    Returns: Hits with id, globalId, name, tags, snippet ([highlighted] terms) and score,
+             plus the index's document count and last sync time
+    """
+    import anyio
+
+    if local_index is None:
+        return _local_index_disabled()
+    if limit > 200 or limit < 1:
+        raise ValueError("limit must be between 1 and 200")
+    state = await anyio.to_thread.run_sync(local_index.state)
+    synced = None
+    if sync and time.time() - float(state.get("last_sync") or 0) > LOCAL_INDEX_MAX_AGE:
+        synced = await _sync_local_index(ctx=ctx)
+        state = await anyio.to_thread.run_sync(local_index.state)
+    start = time.perf_counter()
+    hits = await anyio.to_thread.run_sync(local_index.search, query, limit)
+    result = {
+        "hits": hits,
+        "indexedDocuments": state["documents"],
+        "lastSync": _iso_time(float(state["last_sync"])) if state.get("last_sync") else None,
+        "searchMs": round((time.perf_counter() - start) * 1000, 2),
+    }
+    if synced is not None:
+        result["sync"] = synced
+    return result
+
 # ============================================================================
 # INVENTORY MANAGEMENT TOOLS
 # ============================================================================
@@ -904,7 +3882,7 @@ def create_sample_from_template(
 
 
 @mcp.tool(tags={"rspace", "inventory", "samples"})
-def get_sample(sample_id: Union[int, str]) -> dict:
+async def get_sample(sample_id: Union[int, str]) -> dict:
     """
     Retrieves complete information about a specific sample
     
@@ -912,20 +3890,31 @@ def get_sample(sample_id: Union[int, str]) -> dict:
     Parameters: sample_id can be numeric ID or global ID (e.g., "SA12345")
     Returns: Full sample details including all subsamples
     """
-    return inv_cli.get_sample_by_id(sample_id)
+    return await async_inv_cli.get_sample_by_id(sample_id)
 
 
 @mcp.tool(tags={"rspace", "inventory", "samples"})
-def list_samples(page_size: int = 20, order_by: str = "lastModified", sort_order: str = "desc") -> dict:
+async def list_samples(
+    page_size: int = 20,
+    order_by: str = "lastModified",
+    sort_order: str = "desc",
+    page_number: int = 0,
+    cursor: Optional[str] = None
+) -> dict:
     """
     Lists samples in the inventory with pagination and sorting
     
     Usage: Browse sample collection, find recent additions
     Sorting: Options include "lastModified", "name", "created"
-    Returns: Paginated list of sample metadata
+    Paging: Pass the returned nextCursor to get the next page of the same listing
+    Returns: Paginated list of sample metadata with nextCursor (null on the last page)
     """
-    pagination = i.Pagination(page_size=page_size, order_by=order_by, sort_order=sort_order)
-    return inv_cli.list_samples(pagination)
+    state = _start_cursor("list_samples", cursor, {"order_by": order_by, "sort_order": sort_order},
+                          page_number, page_size, {"order_by": Optional[str], "sort_order": Optional[str]})
+    order_by, sort_order = state["q"]["order_by"], state["q"]["sort_order"]
+    pagination = i.Pagination(page_number=state["p"], page_size=state["n"], order_by=order_by, sort_order=sort_order)
+    page = await async_inv_cli.list_samples(pagination)
+    return _continue_cursor("list_samples", state, page, 'samples', f"{order_by} {sort_order}")
 
 
 @mcp.tool(tags={"rspace", "inventory", "samples"})
@@ -971,7 +3960,7 @@ def add_note_to_subsample(subsample_id: Union[int, str], note: str) -> dict:
 # Tools for finding inventory items across the system
 
 @mcp.tool(tags={"rspace", "inventory", "samples"})
-def search_inventory(query: str, result_type: str = None) -> dict:
+async def search_inventory(query: str, result_type: str = None) -> dict:
     """
     Searches across all inventory items using text query
     
@@ -982,7 +3971,7 @@ def search_inventory(query: str, result_type: str = None) -> dict:
     rt = None
     if result_type:
         rt = getattr(i.ResultType, result_type.upper(), None)
-    return inv_cli.search(query, result_type=rt)
+    return await async_inv_cli.search(query, result_type=rt)
 
 
 # ==================== CONTAINER MANAGEMENT ====================
@@ -1061,7 +4050,7 @@ def create_grid_container(
 
 
 @mcp.tool(tags={"rspace", "inventory", "containers"})
-def get_container(container_id: Union[int, str], include_content: bool = False) -> dict:
+async def get_container(container_id: Union[int, str], include_content: bool = False) -> dict:
     """
     Retrieves container information with optional content listing
     
@@ -1069,23 +4058,26 @@ def get_container(container_id: Union[int, str], include_content: bool = False)
     Performance: Set include_content=False for faster queries on large containers
     Returns: Container details and optionally contained items
     """
-    return inv_cli.get_container_by_id(container_id, include_content)
+    return await async_inv_cli.get_container_by_id(container_id, include_content)
 
 
 @mcp.tool(tags={"rspace", "inventory", "containers"})
-def list_containers(page_size: int = 20) -> dict:
+async def list_containers(page_size: int = 20, page_number: int = 0, cursor: Optional[str] = None) -> dict:
     """
     Lists top-level containers (not nested within other containers)
     
     Usage: Browse main container organization structure
-    Returns: Paginated list of root-level containers
+    Paging: Pass the returned nextCursor to get the next page of the same listing
+    Returns: Paginated list of root-level containers with nextCursor (null on the last page)
     """
-    pagination = i.Pagination(page_size=page_size)
-    return inv_cli.list_top_level_containers(pagination)
+    state = _start_cursor("list_containers", cursor, {}, page_number, page_size)
+    pagination = i.Pagination(page_number=state["p"], page_size=state["n"])
+    page = await async_inv_cli.list_top_level_containers(pagination)
+    return _continue_cursor("list_containers", state, page, 'containers', None)
 
 
 @mcp.tool(tags={"rspace", "inventory", "containers"})
-def get_workbenches() -> List[dict]:
+async def get_workbenches() -> List[dict]:
     """
     Retrieves all available workbenches (virtual workspaces)
     
@@ -1093,7 +4085,7 @@ def get_workbenches() -> List[dict]:
     Workbenches: Special containers representing physical or logical workspaces
     Returns: List of all workbench containers
     """
-    return inv_cli.get_workbenches()
+    return await async_inv_cli.get_workbenches()
 
 
 # ==================== ITEM MOVEMENT AND ORGANIZATION ====================
@@ -1111,7 +4103,10 @@ def move_items_to_list_container(
     Items: Can move both samples/subsamples and other containers
     Returns: Success status and results for each moved item
     """
-    result = inv_cli.add_items_to_list_container(target_container_id, *item_ids)
+    try:
+        result = inv_cli.add_items_to_list_container(target_container_id, *item_ids)
+    finally:
+        _inventory_written(target_container_id, *item_ids)
     return {"success": result.is_ok(), "results": result.data if hasattr(result, 'data') else str(result)}
 
 
@@ -1135,7 +4130,7 @@ def move_items_to_grid_container_by_row(
     """
     # Auto-detect container dimensions if not provided
     if total_columns is None or total_rows is None:
-        container = inv_cli.get_container_by_id(target_container_id)
+        container = inv_cli.uncoalesced.get_container_by_id(target_container_id)
         container_obj = i.Container.of(container)
         if hasattr(container_obj, 'column_count'):
             total_columns = container_obj.column_count()
@@ -1143,8 +4138,11 @@ def move_items_to_grid_container_by_row(
         else:
             raise ValueError("Container dimensions required for non-grid containers")
     
-    placement = i.ByRow(start_column, start_row, total_columns, total_rows, *item_ids)
-    result = inv_cli.add_items_to_grid_container(target_container_id, placement)
+    try:
+        placement = i.ByRow(start_column, start_row, total_columns, total_rows, *item_ids)
+        result = inv_cli.add_items_to_grid_container(target_container_id, placement)
+    finally:
+        _inventory_written(target_container_id, *item_ids)
     return {"success": result.is_ok(), "results": result.data if hasattr(result, 'data') else str(result)}
 
 
@@ -1166,7 +4164,7 @@ def move_items_to_grid_container_by_column(
     """
     # Auto-detect container dimensions if not provided
     if total_columns is None or total_rows is None:
-        container = inv_cli.get_container_by_id(target_container_id)
+        container = inv_cli.uncoalesced.get_container_by_id(target_container_id)
         container_obj = i.Container.of(container)
         if hasattr(container_obj, 'column_count'):
             total_columns = container_obj.column_count()
@@ -1174,8 +4172,11 @@ def move_items_to_grid_container_by_column(
         else:
             raise ValueError("Container dimensions required for non-grid containers")
     
-    placement = i.ByColumn(start_column, start_row, total_columns, total_rows, *item_ids)
-    result = inv_cli.add_items_to_grid_container(target_container_id, placement)
+    try:
+        placement = i.ByColumn(start_column, start_row, total_columns, total_rows, *item_ids)
+        result = inv_cli.add_items_to_grid_container(target_container_id, placement)
+    finally:
+        _inventory_written(target_container_id, *item_ids)
     return {"success": result.is_ok(), "results": result.data if hasattr(result, 'data') else str(result)}
 
 
@@ -1198,8 +4199,11 @@ def move_items_to_specific_grid_locations(
         raise ValueError("Number of items must match number of grid locations")
     
     locations = [i.GridLocation(loc.x, loc.y) for loc in grid_locations]
-    placement = i.ByLocation(locations, *item_ids)
-    result = inv_cli.add_items_to_grid_container(target_container_id, placement)
+    try:
+        placement = i.ByLocation(locations, *item_ids)
+        result = inv_cli.add_items_to_grid_container(target_container_id, placement)
+    finally:
+        _inventory_written(target_container_id, *item_ids)
     return {"success": result.is_ok(), "results": result.data if hasattr(result, 'data') else str(result)}
 
 
@@ -1297,7 +4301,7 @@ def generate_barcode(global_id: str, barcode_type: str = "BARCODE") -> bytes:
 # These functions are designed for high-performance operations with large datasets
 
 @mcp.tool(tags={"rspace", "inventory", "utility"})
-def get_container_summary(container_id: int | str) -> dict:
+async def get_container_summary(container_id: int | str) -> dict:
     """
     Retrieves container metadata without content for fast queries
     
@@ -1305,11 +4309,11 @@ def get_container_summary(container_id: int | str) -> dict:
     Performance: Avoids loading large content lists for better response times
     Returns: Container metadata only (name, type, capacity, etc.)
     """
-    return inv_cli.get_container_by_id(container_id, include_content=False)
+    return await async_inv_cli.get_container_by_id(container_id, include_content=False)
 
 
 @mcp.tool(tags={"rspace", "inventory", "utility"})
-def get_container_contents_only(container_id: int | str) -> list:
+async def get_container_contents_only(container_id: int | str) -> list:
     """
     Retrieves only the items stored in a container
     
@@ -1317,7 +4321,7 @@ def get_container_contents_only(container_id: int | str) -> list:
     Performance: Focused query for container content analysis
     Returns: List of contained items with minimal metadata
     """
-    container = inv_cli.get_container_by_id(container_id, include_content=True)
+    container = await async_inv_cli.get_container_by_id(container_id, include_content=True)
     return container.get('locations', [])
 
 
@@ -1356,12 +4360,132 @@ def get_recent_samples_summary(days_back: int = 7, page_size: int = 10) -> list:
     pass
 
 
+# ============================================================================
+# STARTUP PROFILING
+# ============================================================================
+# Reports where server startup time goes. Everything up to this point runs on
+# every spawn; the deferred imports and client construction are forced here so
+# their cost shows up in the report as well.
+
+_TOOLS_REGISTERED = time.perf_counter()
+
+
+def _time_first_list_tools() -> float:
+    """Time a list_tools round trip through an in-memory MCP client"""
+    import asyncio
+    from fastmcp import Client
+
+    async def list_tools():
+        async with Client(mcp) as client:
+            start = time.perf_counter()
+            await client.list_tools()
+            return time.perf_counter() - start
+
+    return asyncio.run(list_tools())
+
+
+def print_startup_profile():
+    """Prints import and initialisation cost of the server, in milliseconds"""
+    rows = [
+        ("import fastmcp", _FASTMCP_IMPORTED - _STARTUP_BEGIN),
+        ("import dotenv, pydantic", _DEPENDENCIES_IMPORTED - _FASTMCP_IMPORTED),
+        ("server setup and tool registration", _TOOLS_REGISTERED - _DEPENDENCIES_IMPORTED),
+    ]
+    ready = _TOOLS_REGISTERED - _STARTUP_BEGIN
+    rows.append(("first list_tools", _time_first_list_tools()))
+
+    # Force the deferred work so its cost is visible too
+    for lazy in (e, i, AdvancedQueryBuilder):
+        lazy._resolve()
+    deferred_errors = []
+    for client in (eln_cli, inv_cli):
+        try:
+            client._get()
+        except Exception as ex:
+            deferred_errors.append(f"{client._name}: {ex}")
+    deferred = [(f"{name} (deferred)", seconds) for name, seconds in _startup_timings.items()]
+
+    print("RSpace MCP server startup profile")
+    for name, seconds in rows + deferred:
+        print(f"  {name:<60} {seconds * 1000:9.1f} ms")
+    print(f"  {'ready to serve (module import)':<60} {ready * 1000:9.1f} ms")
+    print(f"  {'deferred until first tool call':<60} {sum(s for _, s in deferred) * 1000:9.1f} ms")
+    for error in deferred_errors:
+        print(f"  client initialisation failed - {error}")
+
+
 # ============================================================================
 # SERVER EXECUTION
 # ============================================================================
 # This section handles the actual MCP server startup
 # Modify this section only if changing server configuration or adding
 # initialization logic
+#
+# Transports:
+#   stdio (default)  one server process per MCP client
+#   http             streamable HTTP, one warm process serving many clients;
+#                    with --workers > 1 uvicorn runs several worker processes,
+#                    each with its own connection pool and caches
+# Each command line option falls back to an environment variable:
+#   RSPACE_MCP_TRANSPORT, RSPACE_MCP_HOST, RSPACE_MCP_PORT, RSPACE_MCP_WORKERS
+
+MCP_HTTP_PATH = os.getenv("RSPACE_MCP_PATH", "/mcp")
+
+
+def warm_up():
+    """Builds the RSpace clients up front, so the first request does not pay for it"""
+    eln_cli._get()
+    inv_cli._get()
+    AdvancedQueryBuilder._resolve()
+
+
+def http_app():
+    """
+    ASGI application factory used by uvicorn worker processes.
+    Workers are stateless: consecutive requests of one MCP session may be
+    served by different processes, so no per-session state is kept. Each
+    worker labels its /metrics series with its pid.
+    """
+    metrics.labels = {"worker": str(os.getpid())}
+    warm_up()
+    return mcp.http_app(path=MCP_HTTP_PATH, stateless_http=True, transport="streamable-http")
+
+
+def _parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RSpace MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default=os.getenv("RSPACE_MCP_TRANSPORT", "stdio"))
+    parser.add_argument("--host", default=os.getenv("RSPACE_MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=_env_int("RSPACE_MCP_PORT", 8000))
+    parser.add_argument("--workers", type=int, default=_env_int("RSPACE_MCP_WORKERS", 1),
+                        help="number of HTTP worker processes (http transport only)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print import and initialisation cost, then exit")
+    return parser.parse_args(argv)
+
+
+def run_server(argv=None):
+    args = _parse_args(argv)
+    if args.startup_profile:
+        print_startup_profile()
+    elif args.transport == "stdio":
+        mcp.run()
+    elif args.workers > 1:
+        import uvicorn
+
+        uvicorn.run(
+            "main:http_app",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+        )
+    else:
+        warm_up()
+        mcp.run(transport="streamable-http", host=args.host, port=args.port, path=MCP_HTTP_PATH)
+
 
 if __name__ == "__main__":
     """
@@ -1377,8 +4501,12 @@ if __name__ == "__main__":
     - Ensure RSPACE_API_KEY and RSPACE_URL environment variables are set
     - Server will automatically expose all registered tools to MCP clients
     - Use appropriate tags for tool categorization and discovery
+    - Run with --startup-profile to print a breakdown of import and client
+      initialisation cost instead of starting the server
+    - Run with --transport http [--host H --port P --workers N] to serve
+      many MCP clients from one shared deployment
     """
-    mcp.run()
+    run_server()
 
 
 # ============================================================================
@@ -1430,6 +4558,8 @@ COMMON PATTERNS:
 - Return Types: Return appropriate data structures (dict, list, custom models)
 - Optional Parameters: Provide sensible defaults for optional parameters
 - Client Usage: Use eln_cli for ELN operations, inv_cli for inventory
+- Async Tools: Read tools that wait on RSpace are `async def` and await
+  async_eln_cli / async_inv_cli, which expose the same methods as coroutines
 
 ARCHITECTURE NOTES:
 
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# main.py reads its settings at import time; the unit tests never reach RSpace
+os.environ.setdefault("RSPACE_URL", "http://rspace.invalid")
+os.environ.setdefault("RSPACE_API_KEY", "test")
+os.environ.setdefault("RSPACE_RATE_LIMIT", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,86 @@
+import anyio
+import pytest
+
+import main
+
+TIE = "2024-03-01T10:00:00.000Z"
+
+
+class FakeEln:
+    """Serves self.documents ordered by lastModified, like RSpace's listing"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def get_documents(self, order_by, page_number, page_size, **kwargs):
+        ordered = sorted(self.documents, key=lambda doc: (doc["lastModified"], doc["id"]))
+        start = page_number * page_size
+        return {"totalHits": len(ordered),
+                "documents": [dict(doc) for doc in ordered[start:start + page_size]]}
+
+    async def get_documents_advanced_query(self, advanced_query, order_by, page_number, page_size):
+        # The day range filter is coarse; get_document_changes makes the precise cut
+        return await self.get_documents(order_by, page_number, page_size)
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    documents = [{"id": 1, "lastModified": "2024-02-28T09:00:00.000Z"}]
+    documents += [{"id": i, "lastModified": TIE} for i in range(2, 7)]
+    documents += [{"id": 7, "lastModified": "2024-03-02T08:00:00.000Z"}]
+    eln = FakeEln(documents)
+    monkeypatch.setattr(main, "async_eln_cli", eln)
+    return eln
+
+
+def _changes(**kwargs):
+    tool = getattr(main.get_document_changes, "fn", main.get_document_changes)
+    return anyio.run(lambda: tool(**kwargs))
+
+
+def _drain(cursor, max_results):
+    """ids returned by calling the feed until it has nothing more, and the last cursor"""
+    returned = []
+    while True:
+        result = _changes(cursor=cursor, max_results=max_results)
+        returned += [doc["id"] for doc in result["changes"]]
+        cursor = result["nextCursor"]
+        if not result["hasMore"]:
+            return returned, cursor
+
+
+def test_ties_at_the_boundary_are_neither_repeated_nor_skipped(feed):
+    first = _changes(max_results=2)
+    assert [doc["id"] for doc in first["changes"]] == [1, 2]
+    assert first["hasMore"] and first["watermark"] == TIE
+    rest, cursor = _drain(first["nextCursor"], 2)
+    assert [1, 2] + rest == [1, 2, 3, 4, 5, 6, 7]
+    assert _changes(cursor=cursor)["changes"] == []
+
+
+def test_edited_document_comes_back_exactly_once(feed):
+    _, cursor = _drain(None, 3)
+    feed.documents[3]["lastModified"] = "2024-03-03T12:00:00.000Z"
+    again = _changes(cursor=cursor)
+    assert [doc["id"] for doc in again["changes"]] == [4]
+    assert not again["hasMore"]
+    assert _changes(cursor=again["nextCursor"])["changes"] == []
+
+
+def test_edit_at_the_watermark_instant_is_not_lost(feed):
+    # Documents 2-6 share TIE; one more document written at the same instant
+    # after the feed passed it is returned, the others are not repeated
+    first = _changes(max_results=3)
+    assert [doc["id"] for doc in first["changes"]] == [1, 2, 3]
+    feed.documents.append({"id": 8, "lastModified": TIE})
+    rest, _ = _drain(first["nextCursor"], 10)
+    assert sorted(rest) == [4, 5, 6, 7, 8]
+
+
+def test_since_starts_at_the_given_time(feed):
+    assert [doc["id"] for doc in _changes(since="2024-03-01")["changes"]] == [2, 3, 4, 5, 6, 7]
+    assert [doc["id"] for doc in _changes(since="2024-03-01T10:00:00.001+00:00")["changes"]] == [7]
+    with pytest.raises(ValueError, match="since must be an ISO date or time"):
+        _changes(since="last tuesday")
+    with pytest.raises(ValueError, match="either cursor or since"):
+        _changes(since="2024-03-01", cursor=_changes()["nextCursor"])
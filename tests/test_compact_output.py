@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+
+import anyio
+import pytest
+from fastmcp import Client, FastMCP
+
+import main
+
+RECORD = {
+    "id": 1,
+    "name": "PCR",
+    "_links": [{"rel": "self"}],
+    "owner": {"username": "user1"},
+    "fields": [{"id": 2, "content": "x", "_links": [], "stableId": "abc"}],
+    "stableId": "def",
+}
+
+
+def _server(compact: bool) -> FastMCP:
+    server = FastMCP("test")
+
+    @server.tool
+    def plain() -> str:
+        return "OK"
+
+    @server.tool
+    def record() -> dict:
+        return json.loads(json.dumps(RECORD))
+
+    if compact:
+        server.add_middleware(main.CompactOutputMiddleware())
+    return server
+
+
+def _call(server: FastMCP, tool: str):
+    async def call():
+        async with Client(server) as client:
+            return await client.call_tool_mcp(tool, {})
+
+    return anyio.run(call)
+
+
+def test_string_result_keeps_its_text():
+    result = _call(_server(compact=True), "plain")
+    assert [block.text for block in result.content] == ["OK"]
+
+
+def test_nested_keys_are_removed():
+    result = _call(_server(compact=True), "record")
+    expected = {"id": 1, "name": "PCR", "fields": [{"id": 2, "content": "x", "stableId": "abc"}], "stableId": "def"}
+    assert result.structured_content == expected
+    assert json.loads(result.content[0].text) == expected
+
+
+def test_untouched_result_is_returned_as_is():
+    server = FastMCP("test")
+
+    @server.tool
+    def clean() -> dict:
+        return {"id": 1, "name": "PCR"}
+
+    plain = _call(server, "clean")
+    server.add_middleware(main.CompactOutputMiddleware())
+    assert _call(server, "clean").content == plain.content
+
+
+def test_per_tool_rules(monkeypatch):
+    monkeypatch.setattr(main, "COMPACT_TOOL_RULES", {"record": {"allow": ["owner"], "deny": ["stableId"]}})
+    result = _call(_server(compact=True), "record")
+    assert result.structured_content["owner"] == {"username": "user1"}
+    assert "stableId" not in result.structured_content
+    assert "stableId" not in result.structured_content["fields"][0]
+    assert "_links" not in result.structured_content
+
+
+@pytest.mark.parametrize("setting, compacted", [("false", False), ("true", True)])
+def test_setting_switches_compaction_off(setting, compacted):
+    # COMPACT_OUTPUT is read at import, so the server is started in a fresh interpreter
+    script = (
+        "import anyio, json, main\n"
+        "from fastmcp import Client\n"
+        f"main.mcp.tool(lambda: {RECORD!r}, name='record', output_schema={{'type': 'object'}})\n"
+        "async def call():\n"
+        "    async with Client(main.mcp) as client:\n"
+        "        result = await client.call_tool_mcp('record', {})\n"
+        "        print(json.dumps(result.content[0].text))\n"
+        "anyio.run(call)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "RSPACE_COMPACT_OUTPUT": setting}
+    output = subprocess.run([sys.executable, "-c", script], cwd=root, env=env, capture_output=True,
+                            text=True, check=True).stdout
+    text = json.loads(output.strip().splitlines()[-1])
+    uncompacted = _call(_server(compact=False), "record").content[0].text
+    assert (text != uncompacted) is compacted
+    assert json.loads(text) == (_call(_server(compact=True), "record").structured_content if compacted else RECORD)
@@ -0,0 +1,70 @@
+import pytest
+
+import main
+
+
+def _text(html: str, markdown: bool = False) -> str:
+    return main._HTMLToText(markdown=markdown).convert(html)
+
+
+def test_table_rows_become_lines_of_cells():
+    html = "<table><tr><th>Sample</th><th>Conc.</th></tr><tr><td>A1</td><td>5 mM</td></tr></table>"
+    assert _text(html) == "Sample | Conc.\nA1 | 5 mM"
+
+
+def test_lists_and_headings():
+    html = "<h2>Steps</h2><ol><li>Mix</li><li>Spin  down</li></ol>"
+    assert _text(html) == "Steps\n\n- Mix\n- Spin down"
+    assert _text(html, markdown=True) == "## Steps\n\n- Mix\n- Spin down"
+
+
+def test_entities_are_decoded_and_scripts_dropped():
+    html = "<p>5 &micro;l &amp; 37&deg;C &lt;10&gt;&nbsp;min</p><script>alert(1)</script>"
+    assert _text(html) == "5 µl & 37°C <10> min"
+
+
+def test_markdown_inline_markup_and_links():
+    html = '<p><b>Note</b>: see <a href="https://example.org">protocol</a>, <code>x=1</code></p>'
+    assert _text(html, markdown=True) == "**Note**: see [protocol](https://example.org), `x=1`"
+
+
+def test_preformatted_text_keeps_whitespace():
+    assert _text("<pre>a  b\n  c</pre>", markdown=True) == "```\na  b\n  c\n```"
+
+
+FIELDS = [
+    {"id": 1, "name": "Objective", "content": "<p>Amplify &amp; sequence</p>"},
+    {"id": 2, "name": "Empty", "content": ""},
+    {"id": 3, "name": "Method", "content": "<ul><li>PCR</li><li>Gel</li></ul>"},
+    {"id": 4, "name": "Blank", "content": None},
+]
+
+
+@pytest.mark.parametrize("content_format", ["html", "text", "markdown"])
+def test_offsets_match_slices_of_content(content_format):
+    assembled = main._assemble_content(FIELDS, content_format, None)
+    content = assembled["content"]
+    assert assembled["totalChars"] == len(content)
+    for offset, field in zip(assembled["offsets"], FIELDS):
+        expected = field["content"] or ""
+        if content_format != "html":
+            expected = _text(expected, markdown=content_format == "markdown")
+        assert content[offset["start"]:offset["end"]] == expected
+        assert (offset["id"], offset["name"]) == (field["id"], field["name"])
+
+
+def test_empty_fields_add_no_separator():
+    assembled = main._assemble_content(FIELDS, "text", None)
+    assert assembled["content"] == "Amplify & sequence\n\n- PCR\n- Gel"
+    leading = main._assemble_content([FIELDS[1], FIELDS[0]], "text", None)
+    assert leading["content"] == "Amplify & sequence"
+
+
+def test_max_chars_cuts_a_field_and_drops_later_offsets():
+    assembled = main._assemble_content(FIELDS, "text", 24)
+    assert assembled["truncated"]
+    assert assembled["content"] == "Amplify & sequence\n\n- PC"
+    assert assembled["totalChars"] == len("Amplify & sequence\n\n- PCR\n- Gel")
+    assert [(offset["id"], offset["start"], offset["end"]) for offset in assembled["offsets"]] == \
+        [(1, 0, 18), (2, 18, 18), (3, 20, 24)]
+    assert main._assemble_content(FIELDS, "text", 100)["truncated"] is False
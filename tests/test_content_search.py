@@ -0,0 +1,92 @@
+import anyio
+import pytest
+
+import main
+
+
+class FakeEln:
+    """Advanced query listing of 23 documents; every third one is named "draft ..." """
+
+    def __init__(self):
+        self.documents = [{"id": i, "globalId": f"SD{i}", "name": f"{'draft' if i % 3 == 0 else 'final'} {i}",
+                           "tags": ""} for i in range(23)]
+        self.pages = []
+
+    async def get_documents_advanced_query(self, advanced_query, order_by, page_number, page_size):
+        self.pages.append((page_number, page_size))
+        start = page_number * page_size
+        return {"totalHits": len(self.documents),
+                "documents": [dict(doc) for doc in self.documents[start:start + page_size]]}
+
+
+@pytest.fixture
+def eln(monkeypatch):
+    fake = FakeEln()
+    monkeypatch.setattr(main, "async_eln_cli", fake)
+    return fake
+
+
+def _find(**kwargs):
+    tool = getattr(main.find_documents_by_content, "fn", main.find_documents_by_content)
+    return anyio.run(lambda: tool(**kwargs))
+
+
+def test_cursor_resumes_inside_a_fetched_batch(eln):
+    first = _find(content_terms=["pcr"], exclude_terms=["draft"], page_size=4)
+    # The page fills at document 5, part-way through the first batch of 8
+    assert [doc["id"] for doc in first["documents"]] == [1, 2, 4, 5]
+    assert eln.pages == [(0, 8)]
+    assert first["nextCursor"] and not first["exclusion"]["allResultsScanned"]
+
+    returned = [doc["id"] for doc in first["documents"]]
+    cursor = first["nextCursor"]
+    while cursor:
+        result = _find(cursor=cursor)
+        returned += [doc["id"] for doc in result["documents"]]
+        cursor = result["nextCursor"]
+    assert returned == [i for i in range(23) if i % 3]
+
+
+def test_last_page_reports_all_results_scanned(eln):
+    result = _find(content_terms=["pcr"], exclude_terms=["draft"], page_size=50)
+    assert result["exclusion"] == {"scanned": 23, "excluded": 8, "kept": 15, "pagesFetched": 1,
+                                   "allResultsScanned": True, "fullTextChecked": False}
+    assert result["nextCursor"] is None
+    assert result["totalHits"] == 23
+
+
+def test_scan_stops_at_the_cap_and_continues_after_it(eln, monkeypatch):
+    monkeypatch.setattr(main, "EXCLUSION_MAX_SCAN", 8)
+    eln.documents = [{**doc, "name": f"draft {doc['id']}"} if doc["id"] < 16 else doc for doc in eln.documents]
+    first = _find(content_terms=["pcr"], exclude_terms=["draft"], page_size=2)
+    assert first["documents"] == []
+    assert first["exclusion"]["scanned"] == 8 and first["exclusion"]["pagesFetched"] == 2
+    assert not first["exclusion"]["allResultsScanned"]
+    second = _find(cursor=first["nextCursor"])
+    assert second["exclusion"]["scanned"] == 8
+    third = _find(cursor=second["nextCursor"])
+    assert [doc["id"] for doc in third["documents"]] == [16, 17]
+
+
+def test_full_text_exclusion_resumes_after_the_last_checked_document(eln, monkeypatch):
+    async def load(ids):
+        return [{"fields": [{"content": "<p>draft notes</p>" if int(gid[2:]) % 2 else "<p>ok</p>"}]}
+                for gid in ids]
+
+    monkeypatch.setattr(main, "_load_documents", load)
+    returned, cursor = [], None
+    while True:
+        result = (_find(cursor=cursor) if cursor else
+                  _find(content_terms=["pcr"], exclude_terms=["draft"], page_size=3, check_full_text=True))
+        returned += [doc["id"] for doc in result["documents"]]
+        cursor = result["nextCursor"]
+        if not cursor:
+            break
+    assert returned == [i for i in range(23) if i % 3 and i % 2 == 0]
+
+
+def test_page_size_is_validated(eln):
+    for page_size in (0, 201):
+        with pytest.raises(ValueError, match="page_size"):
+            _find(content_terms=["pcr"], page_size=page_size)
+    assert eln.pages == []
@@ -0,0 +1,80 @@
+import base64
+import json
+
+import anyio
+import pytest
+
+import main
+
+PARAMS = {"query": "pcr", "order_by": "lastModified desc"}
+
+
+def _forge(state: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state).encode()).decode().rstrip("=")
+
+
+def test_round_trip():
+    state = {"q": PARAMS, "p": 3, "n": 20, "seen": [1, 2], "last": "2024-01-01T00:00:00.000Z"}
+    cursor = main._encode_cursor("search_documents", state)
+    assert "=" not in cursor
+    assert main._start_cursor("search_documents", cursor, PARAMS, 0, 20) == {"k": "search_documents", **state}
+
+
+def test_fresh_state_without_cursor():
+    assert main._start_cursor("get_forms", None, PARAMS, 2, 50) == \
+        {"q": PARAMS, "p": 2, "n": 50, "seen": [], "last": None}
+
+
+def test_continue_drops_items_already_returned():
+    state = main._start_cursor("get_forms", None, PARAMS, 0, 2)
+    first = main._continue_cursor("get_forms", state, {"forms": [{"id": 1}, {"id": 2}], "totalHits": 5},
+                                  "forms", None)
+    state = main._start_cursor("get_forms", first["nextCursor"], PARAMS, 0, 2)
+    second = main._continue_cursor("get_forms", state, {"forms": [{"id": 2}, {"id": 3}], "totalHits": 5},
+                                   "forms", None)
+    assert second["forms"] == [{"id": 3}]
+    assert second["skippedDuplicates"] == 1
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 at all!",
+    _forge([1, 2]),
+    _forge({"k": "get_forms", "q": PARAMS, "p": 1, "n": 20, "seen": [], "last": None}),
+    _forge({"k": "search_documents", "p": 1, "n": 20, "seen": [], "last": None}),
+    _forge({"k": "search_documents", "q": {"query": "pcr"}, "p": 1, "n": 20, "seen": [], "last": None}),
+    _forge({"k": "search_documents", "q": PARAMS, "p": "1", "n": 20, "seen": [], "last": None}),
+    _forge({"k": "search_documents", "q": PARAMS, "p": -1, "n": 20, "seen": [], "last": None}),
+    _forge({"k": "search_documents", "q": PARAMS, "p": 1, "n": 0, "seen": [], "last": None}),
+    _forge({"k": "search_documents", "q": PARAMS, "p": 1, "n": 20, "seen": [{}], "last": None}),
+    _forge({"k": "search_documents", "q": {**PARAMS, "query": {"x": 1}}, "p": 1, "n": 20, "seen": [],
+            "last": None}),
+])
+def test_tampered_cursor_is_rejected_cleanly(cursor):
+    with pytest.raises(ValueError, match="invalid cursor"):
+        main._start_cursor("search_documents", cursor, PARAMS, 0, 20)
+
+
+@pytest.mark.parametrize("state", [
+    {"ts": "yesterday", "ids": []},
+    {"ts": "2024-03-01T00:00:00+00:00", "ids": [[1]]},
+    {"ts": 1709251200, "ids": []},
+])
+def test_tampered_change_feed_cursor_is_rejected_before_any_request(state):
+    tool = getattr(main.get_document_changes, "fn", main.get_document_changes)
+    with pytest.raises(ValueError, match="invalid cursor"):
+        anyio.run(lambda: tool(cursor=_forge({"k": "get_document_changes", **state})))
+
+
+@pytest.mark.parametrize("params", [
+    {"query_types": ["bogus"]},
+    {"search_type": "fuzzy"},
+    {"operator": "xor"},
+    {"order_by": ["name"]},
+])
+def test_cursor_parameters_outside_the_tool_choices_are_rejected(params):
+    query = {"query": "pcr", "search_type": "advanced", "query_types": ["tag"], "operator": "and",
+             "order_by": "lastModified desc", **params}
+    cursor = _forge({"k": "search_documents", "q": query, "p": 1, "n": 20, "seen": [], "last": None})
+    tool = getattr(main.search_documents, "fn", main.search_documents)
+    with pytest.raises(ValueError, match="invalid cursor"):
+        anyio.run(lambda: tool(cursor=cursor))
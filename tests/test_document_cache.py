@@ -0,0 +1,61 @@
+import anyio
+import pytest
+
+import main
+
+
+def document(doc_id: int, name: str, modified: str = "2024-01-01T00:00:00.000Z") -> dict:
+    return {"id": doc_id, "globalId": f"SD{doc_id}", "name": name, "lastModified": modified}
+
+
+def test_get_returns_copies():
+    cache = main.DocumentCache(max_entries=4, ttl_seconds=60)
+    cache.put(document(1, "a"), cache.generation)
+    cache.get("SD1")["name"] = "changed"
+    assert cache.get(1)["name"] == "a"
+
+
+def test_read_overlapping_an_invalidation_is_not_cached():
+    cache = main.DocumentCache(max_entries=4, ttl_seconds=60)
+    generation = cache.generation  # a read starts
+    cache.invalidate("SD5")        # a write completes while it is in flight
+    cache.put(document(5, "before the write"), generation)
+    assert cache.get(5) is None
+
+
+def test_listing_with_other_last_modified_drops_entry():
+    cache = main.DocumentCache(max_entries=4, ttl_seconds=60)
+    cache.put(document(2, "a"), cache.generation)
+    cache.revalidate([document(2, "a", "2024-02-01T00:00:00.000Z")])
+    assert cache.get(2) is None
+
+
+def test_lru_eviction():
+    cache = main.DocumentCache(max_entries=2, ttl_seconds=60)
+    for doc_id in (1, 2, 3):
+        cache.put(document(doc_id, "x"), cache.generation)
+    assert cache.get(1) is None and cache.get(3) is not None
+
+
+def test_load_document_racing_update_does_not_recache_old_version(monkeypatch):
+    cache = main.DocumentCache(max_entries=4, ttl_seconds=60)
+    monkeypatch.setattr(main, "document_cache", cache)
+    stored = {"name": "old"}
+
+    class SlowClient:
+        async def get_document(self, doc_id):
+            name = stored["name"]
+            await anyio.sleep(0.05)
+            return document(5, name)
+
+    monkeypatch.setattr(main, "async_eln_cli", SlowClient())
+
+    async def scenario():
+        async with anyio.create_task_group() as tasks:
+            tasks.start_soon(main._load_document, 5)
+            await anyio.sleep(0.01)
+            stored["name"] = "NEW NAME"
+            cache.invalidate(5)
+        return await main._load_document(5)
+
+    assert anyio.run(scenario)["name"] == "NEW NAME"
@@ -0,0 +1,28 @@
+import anyio
+
+import main
+
+
+def test_budget_is_a_prefix_of_the_ranking_and_errors_are_free(monkeypatch):
+    # Later-ranked documents finish first; the budget must still go to the top results
+    delays = {"SD1": 0.06, "SD2": 0.04, "SD3": 0.0, "SD4": 0.0}
+    bodies = {"SD1": "a" * 60, "SD2": "b" * 60, "SD4": "d" * 60}
+
+    async def load(doc_id):
+        await anyio.sleep(delays[doc_id])
+        if doc_id == "SD3":
+            raise RuntimeError("boom " * 40)
+        return {"fields": [{"content": bodies[doc_id]}]}
+
+    monkeypatch.setattr(main, "_load_document", load)
+    monkeypatch.setattr(main, "HYDRATION_MAX_BYTES", 100)
+    documents = [{"globalId": f"SD{n}"} for n in range(1, 5)]
+    budget = anyio.run(main._hydrate_documents, documents)
+
+    assert documents[0]["fullContent"] == "a" * 60
+    assert "fullContentTruncated" not in documents[0]
+    assert documents[1]["fullContent"] == "b" * 40 and documents[1]["fullContentTruncated"]
+    assert documents[2]["fullContent"].startswith("Error fetching content: boom")
+    assert "fullContentTruncated" not in documents[2]
+    assert documents[3]["fullContent"] == "" and documents[3]["fullContentTruncated"]
+    assert budget == {"maxBytes": 100, "truncatedDocuments": 2}
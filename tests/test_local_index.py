@@ -0,0 +1,132 @@
+import anyio
+import pytest
+
+import main
+
+
+class FakeEln:
+    """Document listing ordered by lastModified, as used by _list_modified_since"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def get_documents(self, order_by, page_number, page_size, **kwargs):
+        ordered = sorted(self.documents.values(), key=lambda doc: (doc["lastModified"], doc["id"]))
+        start = page_number * page_size
+        return {"totalHits": len(ordered), "documents": [
+            {key: doc[key] for key in ("id", "globalId", "name", "lastModified")}
+            for doc in ordered[start:start + page_size]
+        ]}
+
+    async def get_documents_advanced_query(self, advanced_query, order_by, page_number, page_size):
+        return await self.get_documents(order_by, page_number, page_size)
+
+
+def _document(doc_id: int, name: str, content: str, modified: str) -> dict:
+    return {"id": doc_id, "globalId": f"SD{doc_id}", "name": name, "tags": "lab", "lastModified": modified,
+            "fields": [{"id": doc_id * 10, "name": "Data", "content": content}]}
+
+
+@pytest.fixture
+def index(monkeypatch, tmp_path):
+    documents = {
+        1: _document(1, "PCR protocol", "<p>Taq polymerase and buffer</p>", "2024-03-01T10:00:00.000Z"),
+        2: _document(2, "Gel run", "<p>Agarose gel electrophoresis</p>", "2024-03-02T10:00:00.000Z"),
+        3: _document(3, "Plasmid prep", "<p>Miniprep of plasmids</p>", "2024-03-03T10:00:00.000Z"),
+    }
+    loaded = []
+
+    async def load(ids):
+        loaded.extend(ids)
+        return [documents[doc_id] if doc_id in documents else KeyError(doc_id) for doc_id in ids]
+
+    local_index = main.LocalDocumentIndex(str(tmp_path / "index.db"))
+    monkeypatch.setattr(main, "local_index", local_index)
+    monkeypatch.setattr(main, "_local_index_sync_lock", None)
+    monkeypatch.setattr(main, "async_eln_cli", FakeEln(documents))
+    monkeypatch.setattr(main, "_load_documents", load)
+    return local_index, documents, loaded
+
+
+def _sync(full: bool = False) -> dict:
+    return anyio.run(main._sync_local_index, full)
+
+
+def _ids(index, query: str) -> list:
+    return [hit["id"] for hit in index.search(query, 20)]
+
+
+def test_incremental_sync_fetches_modified_documents_only(index):
+    local_index, documents, loaded = index
+    first = _sync()
+    assert (first["listed"], first["updated"], first["removed"]) == (3, 3, 0)
+    assert first["watermark"] == "2024-03-03T10:00:00.000Z"
+    assert _ids(local_index, "polymerase") == [1]
+
+    loaded.clear()
+    documents[2] = _document(2, "Gel run", "<p>Polyacrylamide gel</p>", "2024-03-04T10:00:00.000Z")
+    second = _sync()
+    # The listing since the watermark includes document 3 (unchanged) and 2 (edited)
+    assert loaded == [2]
+    assert (second["listed"], second["updated"]) == (2, 1)
+    assert _ids(local_index, "polyacrylamide") == [2]
+    assert _ids(local_index, "agarose") == []
+
+
+def test_failed_document_holds_the_watermark_back(index, monkeypatch):
+    local_index, documents, loaded = index
+    documents[4] = _document(4, "Lost", "<p>x</p>", "2024-03-05T10:00:00.000Z")
+    load = main._load_documents
+
+    async def failing_load(ids):
+        return [RuntimeError("502") if doc_id == 2 else doc for doc_id, doc in zip(ids, await load(ids))]
+
+    monkeypatch.setattr(main, "_load_documents", failing_load)
+    result = _sync()
+    assert result["failed"] == ["SD2"] and result["updated"] == 3
+    assert result["watermark"] == "2024-03-02T10:00:00.000Z"
+
+    # The next sync lists from the failed document on, but only loads what is not yet indexed
+    monkeypatch.setattr(main, "_load_documents", load)
+    loaded.clear()
+    retry = _sync()
+    assert loaded == [2] and retry["listed"] == 3
+    assert retry["watermark"] == "2024-03-05T10:00:00.000Z"
+
+
+def test_full_sync_removes_deleted_documents(index):
+    local_index, documents, loaded = index
+    _sync()
+    del documents[3]
+    assert _sync()["removed"] == 0
+    assert _ids(local_index, "miniprep") == [3]
+    result = _sync(full=True)
+    assert result["removed"] == 1 and result["updated"] == 0
+    assert _ids(local_index, "miniprep") == []
+    assert local_index.state()["documents"] == 2
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("polymerase buffer", [1]),
+    ("name:gel", [2]),
+    ("plasm*", [3]),
+    ('"agarose gel"', [2]),
+    ("taq AND (", [1]),
+    ('gel "check', [3]),
+    ("5' primer -", []),
+])
+def test_queries_with_and_without_valid_fts5_syntax(index, query, expected):
+    local_index, documents, loaded = index
+    documents[3]["fields"][0]["content"] = "<p>Miniprep of plasmids, gel check</p>"
+    _sync()
+    hits = local_index.search(query, 20)
+    assert sorted(hit["id"] for hit in hits) == expected
+
+
+def test_names_rank_above_content(index):
+    local_index, documents, loaded = index
+    documents[3]["fields"][0]["content"] = "<p>Miniprep of plasmids, gel check</p>"
+    _sync()
+    hits = local_index.search("gel", 20)
+    assert [hit["id"] for hit in hits] == [2, 3]
+    assert hits[0]["score"] > hits[1]["score"] and "[gel]" in hits[1]["snippet"].lower()
@@ -0,0 +1,24 @@
+import os
+
+import main
+
+
+def test_worker_label_is_added_to_every_sample():
+    registry = main.MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls")
+    latency = registry.histogram("latency_seconds", "Latency", (0.1, 1))
+    calls.inc(tool="status")
+    latency.observe(0.5, tool="status")
+    registry.labels = {"worker": "123"}
+    samples = [line for line in registry.render().splitlines() if not line.startswith("#")]
+    assert samples
+    assert all(line.startswith(("calls_total{worker=\"123\",", "latency_seconds_")) for line in samples)
+    assert all('worker="123"' in line for line in samples)
+
+
+def test_http_workers_label_their_metrics(monkeypatch):
+    monkeypatch.setattr(main, "warm_up", lambda: None)
+    monkeypatch.setattr(main.metrics, "labels", {})
+    main.http_app()
+    assert main.metrics.labels == {"worker": str(os.getpid())}
+    assert f'worker="{os.getpid()}"' in main.metrics.render()
@@ -0,0 +1,76 @@
+import anyio
+import pytest
+
+import main
+
+
+def _doc(doc_id: int) -> dict:
+    return {"id": doc_id, "globalId": f"SD{doc_id}", "name": f"doc {doc_id}", "_links": [{"rel": "self"}]}
+
+
+class FakeEln:
+    """Answers each advanced query with the results registered for its search term"""
+
+    def __init__(self, results):
+        self.results = results
+
+    async def get_documents_advanced_query(self, advanced_query, order_by, page_number, page_size):
+        for term, documents in self.results.items():
+            if term in advanced_query:
+                if isinstance(documents, Exception):
+                    raise documents
+                return {"totalHits": len(documents), "documents": [dict(doc) for doc in documents[:page_size]]}
+        return {"totalHits": 0, "documents": []}
+
+
+@pytest.fixture
+def eln(monkeypatch):
+    monkeypatch.setattr(main, "search_cache", main.SearchCache(max_entries=64, ttl_seconds=60))
+    fake = FakeEln({
+        "pcr": [_doc(1), _doc(2), _doc(3)],
+        "polymerase": [_doc(4), _doc(3), _doc(1)],
+        "broken": RuntimeError("502 Bad Gateway"),
+    })
+    monkeypatch.setattr(main, "async_eln_cli", fake)
+    return fake
+
+
+def _search(queries, **kwargs):
+    tool = getattr(main.multi_search, "fn", main.multi_search)
+    return anyio.run(lambda: tool([main.SearchSpec(query=query) for query in queries], **kwargs))
+
+
+def test_documents_found_by_both_queries_rank_first(eln):
+    result = _search(["pcr", "polymerase"])
+    ranked = [doc["globalId"] for doc in result["documents"]]
+    # SD1: 1/61 + 1/63, SD3: 1/63 + 1/62, then the single hits at rank 1 and 2
+    assert ranked == ["SD1", "SD3", "SD4", "SD2"]
+    assert result["totalUnique"] == 4
+    scores = [doc["score"] for doc in result["documents"]]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] == round(1 / 61 + 1 / 63, 5)
+
+
+def test_matched_by_lists_each_query_and_rank(eln):
+    documents = {doc["globalId"]: doc for doc in _search(["pcr", "polymerase"])["documents"]}
+    assert documents["SD1"]["matchedBy"] == [{"query": 0, "rank": 1}, {"query": 1, "rank": 3}]
+    assert documents["SD4"]["matchedBy"] == [{"query": 1, "rank": 1}]
+    assert all("_links" not in doc for doc in documents.values())
+
+
+def test_failing_query_is_reported_without_failing_the_call(eln):
+    result = _search(["pcr", "broken"])
+    assert [doc["globalId"] for doc in result["documents"]] == ["SD1", "SD2", "SD3"]
+    assert result["queries"][0]["returned"] == 3
+    assert result["queries"][1]["error"] == "502 Bad Gateway"
+    assert "returned" not in result["queries"][1]
+
+
+def test_limit_and_page_size(eln):
+    assert [doc["globalId"] for doc in _search(["pcr", "polymerase"], limit=2)["documents"]] == ["SD1", "SD3"]
+    assert _search(["pcr"], page_size=1)["totalUnique"] == 1
+    for kwargs in ({"limit": 0}, {"page_size": 0}):
+        with pytest.raises(ValueError):
+            _search(["pcr"], **kwargs)
+    with pytest.raises(ValueError, match="between 1 and 10 queries"):
+        _search([])
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import requests
+
+import main
+
+
+def test_acquire_paces_requests_beyond_the_burst():
+    limiter = main.RateLimiter(rate=50, burst=2, min_rate=1, max_pause=60)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    # Two requests go out at once, the other three wait one token interval each
+    assert time.monotonic() - start >= 3 / 50 * 0.9
+
+
+def test_throttled_halves_the_rate_and_pauses_everyone():
+    limiter = main.RateLimiter(rate=20, burst=20, min_rate=1, max_pause=60)
+    limiter.throttled(retry_after=0.2)
+    assert limiter.rate == 10
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_throttled_honours_the_floor_and_max_pause():
+    limiter = main.RateLimiter(rate=4, burst=1, min_rate=1, max_pause=0.05)
+    for _ in range(5):
+        limiter.throttled(retry_after=30)
+    assert limiter.rate == 1
+    assert limiter.paused_until - time.monotonic() <= 0.05
+
+
+def test_succeeded_recovers_to_the_configured_rate():
+    limiter = main.RateLimiter(rate=20, burst=20, min_rate=0.5, max_pause=60)
+    limiter.throttled(retry_after=0)
+    threads = [threading.Thread(target=lambda: [limiter.succeeded() for _ in range(50)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter.rate == 20
+
+
+def test_429_is_requeued_behind_the_pause(monkeypatch):
+    class Throttling:
+        def __init__(self):
+            self.sent = 0
+
+        def send(self, request, **kwargs):
+            self.sent += 1
+            resp = requests.Response()
+            resp.status_code = 429 if self.sent == 1 else 200
+            resp.headers["Retry-After"] = "0.1"
+            resp._content = b""
+            return resp
+
+    limiter = main.RateLimiter(rate=0, burst=1, min_rate=0.5, max_pause=60)
+    inner = Throttling()
+    adapter = main._ResilientAdapter(inner, main.CircuitBreaker(0, 30), limiter)
+    start = time.monotonic()
+    prepared = requests.Request("POST", "http://rspace.invalid/api/v1/documents").prepare()
+    assert adapter.send(prepared).status_code == 200
+    assert inner.sent == 2
+    assert time.monotonic() - start >= 0.09
@@ -0,0 +1,89 @@
+import pytest
+import requests
+from requests.exceptions import ChunkedEncodingError
+
+import main
+
+
+class FakeAdapter:
+    """Inner adapter returning or raising the queued outcomes in order"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    def close(self):
+        pass
+
+
+def response(status: int) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = b""
+    return resp
+
+
+def request(method: str = "GET") -> requests.PreparedRequest:
+    return requests.Request(method, "http://rspace.invalid/api/v1/documents/1").prepare()
+
+
+def adapter(breaker, *outcomes):
+    return main._ResilientAdapter(FakeAdapter(*outcomes), breaker, main.RateLimiter(0, 1, 0.5, 60))
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(main, "_backoff_delay", lambda attempt: 0.0)
+
+
+def test_half_open_trial_ending_in_other_exception_reopens_the_circuit():
+    breaker = main.CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+
+    with pytest.raises(ChunkedEncodingError):
+        adapter(breaker, ChunkedEncodingError("truncated body")).send(request("POST"))
+    assert breaker.state == breaker.OPEN
+
+    # The trial slot was released, so the next trial goes through and closes the circuit
+    assert adapter(breaker, response(200)).send(request()).status_code == 200
+    assert breaker.state == breaker.CLOSED
+
+
+def test_half_open_rejection_does_not_report_zero_seconds():
+    breaker = main.CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.allow()  # takes the trial slot
+    with pytest.raises(requests.exceptions.ConnectionError, match="trial request"):
+        adapter(breaker, response(200)).send(request())
+
+
+def test_open_circuit_rejects_without_sending():
+    breaker = main.CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    inner = adapter(breaker, response(502), response(502))
+    assert inner.send(request()).status_code == 502
+    assert breaker.state == breaker.OPEN
+    with pytest.raises(requests.exceptions.ConnectionError, match="fail fast for another"):
+        inner.send(request())
+    assert inner._adapter.sent == 2
+
+
+@pytest.mark.parametrize("method", ["GET", "PUT", "DELETE"])
+def test_idempotent_methods_are_retried_on_server_errors(method):
+    breaker = main.CircuitBreaker(failure_threshold=0, reset_seconds=30)
+    inner = adapter(breaker, response(502), response(200))
+    assert inner.send(request(method)).status_code == 200
+    assert inner._adapter.sent == 2
+
+
+def test_post_is_only_retried_when_refused():
+    breaker = main.CircuitBreaker(failure_threshold=0, reset_seconds=30)
+    assert adapter(breaker, response(500), response(200)).send(request("POST")).status_code == 500
+    assert adapter(breaker, response(503), response(201)).send(request("POST")).status_code == 201
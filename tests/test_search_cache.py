@@ -0,0 +1,42 @@
+import anyio
+
+import main
+
+
+def test_key_ignores_term_order_case_and_spacing():
+    first = main._advanced_query("pcr", ["tag", "name"], "or")
+    second = main._advanced_query("pcr", ["name", "tag"], "or")
+    assert main._search_key("advanced", first, "lastModified desc", 0, 20) == \
+        main._search_key("advanced", second, "lastModified  DESC", 0, 20)
+    assert main._search_key("simple", "PCR  protocol", None, 0, 20) == \
+        main._search_key("simple", "pcr protocol", None, 0, 20)
+    assert main._search_key("simple", "pcr", None, 0, 20) != main._search_key("simple", "pcr", None, 1, 20)
+
+
+def test_write_during_fetch_is_not_cached():
+    cache = main.SearchCache(max_entries=8, ttl_seconds=60)
+    generation = cache.generation
+    cache.clear()
+    cache.put(("k",), {"documents": []}, generation)
+    assert cache.get(("k",)) is None
+
+
+def test_only_fresh_pages_revalidate_the_document_cache(monkeypatch):
+    monkeypatch.setattr(main, "search_cache", main.SearchCache(max_entries=8, ttl_seconds=60))
+    observed = []
+    monkeypatch.setattr(main, "_observe_listing", lambda documents: observed.append(documents))
+    page = {"documents": [{"id": 1, "lastModified": "2024-01-01T00:00:00.000Z"}]}
+
+    async def fetch():
+        return page
+
+    async def scenario():
+        first = await main._cached_search(("k",), fetch)
+        second = await main._cached_search(("k",), fetch)
+        return first, second
+
+    first, second = anyio.run(scenario)
+    assert first == second == page
+    assert len(observed) == 1
+    second["documents"].clear()
+    assert main.search_cache.get(("k",)) == page
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+import main
+
+
+def start_leader(flight_group, key, release: threading.Event, result):
+    """Runs a call in a thread that blocks until `release` is set"""
+    started = threading.Event()
+
+    def call():
+        started.set()
+        release.wait(5)
+        return result
+
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.setdefault("value", flight_group.do(key, call)))
+    thread.start()
+    started.wait(5)
+    return thread, outcome
+
+
+def key_for(doc_id):
+    return ("eln_cli", "get_document", main._call_key((doc_id,), {}))
+
+
+def test_concurrent_callers_share_one_call_and_get_copies():
+    group = main.SingleFlight()
+    release = threading.Event()
+    leader, leader_outcome = start_leader(group, key_for("SD1"), release, {"name": "doc"})
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(group.do(key_for(1), lambda: pytest.fail("not coalesced"))))
+    waiter.start()
+    while group._flights[key_for(1)].waiters == 0:
+        pass
+    release.set()
+    leader.join()
+    waiter.join()
+    assert results == [{"name": "doc"}]
+    assert results[0] is not leader_outcome["value"]
+
+
+def test_read_started_after_a_write_does_not_join_an_older_flight():
+    group = main.SingleFlight()
+    release = threading.Event()
+    leader, leader_outcome = start_leader(group, key_for(5), release, {"name": "before the write"})
+    group.forget("SD5")  # the write completed
+    fresh = group.do(key_for(5), lambda: {"name": "after the write"})
+    release.set()
+    leader.join()
+    assert fresh == {"name": "after the write"}
+    assert leader_outcome["value"] == {"name": "before the write"}
+    assert not group._flights
+
+
+def test_forget_leaves_other_records_coalesced():
+    group = main.SingleFlight()
+    release = threading.Event()
+    leader, _ = start_leader(group, key_for(6), release, {})
+    group.forget(7)
+    assert key_for(6) in group._flights
+    release.set()
+    leader.join()
+
+
+def test_each_waiter_gets_its_own_exception():
+    group = main.SingleFlight()
+    release = threading.Event()
+    started = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError("RSpace said no")
+
+    def call():
+        try:
+            group.do(key_for(8), failing)
+        except ValueError as ex:
+            errors.append(ex)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while group._flights[key_for(8)].waiters < 2:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 3
+    assert len({id(error) for error in errors}) == 3
+    assert all(str(error) == "RSpace said no" for error in errors)
@@ -0,0 +1,113 @@
+import anyio
+import pytest
+
+import main
+
+
+class FakeEln:
+    """Document listing ordered by lastModified; update_document edits it like RSpace would"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.listings = 0
+        self.clock = 10
+
+    async def get_documents(self, order_by, page_number, page_size, **kwargs):
+        self.listings += 1
+        ordered = sorted(self.documents.values(), key=lambda doc: (doc["lastModified"], doc["id"]))
+        start = page_number * page_size
+        return {"totalHits": len(ordered), "documents": [dict(doc) for doc in ordered[start:start + page_size]]}
+
+    async def get_documents_advanced_query(self, advanced_query, order_by, page_number, page_size):
+        return await self.get_documents(order_by, page_number, page_size)
+
+    def update_document(self, document_id, tags):
+        self.clock += 1
+        document = self.documents[document_id]
+        document.update(tags=",".join(tags), lastModified=f"2024-03-{self.clock:02d}T00:00:00.000Z")
+        return document
+
+
+def _doc(doc_id: int, tags: str, day: int) -> dict:
+    return {"id": doc_id, "globalId": f"SD{doc_id}", "tags": tags, "lastModified": f"2024-03-{day:02d}T00:00:00.000Z"}
+
+
+@pytest.fixture
+def eln(monkeypatch):
+    fake = FakeEln({
+        1: _doc(1, "PCR,buffer", 1),
+        2: _doc(2, "PCR", 2),
+        3: _doc(3, "pcr-primers,gel", 3),
+        4: _doc(4, "", 4),
+    })
+    monkeypatch.setattr(main, "tag_index", main.TagIndex())
+    monkeypatch.setattr(main, "_tag_index_refresh_lock", None)
+    monkeypatch.setattr(main, "async_eln_cli", fake)
+    monkeypatch.setattr(main, "eln_cli", fake)
+    return fake
+
+
+def _list_tags(**kwargs) -> dict:
+    tool = getattr(main.list_tags, "fn", main.list_tags)
+    return anyio.run(lambda: tool(**kwargs))
+
+
+def test_counts_last_use_and_samples(eln):
+    result = _list_tags()
+    assert result["refreshed"]["listed"] == 4 and result["complete"]
+    assert result["indexedDocuments"] == 4
+    tags = {entry["tag"]: entry for entry in result["tags"]}
+    assert [entry["tag"] for entry in result["tags"]][0] == "PCR"
+    assert tags["PCR"]["count"] == 2
+    assert tags["PCR"]["lastUsed"] == "2024-03-02T00:00:00.000Z"
+    assert tags["PCR"]["sampleDocuments"] == ["SD2", "SD1"]
+    assert tags["gel"] == {"tag": "gel", "count": 1, "lastUsed": "2024-03-03T00:00:00.000Z",
+                           "sampleDocuments": ["SD3"]}
+
+
+def test_prefix_is_case_insensitive_and_limit_applies_after_matching(eln):
+    result = _list_tags(prefix="pc")
+    assert [entry["tag"] for entry in result["tags"]] == ["PCR", "pcr-primers"]
+    limited = _list_tags(prefix="P", limit=1)
+    assert [entry["tag"] for entry in limited["tags"]] == ["PCR"] and limited["matched"] == 2
+
+
+def test_refresh_is_full_first_then_incremental_after_max_age(eln, monkeypatch):
+    _list_tags()
+    listings = eln.listings
+    assert _list_tags()["refreshed"] is None and eln.listings == listings
+
+    eln.documents[5] = _doc(5, "gel", 5)
+    monkeypatch.setattr(main, "TAG_INDEX_MAX_AGE", 0)
+    assert _list_tags(refresh=False)["refreshed"] is None
+    result = _list_tags()
+    # Only documents from the watermark on are listed again
+    assert result["refreshed"]["listed"] == 2
+    assert {entry["tag"]: entry["count"] for entry in result["tags"]}["gel"] == 2
+
+
+def test_tagging_through_the_server_invalidates_the_index(eln):
+    _list_tags()
+    tag = getattr(main.tag_document, "fn", main.tag_document)
+    tag(2, ["PCR", "qPCR"])
+    result = _list_tags()
+    assert result["refreshed"] is not None
+    tags = {entry["tag"]: entry for entry in result["tags"]}
+    assert tags["qPCR"]["sampleDocuments"] == ["SD2"]
+    assert tags["PCR"]["lastUsed"] == "2024-03-11T00:00:00.000Z"
+
+
+def test_listings_feed_the_index_and_older_copies_are_ignored(eln):
+    main._observe_listing([_doc(7, "western", 9), {"id": 8, "globalId": "SD8"}])
+    main._observe_listing([_doc(7, "stale-tag", 8)])
+    tags = {entry["tag"] for entry in _list_tags(refresh=False)["tags"]}
+    assert tags == {"western"}
+
+
+def test_rebuild_drops_deleted_documents(eln):
+    _list_tags()
+    del eln.documents[3]
+    assert "gel" in {entry["tag"] for entry in _list_tags(refresh=False)["tags"]}
+    result = _list_tags(rebuild=True)
+    assert "gel" not in {entry["tag"] for entry in result["tags"]}
+    assert result["indexedDocuments"] == 3